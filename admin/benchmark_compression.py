@@ -0,0 +1,87 @@
+"""
+Measure how compressing archives sent to and from nodes changes the size of
+representative payloads, and the time to send them over links of different
+speeds.
+
+Useful payloads are a DC/OS installer, the integration test tree of a DC/OS
+checkout and a ``journalctl`` dump from a node.
+For example:
+
+    journalctl --no-pager > /tmp/journal.txt
+    python admin/benchmark_compression.py \
+        /tmp/dcos_generate_config.sh \
+        ~/dcos/packages/dcos-integration-test/extra \
+        /tmp/journal.txt
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Tuple
+
+from dcos_e2e._archive_tools import (
+    iter_chunks,
+    is_compressible,
+    streamed_archive,
+)
+
+# Link speeds, in megabits per second, to estimate transfer times for.
+_LINK_SPEEDS = (10, 100, 1000)
+
+
+def archive_size(local_path: Path, compress: bool) -> Tuple[int, float]:
+    """
+    Return the size in bytes of an archive of ``local_path`` and the number of
+    seconds taken to make it.
+    """
+    start = time.monotonic()
+    size = 0
+    with streamed_archive(
+        local_path=local_path,
+        arcname=local_path.name,
+        compress=compress,
+    ) as archive:
+        for chunk in iter_chunks(archive):
+            size += len(chunk)
+    return size, time.monotonic() - start
+
+
+def main() -> None:
+    """
+    Print archive sizes and estimated transfer times for each payload.
+    """
+    for argument in sys.argv[1:]:
+        local_path = Path(argument)
+        print(
+            '{path} (compressed automatically: {auto})'.format(
+                path=local_path,
+                auto=is_compressible(local_path=local_path),
+            ),
+        )
+        for compress in (False, True):
+            size, seconds = archive_size(
+                local_path=local_path,
+                compress=compress,
+            )
+            transfer_times = ', '.join(
+                '{speed} Mbit/s: {time:.1f}s'.format(
+                    speed=speed,
+                    # Archives are made while they are sent, so the slower of
+                    # the two is the time taken.
+                    time=max(seconds, size * 8 / (speed * 1000 * 1000)),
+                ) for speed in _LINK_SPEEDS
+            )
+            message = (
+                '    compress={compress}: {size:.1f} MiB in {seconds:.1f}s; '
+                '{transfer_times}'
+            ).format(
+                compress=compress,
+                size=size / 1024 / 1024,
+                seconds=seconds,
+                transfer_times=transfer_times,
+            )
+            print(message)
+
+
+if __name__ == '__main__':
+    main()
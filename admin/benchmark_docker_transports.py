@@ -0,0 +1,81 @@
+"""
+Measure the time taken to run a command on a node with the Docker exec
+transport and with the Docker API transport.
+
+Start a container on a local Docker daemon and pass its IP address, for
+example:
+
+    docker run --detach --name bench centos:7 sleep infinity
+    python admin/benchmark_docker_transports.py \
+        "$(docker inspect --format '{{.NetworkSettings.IPAddress}}' bench)"
+"""
+
+import sys
+import time
+from ipaddress import IPv4Address
+from pathlib import Path
+
+from dcos_e2e._node_transports import (
+    DockerAPITransport,
+    DockerExecTransport,
+    NodeTransport,
+)
+
+
+def run_true(transport: NodeTransport, public_ip_address: IPv4Address) -> None:
+    """
+    Run ``true`` on a node with the given transport.
+    """
+    transport.run(
+        args=['true'],
+        user='root',
+        log_output_live=False,
+        env={},
+        tty=False,
+        ssh_key_path=Path('/dev/null'),
+        public_ip_address=public_ip_address,
+        capture_output=True,
+    )
+
+
+def milliseconds_per_command(
+    transport: NodeTransport,
+    public_ip_address: IPv4Address,
+    commands: int,
+) -> float:
+    """
+    Return the mean number of milliseconds taken to run a ``true`` command
+    with the given transport.
+    """
+    # Run one command first so that one-off setup, such as creating a Docker
+    # client, is not measured.
+    run_true(transport=transport, public_ip_address=public_ip_address)
+    start = time.monotonic()
+    for _ in range(commands):
+        run_true(transport=transport, public_ip_address=public_ip_address)
+    elapsed = time.monotonic() - start
+    return elapsed * 1000 / commands
+
+
+def main() -> None:
+    """
+    Print the mean time per command for each Docker transport.
+    """
+    public_ip_address = IPv4Address(sys.argv[1])
+    commands = 100
+
+    for transport in (DockerExecTransport(), DockerAPITransport()):
+        latency = milliseconds_per_command(
+            transport=transport,
+            public_ip_address=public_ip_address,
+            commands=commands,
+        )
+        message = '{transport}: {latency:.1f} ms/command'.format(
+            transport=type(transport).__name__,
+            latency=latency,
+        )
+        print(message)
+
+
+if __name__ == '__main__':
+    main()
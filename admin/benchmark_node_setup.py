@@ -0,0 +1,147 @@
+"""
+Measure the time saved by setting up node containers with one command rather
+than one command per setup step.
+
+Each measurement uses a new node container, made in the same way as the
+Docker backend makes one: the node image is built, the setup files are added
+with ``put_archive`` and the container is started.
+The setup steps are then run either with one ``exec`` per step, or with the
+setup script which runs every step, and only this part is timed.
+For example:
+
+    python admin/benchmark_node_setup.py
+"""
+
+import textwrap
+import time
+import uuid
+from typing import Callable, List
+
+import docker
+from docker.models.containers import Container
+from docker.types import Mount
+
+# pylint: disable=protected-access
+from dcos_e2e.backends import Docker
+from dcos_e2e.backends._docker._containers import (
+    _PUBLIC_KEY_PATH,
+    _SETUP_SCRIPT_PATH,
+    _SETUP_STEPS,
+    _docker_service_file,
+    _setup_archive,
+)
+from dcos_e2e.backends._docker._docker_build import build_docker_image
+
+# The number of containers to set up with each method.
+_REPEATS = 3
+
+_IMAGE_TAG = 'mesosphere/dcos-docker'
+
+
+def _start_node_container(backend: Docker) -> Container:
+    """
+    Start a node container with the setup files in place, as the Docker
+    backend does, but do not set it up.
+    """
+    client = docker.from_env(version='auto')
+    name = 'dcos-e2e-benchmark-' + uuid.uuid4().hex
+    container = client.containers.create(
+        name=name,
+        privileged=True,
+        detach=True,
+        tty=True,
+        environment={'container': name},
+        image=_IMAGE_TAG,
+        mounts=[
+            Mount(source=None, target='/var/lib/docker'),
+            *backend.cgroup_mounts,
+        ],
+        tmpfs={
+            '/run': 'rw,exec,nosuid,size=2097152k',
+            '/tmp': 'rw,exec,nosuid,size=2097152k',
+        },
+        stop_signal='SIGRTMIN+3',
+        command=['/sbin/init'],
+    )
+    container.put_archive(
+        path='/',
+        data=_setup_archive(
+            docker_service_text=_docker_service_file(
+                storage_driver=backend.docker_storage_driver,
+                docker_version=backend.docker_version,
+            ),
+            public_key='ssh-rsa AAAA benchmark\n',
+        ),
+    )
+    container.start()
+    return container
+
+
+def _run_each_step(container: Container) -> None:
+    """
+    Set up a node container with one command per setup step.
+    """
+    for name, step_script in _SETUP_STEPS:
+        exit_code, output = container.exec_run(
+            cmd=['/bin/bash', '-e', '-c', textwrap.dedent(step_script)],
+            environment={'PUBLIC_KEY_PATH': str(_PUBLIC_KEY_PATH)},
+        )
+        assert exit_code == 0, name + ': ' + output.decode()
+
+
+def _run_setup_script(container: Container) -> None:
+    """
+    Set up a node container with the setup script.
+    """
+    exit_code, output = container.exec_run(
+        cmd=['/bin/bash', str(_SETUP_SCRIPT_PATH)],
+    )
+    assert exit_code == 0, output.decode()
+
+
+def _mean_seconds(
+    backend: Docker,
+    set_up: Callable[[Container], None],
+) -> float:
+    """
+    Return the mean number of seconds taken by ``set_up`` to set up a new
+    node container.
+    """
+    durations = []  # type: List[float]
+    for _ in range(_REPEATS):
+        container = _start_node_container(backend=backend)
+        try:
+            start = time.monotonic()
+            set_up(container)
+            durations.append(time.monotonic() - start)
+        finally:
+            container.remove(force=True, v=True)
+    return sum(durations) / len(durations)
+
+
+def main() -> None:
+    """
+    Print the mean time taken to set up a node container with one command per
+    setup step and with one script.
+    """
+    backend = Docker()
+    build_docker_image(
+        tag=_IMAGE_TAG,
+        linux_distribution=backend.linux_distribution,
+        docker_version=backend.docker_version,
+        docker_binaries_dir=backend.docker_binaries_dir,
+    )
+    for description, set_up in (
+        ('one command per step', _run_each_step),
+        ('one script', _run_setup_script),
+    ):
+        seconds = _mean_seconds(backend=backend, set_up=set_up)
+        message = '{description}: {seconds:.3f}s per container'.format(
+            description=description,
+            seconds=seconds,
+        )
+        print(message)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure how many commands per second the SSH transport can run on a node,
+with and without sharing a connection between commands.
+
+For example, to benchmark against a local ``sshd``:
+
+    python admin/benchmark_ssh_transport.py 127.0.0.1 "$USER" ~/.ssh/id_rsa
+"""
+
+import sys
+import time
+from ipaddress import IPv4Address
+from pathlib import Path
+
+from dcos_e2e._node_transports import SSHTransport
+
+
+def commands_per_second(
+    transport: SSHTransport,
+    public_ip_address: IPv4Address,
+    user: str,
+    ssh_key_path: Path,
+    commands: int,
+) -> float:
+    """
+    Return the number of ``true`` commands per second run with the given
+    transport.
+    """
+    start = time.monotonic()
+    for _ in range(commands):
+        transport.run(
+            args=['true'],
+            user=user,
+            log_output_live=False,
+            env={},
+            tty=False,
+            ssh_key_path=ssh_key_path,
+            public_ip_address=public_ip_address,
+            capture_output=True,
+        )
+    elapsed = time.monotonic() - start
+    transport.close_connections(public_ip_address=public_ip_address)
+    return commands / elapsed
+
+
+def main() -> None:
+    """
+    Print commands per second for each connection mode.
+    """
+    public_ip_address = IPv4Address(sys.argv[1])
+    user = sys.argv[2]
+    ssh_key_path = Path(sys.argv[3])
+    commands = 100
+
+    for reuse_connections in (False, True):
+        rate = commands_per_second(
+            transport=SSHTransport(reuse_connections=reuse_connections),
+            public_ip_address=public_ip_address,
+            user=user,
+            ssh_key_path=ssh_key_path,
+            commands=commands,
+        )
+        message = 'reuse_connections={reuse}: {rate:.1f} commands/s'.format(
+            reuse=reuse_connections,
+            rate=rate,
+        )
+        print(message)
+
+
+if __name__ == '__main__':
+    main()
@@ -115,6 +115,12 @@ PATTERNS = {
     (),
     'tests/test_dcos_e2e/test_cluster.py::TestDestroyNode':
     (),
+    'tests/test_dcos_e2e/test_cluster.py::TestRunOnNodes':
+    (),
+    'tests/test_dcos_e2e/test_cluster.py::TestSendFile':
+    (),
+    'tests/test_dcos_e2e/test_cluster.py::TestDownload':
+    (),
     'tests/test_dcos_e2e/test_enterprise.py::TestCopyFiles::test_copy_directory_to_installer':  # noqa: E501
     (EE_MASTER, ),
     'tests/test_dcos_e2e/test_enterprise.py::TestCopyFiles::test_copy_files_to_installer':  # noqa: E501
@@ -145,6 +151,10 @@ PATTERNS = {
     (OSS_1_9, ),
     'tests/test_dcos_e2e/test_node.py':
     (),
+    'tests/test_dcos_e2e/test_docker_binaries.py':
+    (),
+    'tests/test_dcos_e2e/test_ssh_transport.py':
+    (),
     'tests/test_dcos_e2e/test_node_install.py::TestAdvancedInstallationMethod::test_install_dcos_from_url':  # noqa: E501
     (OSS_MASTER, ),
     'tests/test_dcos_e2e/test_node_install.py::TestAdvancedInstallationMethod::test_install_dcos_from_path':  # noqa: E501
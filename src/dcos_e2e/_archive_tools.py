@@ -0,0 +1,255 @@
+"""
+Utilities for streaming ``tar`` archives to and from nodes.
+"""
+
+import gzip
+import io
+import os
+import tarfile
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List  # noqa: F401
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional
+
+# The size of chunks read from and written to archive streams.
+CHUNK_SIZE = 1024 * 1024
+
+# The gzip compression level used for compressed archives.
+# Higher levels make little difference to the size of typical payloads but
+# are much slower.
+GZIP_COMPRESSLEVEL = 6
+
+# Files whose samples compress to more than this fraction of their size are
+# considered already compressed.
+_COMPRESSIBLE_RATIO = 0.9
+
+# The size and number of samples taken from a file to check whether it is
+# compressible.
+_SAMPLE_SIZE = 128 * 1024
+_SAMPLES = 4
+
+
+class _IterableReader(io.RawIOBase):
+    """
+    A readable binary file which reads from an iterable of ``bytes`` chunks.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+@contextmanager
+def streamed_archive(
+    local_path: Path,
+    arcname: str,
+    tar_filter: Optional[Callable[[tarfile.TarInfo], tarfile.TarInfo]] = None,
+    compress: bool = False,
+) -> Iterator[BinaryIO]:
+    """
+    Yield a file from which an archive of ``local_path`` can be read.
+
+    The archive is written to a pipe by a thread as it is read, so it is
+    never held in memory or written to disk in full.
+
+    Args:
+        local_path: The file or directory to archive.
+            Symbolic links are followed.
+        arcname: The name of ``local_path`` in the archive.
+        tar_filter: See ``filter`` in :py:meth:`tarfile.TarFile.add`.
+        compress: Whether to compress the archive with gzip.
+
+    Raises:
+        Exception: There was an error making the archive. This is raised in
+            preference to an error from the reader, which would only see a
+            truncated archive.
+    """
+
+    def _add_members(tar: tarfile.TarFile) -> None:
+        tar.add(
+            str(local_path),
+            arcname=arcname,
+            recursive=True,
+            filter=tar_filter,
+        )
+
+    with streamed_tar(add_members=_add_members, compress=compress) as archive:
+        yield archive
+
+
+def _write_tar(
+    archive_file: BinaryIO,
+    add_members: Callable[[tarfile.TarFile], None],
+) -> None:
+    """
+    Write an archive to ``archive_file``.
+    """
+    with tarfile.open(
+        fileobj=archive_file,
+        mode='w|',
+        dereference=True,
+    ) as tar:
+        add_members(tar)
+
+
+@contextmanager
+def streamed_tar(
+    add_members: Callable[[tarfile.TarFile], None],
+    compress: bool = False,
+) -> Iterator[BinaryIO]:
+    """
+    Yield a file from which an archive can be read.
+
+    The archive is written to a pipe by a thread as it is read, so it is
+    never held in memory or written to disk in full.
+
+    Args:
+        add_members: A function which adds members to an open archive.
+            Symbolic links are followed.
+        compress: Whether to compress the archive with gzip.
+
+    Raises:
+        Exception: There was an error making the archive. This is raised in
+            preference to an error from the reader, which would only see a
+            truncated archive.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []  # type: List[Exception]
+
+    def _write_archive() -> None:
+        try:
+            with os.fdopen(write_fd, 'wb') as archive_file:
+                if not compress:
+                    _write_tar(
+                        archive_file=archive_file,
+                        add_members=add_members,
+                    )
+                    return
+
+                with gzip.GzipFile(
+                    fileobj=archive_file,
+                    mode='wb',
+                    compresslevel=GZIP_COMPRESSLEVEL,
+                ) as compressed_file:
+                    _write_tar(
+                        archive_file=compressed_file,  # type: ignore
+                        add_members=add_members,
+                    )
+        except BrokenPipeError:
+            # The reader stopped reading, for example because the command on
+            # the node failed.
+            # The reader reports its own error.
+            pass
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+    writer = threading.Thread(target=_write_archive, daemon=True)
+    with os.fdopen(read_fd, 'rb') as archive:
+        writer.start()
+        try:
+            yield archive
+        finally:
+            # Closing the read end makes the writer stop if it is blocked.
+            archive.close()
+            writer.join()
+            if errors:
+                raise errors[0]
+
+
+def is_compressible(local_path: Path) -> bool:
+    """
+    Return whether an archive of ``local_path`` is likely to be made smaller
+    by compression.
+
+    Directories are assumed to be compressible.
+    For files, samples from across the file are compressed.
+    Files which are already compressed, such as DC/OS installers which hold
+    compressed images, are not made smaller.
+    """
+    if local_path.is_dir():
+        return True
+
+    size = local_path.stat().st_size
+    if size <= _SAMPLE_SIZE:
+        offsets = [0]
+    else:
+        step = (size - _SAMPLE_SIZE) // (_SAMPLES - 1)
+        offsets = [step * index for index in range(_SAMPLES)]
+
+    sampled = 0
+    compressed = 0
+    with local_path.open('rb') as local_file:
+        for offset in offsets:
+            local_file.seek(offset)
+            sample = local_file.read(_SAMPLE_SIZE)
+            sampled += len(sample)
+            compressed += len(zlib.compress(sample, 1))
+
+    if not sampled:
+        return False
+
+    return compressed < sampled * _COMPRESSIBLE_RATIO
+
+
+def iter_chunks(archive: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield the contents of ``archive`` in chunks, for use as a streamed HTTP
+    request body.
+    """
+    while True:
+        chunk = archive.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def extract_archive_stream(chunks: Iterable[bytes], local_path: Path) -> None:
+    """
+    Extract an archive with a single top level member, given as ``bytes``
+    chunks, so that the top level member is at ``local_path``.
+    The archive may be compressed.
+
+    The archive is extracted as it is read, so it is never held in memory or
+    written to disk in full.
+
+    Args:
+        chunks: The contents of the archive.
+        local_path: The path to extract the top level member of the archive
+            to. The parent of this path must exist.
+    """
+    reader = _IterableReader(chunks=chunks)
+    with tarfile.open(fileobj=reader, mode='r|*') as tar:
+        top_level = None  # type: Optional[str]
+        for member in tar:
+            parts = member.name.split('/')
+            top_level = top_level or parts[0]
+            if parts[0] != top_level or '..' in parts:
+                message = 'Unexpected archive member "{name}".'.format(
+                    name=member.name,
+                )
+                raise ValueError(message)
+
+            member.name = '/'.join([local_path.name, *parts[1:]])
+            if member.islnk():
+                link_parts = member.linkname.split('/')
+                member.linkname = '/'.join([local_path.name, *link_parts[1:]])
+
+            tar.extract(member=member, path=str(local_path.parent))
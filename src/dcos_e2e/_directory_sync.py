@@ -0,0 +1,253 @@
+"""
+Utilities for syncing a directory to a node by sending only the files which
+have changed since the last sync.
+
+A manifest of the files sent to a remote directory is kept in that directory.
+For each file, the manifest records its size and modification time on the
+node and the SHA-256 hash of its contents.
+A recorded hash is trusted only while the size and modification time of the
+file on the node are unchanged.
+"""
+
+import io
+import json
+import os
+import tarfile
+import textwrap
+from pathlib import Path
+from shlex import quote
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .local_cache import file_sha256
+
+# The name of the manifest in a synced directory on a node.
+MANIFEST_NAME = '.dcos-e2e-sync-manifest.json'
+
+# The name of a file in an archive sent to a node which lists the files to
+# delete.
+_DELETE_LIST_NAME = '.dcos-e2e-sync-delete'
+
+_SYNC_FILE_NAMES = (MANIFEST_NAME, _DELETE_LIST_NAME)
+
+# A manifest maps a path, relative to the synced directory, to the size,
+# the whole seconds of the modification time and the SHA-256 hash of a file.
+Manifest = Dict[str, Tuple[int, int, str]]
+
+
+def _local_files(
+    local_path: Path,
+    ignore: Callable[[Path], bool],
+) -> Iterator[Path]:
+    """
+    Yield the paths, relative to ``local_path``, of files in ``local_path``
+    which are not ignored.
+    """
+    for directory, _, file_names in os.walk(str(local_path)):
+        for file_name in file_names:
+            path = Path(directory, file_name).relative_to(local_path)
+            if str(path) not in _SYNC_FILE_NAMES and not ignore(path):
+                yield path
+
+
+def local_manifest(
+    local_path: Path,
+    ignore: Callable[[Path], bool],
+) -> Manifest:
+    """
+    Return a manifest of the files in ``local_path`` which are not ignored.
+    """
+    manifest = {}  # type: Manifest
+    for path in _local_files(local_path=local_path, ignore=ignore):
+        full_path = local_path / path
+        stat_result = full_path.stat()
+        manifest[str(path)] = (
+            stat_result.st_size,
+            int(stat_result.st_mtime),
+            file_sha256(path=full_path),
+        )
+    return manifest
+
+
+def remote_state_script(remote_path: Path, sudo: bool) -> str:
+    """
+    Return a shell script which prints the manifest in ``remote_path``, or
+    ``{}`` if there is none, on one line.
+    It then prints the path, size and modification time of each file in
+    ``remote_path``, each followed by a null character.
+
+    Nothing is printed if ``remote_path`` does not exist.
+    """
+    sudo_prefix = 'sudo ' if sudo else ''
+    return textwrap.dedent(
+        """\
+        cd {remote_path} 2>/dev/null || exit 0
+        {sudo}cat {manifest} 2>/dev/null || printf '{{}}'
+        echo
+        {sudo}find . -type f -printf '%P\\0%s\\0%T@\\0'
+        """,
+    ).format(
+        remote_path=quote(str(remote_path)),
+        manifest=quote(MANIFEST_NAME),
+        sudo=sudo_prefix,
+    )
+
+
+def parse_remote_state(output: bytes) -> Tuple[Manifest, Manifest]:
+    """
+    Parse the output of a script from ``remote_state_script``.
+
+    Returns:
+        The manifest on the node, and the sizes and modification times of the
+        files on the node. The hashes of the files on the node are unknown and
+        are given as empty strings.
+    """
+    if not output:
+        return {}, {}
+
+    manifest_line, _, listing = output.partition(b'\n')
+    try:
+        manifest = {
+            path: (size, mtime, sha256)
+            for path, (size, mtime, sha256) in json.loads(
+                manifest_line.decode(),
+            ).items()
+        }  # type: Manifest
+    except (ValueError, TypeError):
+        # The manifest is corrupt, so no hashes are trusted.
+        manifest = {}
+
+    fields = listing.split(b'\0')
+    remote_files = {}  # type: Manifest
+    for index in range(0, len(fields) - 2, 3):
+        path, size, mtime = fields[index:index + 3]
+        remote_files[os.fsdecode(path)] = (
+            int(size),
+            int(float(mtime)),
+            '',
+        )
+
+    return manifest, remote_files
+
+
+class SyncPlan:
+    """
+    The changes needed to make a directory on a node match a local directory.
+
+    Attributes:
+        to_send: The paths, relative to the local directory, of files to
+            send.
+        to_delete: The paths, relative to the remote directory, of files to
+            delete.
+        manifest: The manifest of the remote directory after the sync.
+        changed: Whether anything on the node needs to change.
+    """
+
+    def __init__(
+        self,
+        local_files: Manifest,
+        remote_manifest: Manifest,
+        remote_files: Manifest,
+        delete_untracked: Optional[Callable[[Path], bool]],
+        ignore: Callable[[Path], bool],
+    ) -> None:
+        """
+        Args:
+            local_files: A manifest of the local directory.
+            remote_manifest: The manifest from the remote directory.
+            remote_files: The sizes and modification times of the files in
+                the remote directory.
+            delete_untracked: A function which is given each path of a file
+                on the node which is neither in the local directory nor in the
+                remote manifest. The file is deleted if this returns ``True``.
+                If this is ``None``, such files are kept.
+            ignore: A function which is given each path of a file on the node.
+                The file is neither changed nor deleted if this returns
+                ``True``.
+        """
+        self.to_send = []  # type: List[str]
+        self.to_delete = []  # type: List[str]
+        self.manifest = {}  # type: Manifest
+
+        for path, (size, mtime, sha256) in sorted(local_files.items()):
+            recorded = remote_manifest.get(path)
+            remote_file = remote_files.get(path)
+            # The recorded hash is only trusted if the file on the node has
+            # not changed since it was recorded.
+            if (
+                recorded is not None and remote_file is not None
+                and recorded[:2] == remote_file[:2] and recorded[2] == sha256
+            ):
+                self.manifest[path] = recorded
+                continue
+
+            self.to_send.append(path)
+            self.manifest[path] = (size, mtime, sha256)
+
+        for path in sorted(remote_files):
+            if path in local_files or path in _SYNC_FILE_NAMES:
+                continue
+            if ignore(Path(path)):
+                continue
+            tracked = path in remote_manifest
+            if tracked or (delete_untracked and delete_untracked(Path(path))):
+                self.to_delete.append(path)
+
+        self.changed = bool(
+            self.to_send or self.to_delete or self.manifest != remote_manifest,
+        )
+
+
+def add_sync_members(
+    tar: tarfile.TarFile,
+    local_path: Path,
+    plan: SyncPlan,
+) -> None:
+    """
+    Add the files to send, the list of files to delete and the new manifest
+    to an archive which is extracted in the remote directory.
+    """
+    for path in plan.to_send:
+        tar.add(str(local_path / path), arcname=path, recursive=False)
+
+    generated_members = {
+        _DELETE_LIST_NAME: b''.join(
+            os.fsencode(path) + b'\0' for path in plan.to_delete
+        ),
+        MANIFEST_NAME: json.dumps(plan.manifest, sort_keys=True).encode(),
+    }
+    for name, content in generated_members.items():
+        tar_info = tarfile.TarInfo(name=name)
+        tar_info.size = len(content)
+        tar_info.mode = 0o644
+        tar.addfile(tar_info, io.BytesIO(content))
+
+
+def apply_sync_script(remote_path: Path, sudo: bool) -> str:
+    """
+    Return a shell script which extracts an archive made with
+    ``add_sync_members`` from its standard input into ``remote_path`` and
+    deletes the files which it lists.
+    """
+    sudo_prefix = 'sudo ' if sudo else ''
+    return textwrap.dedent(
+        """\
+        set -e
+        {sudo}mkdir --parents {remote_path}
+        cd {remote_path}
+        {sudo}tar --extract --file -
+        {sudo}xargs --null --no-run-if-empty rm -f -- < {delete_list}
+        {sudo}rm -f {delete_list}
+        """,
+    ).format(
+        remote_path=quote(str(remote_path)),
+        delete_list=quote(_DELETE_LIST_NAME),
+        sudo=sudo_prefix,
+    )
+
+
+def never(_: Path) -> bool:
+    """
+    Return ``False`` for any path.
+    """
+    return False
+
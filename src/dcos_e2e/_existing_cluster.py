@@ -2,12 +2,55 @@
 Helpers for interacting with existing clusters.
 """
 
+import logging
+import subprocess
+import textwrap
+import uuid
 from pathlib import Path
-from typing import Any, Dict, Iterable, Set, Tuple, Type
+from shlex import quote
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, Type
 
+from dcos_e2e._file_distribution import distribute_file
+from dcos_e2e._serving import serve_script, stop_serving_script
 from dcos_e2e.base_classes import ClusterBackend, ClusterManager
+from dcos_e2e.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 from dcos_e2e.node import Node, Output, Role
 
+LOGGER = logging.getLogger(__name__)
+
+# The port on a bootstrap node which installation files are served from.
+# This is not used by DC/OS, so that a master can be a bootstrap node.
+BOOTSTRAP_PORT = 8086
+
+# The directory on a bootstrap node in which installation files are generated.
+_BOOTSTRAP_DIR = Path('/dcos-install-dir/bootstrap')
+
+
+def _install_from_bootstrap_url_script(bootstrap_url: str, role: Role) -> str:
+    """
+    Return a shell script which downloads ``dcos_install.sh`` from a
+    bootstrap node and runs it to install DC/OS with the given role.
+
+    ``dcos_install.sh`` is run without ``--no-block-dcos-setup``, so that the
+    script only exits after ``dcos-setup`` has downloaded every package from
+    the bootstrap node.
+    """
+    workspace_dir = Path('/dcos-install-dir') / uuid.uuid4().hex
+    return textwrap.dedent(
+        """\
+        set -e
+        mkdir --parents {workspace_dir}
+        cd {workspace_dir}
+        curl --fail --silent --show-error --location \\
+            --output dcos_install.sh {url}
+        bash dcos_install.sh {role}
+        """,
+    ).format(
+        workspace_dir=quote(str(workspace_dir)),
+        url=quote(bootstrap_url + '/dcos_install.sh'),
+        role=quote(role.value),
+    )
+
 
 class ExistingCluster(ClusterBackend):
     """
@@ -19,14 +62,35 @@ class ExistingCluster(ClusterBackend):
         masters: Set[Node],
         agents: Set[Node],
         public_agents: Set[Node],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        bootstrap_node: Optional[Node] = None,
+        send_between_nodes: bool = False,
     ) -> None:
         """
         Create a record of an existing cluster backend for use by a cluster
         manager.
+
+        Args:
+            masters: The master nodes in an existing cluster.
+            agents: The agent nodes in an existing cluster.
+            public_agents: The public agent nodes in an existing cluster.
+            max_workers: The maximum number of nodes to install DC/OS on at
+                once.
+            bootstrap_node: A node to generate DC/OS installation files on
+                and to serve them from, over HTTP on port ``8086``.
+                This may be one of the ``masters``.
+                If this is ``None``, the installer is sent to and run on every
+                node.
+            send_between_nodes: If ``True`` and there is no
+                ``bootstrap_node``, an installer is sent from the host to one
+                node and then between nodes.
         """
         self.masters = masters
         self.agents = agents
         self.public_agents = public_agents
+        self.max_workers = max_workers
+        self.bootstrap_node = bootstrap_node
+        self.send_between_nodes = send_between_nodes
 
     @property
     def cluster_cls(self) -> Type['ExistingClusterManager']:
@@ -84,6 +148,166 @@ class ExistingClusterManager(ClusterManager):
         self._masters = cluster_backend.masters
         self._agents = cluster_backend.agents
         self._public_agents = cluster_backend.public_agents
+        self._max_workers = cluster_backend.max_workers
+        self._bootstrap_node = cluster_backend.bootstrap_node
+        self._send_between_nodes = cluster_backend.send_between_nodes
+
+    def _install_on_nodes(self, install: Callable[[Node, Role], None]) -> None:
+        """
+        Install DC/OS on every node in the cluster.
+
+        DC/OS is installed on all masters at once, and then on all agents and
+        public agents at once.
+        At most ``max_workers`` nodes are installed on at once.
+
+        Args:
+            install: A function which installs DC/OS on a given node with a
+                given role.
+
+        Raises:
+            subprocess.CalledProcessError: There was an error installing DC/OS
+                on a node.
+        """
+        roles = {}  # type: Dict[Node, Role]
+        for nodes, role in (
+            (self.masters, Role.MASTER),
+            (self.agents, Role.AGENT),
+            (self.public_agents, Role.PUBLIC_AGENT),
+        ):
+            for node in nodes:
+                roles[node] = role
+
+        def _install(node: Node) -> None:
+            role = roles[node]
+            log_msg = 'Installing DC/OS on `{node}` as a {role}'.format(
+                node=str(node),
+                role=role.value,
+            )
+            LOGGER.debug(log_msg)
+            try:
+                install(node, role)
+            except subprocess.CalledProcessError as exc:
+                log_msg = (
+                    'Installing DC/OS on `{node}` failed: {exc}\n'
+                    'stdout:\n{stdout}\n'
+                    'stderr:\n{stderr}'
+                ).format(
+                    node=str(node),
+                    exc=exc,
+                    stdout=(exc.stdout or b'').decode(errors='replace'),
+                    stderr=(exc.stderr or b'').decode(errors='replace'),
+                )
+                LOGGER.error(log_msg)
+                raise
+
+        # Masters are installed before agents, as the agents are installed
+        # with the expectation that the masters are already set up.
+        for stage in (
+            self.masters,
+            {*self.agents, *self.public_agents},
+        ):
+            run_concurrently(
+                function=_install,
+                items=stage,
+                max_workers=self._max_workers,
+            )
+
+    def _install_with_bootstrap_node(
+        self,
+        bootstrap_node: Node,
+        remote_dcos_installer: Path,
+        dcos_config: Dict[str, Any],
+        ip_detect_path: Path,
+        output: Output,
+        files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
+    ) -> None:
+        """
+        Generate DC/OS installation files once on the bootstrap node, serve
+        them over HTTP from the bootstrap node and install DC/OS on every node
+        from there.
+
+        Nodes download packages from the bootstrap node while ``dcos-setup``
+        runs, so the installation on each node waits for ``dcos-setup`` to
+        finish.
+        The files are served until then on every node, and then the server is
+        stopped, even if installing DC/OS fails.
+
+        Args:
+            bootstrap_node: The node to generate and serve installation files
+                on.
+            remote_dcos_installer: The path to an installer on the bootstrap
+                node.
+            dcos_config: The DC/OS configuration to use.
+            ip_detect_path: The ``ip-detect`` script to use for installing
+                DC/OS.
+            output: What happens with stdout and stderr.
+            files_to_copy_to_genconf_dir: Pairs of host paths to paths on
+                the installer node. These are files to copy from the host to
+                the bootstrap node before installing DC/OS.
+
+        Raises:
+            subprocess.CalledProcessError: There was an error installing DC/OS
+                on a node.
+        """
+        bootstrap_url = 'http://{ip_address}:{port}'.format(
+            ip_address=bootstrap_node.private_ip_address,
+            port=BOOTSTRAP_PORT,
+        )
+        # pylint: disable=protected-access
+        bootstrap_node._generate_dcos_config(
+            remote_dcos_installer=remote_dcos_installer,
+            dcos_config={
+                **dcos_config,
+                **{
+                    'bootstrap_url': bootstrap_url,
+                },
+            },
+            ip_detect_path=ip_detect_path,
+            files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+            user=None,
+            output=output,
+            transport=None,
+        )
+        # pylint: enable=protected-access
+
+        serve_dir = remote_dcos_installer.parent / 'genconf' / 'serve'
+        bootstrap_node.run(
+            args=[
+                '/bin/sh',
+                '-c',
+                serve_script(
+                    directory=serve_dir,
+                    port=BOOTSTRAP_PORT,
+                    check_url=bootstrap_url + '/dcos_install.sh',
+                ),
+            ],
+            output=output,
+            sudo=True,
+        )
+
+        def _install(node: Node, role: Role) -> None:
+            install_script = _install_from_bootstrap_url_script(
+                bootstrap_url=bootstrap_url,
+                role=role,
+            )
+            node.run(
+                args=['/bin/sh', '-c', install_script],
+                output=output,
+                sudo=True,
+            )
+
+        try:
+            self._install_on_nodes(install=_install)
+        finally:
+            bootstrap_node.run(
+                args=[
+                    '/bin/sh',
+                    '-c',
+                    stop_serving_script(directory=serve_dir),
+                ],
+                output=output,
+                sudo=True,
+            )
 
     def install_dcos_from_url(
         self,
@@ -94,7 +318,12 @@ class ExistingClusterManager(ClusterManager):
         files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
     ) -> None:
         """
-        Install DC/OS from a URL with a bootstrap node.
+        Install DC/OS from a URL.
+
+        If there is a bootstrap node, the installer is downloaded to it and
+        run on it once, and every node installs DC/OS from the files which it
+        serves.
+        Otherwise, the installer is downloaded to and run on every node.
 
         Args:
             dcos_installer: The URL string to an installer to install DC/OS
@@ -106,23 +335,50 @@ class ExistingClusterManager(ClusterManager):
             files_to_copy_to_genconf_dir: Pairs of host paths to paths on
                 the installer node. These are files to copy from the host to
                 the installer node before installing DC/OS.
+
+        Raises:
+            subprocess.CalledProcessError: There was an error installing DC/OS
+                on a node.
         """
-        for nodes, role in (
-            (self.masters, Role.MASTER),
-            (self.agents, Role.AGENT),
-            (self.public_agents, Role.PUBLIC_AGENT),
-        ):
-            for node in nodes:
-                node.install_dcos_from_url(
-                    dcos_installer=dcos_installer,
-                    dcos_config=dcos_config,
-                    ip_detect_path=ip_detect_path,
-                    files_to_copy_to_genconf_dir=(
-                        files_to_copy_to_genconf_dir
-                    ),
-                    role=role,
-                    output=output,
-                )
+
+        if self._bootstrap_node is not None:
+            remote_dcos_installer = _BOOTSTRAP_DIR / 'dcos_generate_config.sh'
+            self._bootstrap_node.run(
+                args=['mkdir', '--parents', str(_BOOTSTRAP_DIR)],
+                sudo=True,
+            )
+            self._bootstrap_node.run(
+                args=[
+                    'curl',
+                    '-f',
+                    dcos_installer,
+                    '-o',
+                    str(remote_dcos_installer),
+                ],
+                output=output,
+                sudo=True,
+            )
+            self._install_with_bootstrap_node(
+                bootstrap_node=self._bootstrap_node,
+                remote_dcos_installer=remote_dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+                output=output,
+            )
+            return
+
+        def _install(node: Node, role: Role) -> None:
+            node.install_dcos_from_url(
+                dcos_installer=dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+                role=role,
+                output=output,
+            )
+
+        self._install_on_nodes(install=_install)
 
     def install_dcos_from_path(
         self,
@@ -135,6 +391,12 @@ class ExistingClusterManager(ClusterManager):
         """
         Install DC/OS from an installer passed as a file system `Path`.
 
+        If there is a bootstrap node, the installer is sent to it and run on it
+        once, and every node installs DC/OS from the files which it serves.
+        Otherwise, the installer is run on every node.
+        It is sent from the host to every node, or, when sending between nodes,
+        to one node which starts sending it on to the others.
+
         Args:
             dcos_installer: The path to an installer to install DC/OS from.
             dcos_config: The DC/OS configuration to use.
@@ -144,24 +406,71 @@ class ExistingClusterManager(ClusterManager):
             files_to_copy_to_genconf_dir: Pairs of host paths to paths on
                 the installer node. These are files to copy from the host to
                 the installer node before installing DC/OS.
+
+        Raises:
+            subprocess.CalledProcessError: There was an error installing DC/OS
+                on a node.
         """
-        for nodes, role in (
-            (self.masters, Role.MASTER),
-            (self.agents, Role.AGENT),
-            (self.public_agents, Role.PUBLIC_AGENT),
-        ):
-            for node in nodes:
-                node.install_dcos_from_path(
-                    dcos_installer=dcos_installer,
+
+        if self._bootstrap_node is not None:
+            remote_dcos_installer = _BOOTSTRAP_DIR / 'dcos_generate_config.sh'
+            self._bootstrap_node.send_file(
+                local_path=dcos_installer,
+                remote_path=remote_dcos_installer,
+                sudo=True,
+                cache=True,
+            )
+            self._install_with_bootstrap_node(
+                bootstrap_node=self._bootstrap_node,
+                remote_dcos_installer=remote_dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+                output=output,
+            )
+            return
+
+        if self._send_between_nodes:
+            remote_dcos_installer = (
+                Path('/dcos-install-dir') / uuid.uuid4().hex /
+                'dcos_generate_config.sh'
+            )
+            distribute_file(
+                local_path=dcos_installer,
+                remote_path=remote_dcos_installer,
+                nodes={*self.masters, *self.agents, *self.public_agents},
+                sudo=True,
+                max_workers=self._max_workers,
+            )
+
+            def _install_from_node_path(node: Node, role: Role) -> None:
+                # pylint: disable=protected-access
+                node._install_dcos_from_node_path(
+                    remote_dcos_installer=remote_dcos_installer,
                     dcos_config=dcos_config,
                     ip_detect_path=ip_detect_path,
                     role=role,
-                    files_to_copy_to_genconf_dir=(
-                        files_to_copy_to_genconf_dir
-                    ),
+                    files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+                    user=None,
                     output=output,
+                    transport=None,
                 )
 
+            self._install_on_nodes(install=_install_from_node_path)
+            return
+
+        def _install(node: Node, role: Role) -> None:
+            node.install_dcos_from_path(
+                dcos_installer=dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                role=role,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+                output=output,
+            )
+
+        self._install_on_nodes(install=_install)
+
     @property
     def masters(self) -> Set[Node]:
         """
@@ -0,0 +1,242 @@
+"""
+Utilities for sending a file to many nodes by sending it from the host to one
+node, and then between nodes.
+
+Each node which has the file serves it over HTTP on its private IP address to
+nodes which do not yet have it.
+The number of nodes with the file doubles in each round, so the file reaches
+``N`` nodes in about ``log2(N)`` rounds, and the host sends it only once.
+The SHA-256 hash of the file is checked on each node which receives it.
+"""
+
+import logging
+import stat
+import textwrap
+import uuid
+from pathlib import Path
+from shlex import quote
+from typing import Dict, Iterable, List, Optional
+
+from ._serving import serve_script, stop_serving_script
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+from .exceptions import NodeErrors
+from .local_cache import file_sha256
+from .node import Node, Output, Transport
+
+LOGGER = logging.getLogger(__name__)
+
+# The port which nodes serve files to other nodes on.
+DISTRIBUTION_PORT = 8087
+
+# The name of the file in the directory served by each node.
+_FILE_NAME = 'file'
+
+
+def _check_script(path: Path, sha256: str) -> str:
+    """
+    Return a shell script which exits with an error if the SHA-256 hash of
+    the file at ``path`` is not ``sha256``.
+    """
+    return textwrap.dedent(
+        """\
+        if ! echo {line} | sha256sum --check --status; then
+            echo 'The SHA-256 hash of {path} is not {sha256}.' >&2
+            exit 1
+        fi
+        """,
+    ).format(
+        line=quote('{sha256}  {path}'.format(sha256=sha256, path=path)),
+        path=quote(str(path)),
+        sha256=sha256,
+    )
+
+
+def _url(node: Node) -> str:
+    """
+    Return the URL of the file served by ``node``.
+    """
+    return 'http://{ip_address}:{port}/{name}'.format(
+        ip_address=node.private_ip_address,
+        port=DISTRIBUTION_PORT,
+        name=_FILE_NAME,
+    )
+
+
+def distribute_file(
+    local_path: Path,
+    remote_path: Path,
+    nodes: Iterable[Node],
+    user: Optional[str] = None,
+    transport: Optional[Transport] = None,
+    sudo: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """
+    Send a file to many nodes, sending it from the host to only one node.
+
+    Args:
+        local_path: The path on the host of the file to send.
+        remote_path: The path on each node to place the file.
+        nodes: The nodes to send the file to.
+        user: The username to communicate as. If ``None`` then the
+            ``default_user`` of each node is used instead.
+        transport: The transport to use for communicating with nodes. If
+            ``None``, the ``Node``'s ``default_transport`` is used.
+        sudo: Whether to use sudo to create and serve the file on nodes.
+        max_workers: The maximum number of nodes to send the file to at once.
+
+    Raises:
+        subprocess.CalledProcessError: Sending the file to a node failed, or
+            the file received by a node did not match ``local_path``.
+    """
+    ordered_nodes = sorted(nodes, key=lambda node: node.public_ip_address)
+    if not ordered_nodes:
+        return
+
+    # Plan rounds of transfers. In each round, each node which has the file
+    # sends it to one node which does not.
+    rounds = []  # type: List[List[Node]]
+    sources = {}  # type: Dict[Node, Node]
+    holders = ordered_nodes[:1]
+    pending = ordered_nodes[1:]
+    while pending:
+        targets = pending[:len(holders)]
+        pending = pending[len(holders):]
+        sources.update(zip(targets, holders))
+        rounds.append(targets)
+        holders = holders + targets
+    serving_nodes = set(sources.values())
+
+    sha256 = file_sha256(path=local_path)
+    mode = stat.S_IMODE(local_path.stat().st_mode)
+    work_dir = Path('/var/tmp') / 'dcos-e2e-{random}'.format(
+        random=uuid.uuid4().hex,
+    )
+    serve_dir = work_dir / 'serve'
+    staged_path = serve_dir / _FILE_NAME
+
+    def _run_script(node: Node, script: str) -> None:
+        node.run(
+            args=['/bin/sh', '-c', 'set -e\n' + script],
+            user=user,
+            output=Output.CAPTURE,
+            transport=transport,
+            sudo=sudo,
+        )
+
+    def _check_and_serve(node: Node) -> str:
+        script = _check_script(path=staged_path, sha256=sha256)
+        if node in serving_nodes:
+            script += serve_script(
+                directory=serve_dir,
+                port=DISTRIBUTION_PORT,
+                check_url=_url(node=node),
+            )
+        return script
+
+    def _receive(node: Node) -> None:
+        script = textwrap.dedent(
+            """\
+            mkdir --parents {serve_dir}
+            curl --fail --silent --show-error --output {path} {url}
+            """,
+        ).format(
+            serve_dir=quote(str(serve_dir)),
+            path=quote(str(staged_path)),
+            url=quote(_url(node=sources[node])),
+        )
+        script += _check_and_serve(node=node)
+        _run_script(node=node, script=script)
+
+    first_node = ordered_nodes[0]
+    try:
+        first_node.send_file(
+            local_path=local_path,
+            remote_path=staged_path,
+            user=user,
+            transport=transport,
+            sudo=sudo,
+        )
+        _run_script(node=first_node, script=_check_and_serve(node=first_node))
+        for targets in rounds:
+            run_concurrently(
+                function=_receive,
+                items=targets,
+                max_workers=max_workers,
+            )
+    except Exception:
+        _clean_up(
+            nodes=ordered_nodes,
+            work_dir=work_dir,
+            user=user,
+            transport=transport,
+            sudo=sudo,
+            max_workers=max_workers,
+        )
+        raise
+
+    def _finish(node: Node) -> None:
+        script = stop_serving_script(directory=serve_dir)
+        script += textwrap.dedent(
+            """\
+            mkdir --parents {parent}
+            chmod {mode:o} {path}
+            mv {path} {remote_path}
+            rm -rf {work_dir}
+            """,
+        ).format(
+            parent=quote(str(remote_path.parent)),
+            mode=mode,
+            path=quote(str(staged_path)),
+            remote_path=quote(str(remote_path)),
+            work_dir=quote(str(work_dir)),
+        )
+        _run_script(node=node, script=script)
+
+    run_concurrently(
+        function=_finish,
+        items=ordered_nodes,
+        max_workers=max_workers,
+    )
+
+
+def _clean_up(
+    nodes: Iterable[Node],
+    work_dir: Path,
+    user: Optional[str],
+    transport: Optional[Transport],
+    sudo: bool,
+    max_workers: int,
+) -> None:
+    """
+    Stop serving and remove any files of a failed distribution from
+    ``nodes``.
+
+    Errors are logged rather than raised, so that they do not hide the error
+    which caused the distribution to fail.
+    """
+    script = stop_serving_script(directory=work_dir / 'serve')
+    script += 'rm -rf {work_dir}\n'.format(work_dir=quote(str(work_dir)))
+
+    def _clean_up_node(node: Node) -> None:
+        node.run(
+            args=['/bin/sh', '-c', script],
+            user=user,
+            output=Output.CAPTURE,
+            transport=transport,
+            sudo=sudo,
+        )
+
+    try:
+        run_concurrently(
+            function=_clean_up_node,
+            items=nodes,
+            max_workers=max_workers,
+            fail_fast=False,
+        )
+    except NodeErrors as exc:
+        for node, error in exc.errors.items():
+            message = 'Cleaning up `{work_dir}` on `{node}` failed: {error}'
+            LOGGER.warning(
+                message.format(work_dir=work_dir, node=node, error=error),
+            )
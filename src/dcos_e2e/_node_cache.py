@@ -0,0 +1,148 @@
+"""
+Utilities for keeping files sent to a node in a cache on that node, so that
+they are not sent again.
+
+Files in the cache are named by the SHA-256 hash of their contents.
+When a file is added, the least recently used files are removed until the
+cache is no larger than a maximum size.
+"""
+
+import textwrap
+from pathlib import Path
+from shlex import quote
+
+# The maximum number of bytes of files to keep in the cache on each node.
+NODE_CACHE_MAX_SIZE = 4 * 1024 * 1024 * 1024
+
+# The cache directory on a node when commands are run with sudo.
+# Otherwise, a directory in the home directory of the user is used.
+_SYSTEM_CACHE_DIR = Path('/var/cache/dcos-e2e')
+
+
+def _script_header(
+    local_path: Path,
+    remote_path: Path,
+    sha256: str,
+    sudo: bool,
+) -> str:
+    """
+    Return the start of a shell script which sets ``cache_dir`` to the cache
+    directory, ``entry`` to the cache entry for ``sha256`` and ``dest`` to the
+    path which ``Node.send_file`` places ``local_path`` at.
+    """
+    if sudo:
+        cache_dir = quote(str(_SYSTEM_CACHE_DIR))
+    else:
+        cache_dir = '"$HOME/.cache/dcos-e2e"'
+
+    return textwrap.dedent(
+        """\
+        set -e
+        cache_dir={cache_dir}
+        entry="$cache_dir"/{sha256}
+        if [ -d {remote_path} ]; then
+            dest={remote_path}/{name}
+        else
+            dest={remote_path}
+        fi
+        """,
+    ).format(
+        cache_dir=cache_dir,
+        sha256=sha256,
+        remote_path=quote(str(remote_path)),
+        name=quote(local_path.name),
+    )
+
+
+def restore_script(
+    local_path: Path,
+    remote_path: Path,
+    sha256: str,
+    user: str,
+    sudo: bool,
+) -> str:
+    """
+    Return a shell script which copies the cache entry for ``local_path`` to
+    where ``Node.send_file`` would place it, and prints ``hit``.
+    Nothing is printed if there is no entry, or if the contents of the entry
+    do not have the SHA-256 hash ``sha256``, for example because the entry
+    was changed on the node.
+
+    Entries are copied rather than linked, so that changes to the copy do not
+    change the cache.
+    Copies are cheap on file systems which support reflinks.
+    """
+    sudo_prefix = 'sudo ' if sudo else ''
+    return _script_header(
+        local_path=local_path,
+        remote_path=remote_path,
+        sha256=sha256,
+        sudo=sudo,
+    ) + textwrap.dedent(
+        """\
+        if [ ! -f "$entry" ]; then
+            exit 0
+        fi
+        entry_sha256="$({sudo}sha256sum "$entry" | cut -d ' ' -f 1)"
+        if [ "$entry_sha256" != {sha256} ]; then
+            exit 0
+        fi
+        {sudo}touch "$entry"
+        {sudo}mkdir --parents "$(dirname "$dest")"
+        {sudo}cp --reflink=auto --preserve=mode "$entry" "$dest"
+        {sudo}chown {user} "$dest"
+        echo hit
+        """,
+    ).format(
+        sha256=sha256,
+        sudo=sudo_prefix,
+        user=quote(user),
+    )
+
+
+def store_script(
+    local_path: Path,
+    remote_path: Path,
+    sha256: str,
+    sudo: bool,
+    max_size: int = NODE_CACHE_MAX_SIZE,
+) -> str:
+    """
+    Return a shell script which adds the copy of ``local_path`` sent by
+    ``Node.send_file`` to the cache, and then removes the least recently used
+    entries until the cache holds at most ``max_size`` bytes.
+    """
+    sudo_prefix = 'sudo ' if sudo else ''
+    return _script_header(
+        local_path=local_path,
+        remote_path=remote_path,
+        sha256=sha256,
+        sudo=sudo,
+    ) + textwrap.dedent(
+        """\
+        {sudo}mkdir --parents "$cache_dir"
+        {sudo}cp --reflink=auto --preserve=mode "$dest" "$cache_dir"/.{sha256}
+        {sudo}mv "$cache_dir"/.{sha256} "$entry"
+        total=0
+        for name in $(ls -t "$cache_dir"); do
+            total=$((total + $(stat -c %s "$cache_dir/$name")))
+            if [ "$total" -gt {max_size} ] && [ "$name" != {sha256} ]; then
+                {sudo}rm -f "$cache_dir/$name"
+            fi
+        done
+        """,
+    ).format(
+        sudo=sudo_prefix,
+        sha256=sha256,
+        max_size=max_size,
+    )
+
+
+def is_cacheable(
+    local_path: Path,
+    max_size: int = NODE_CACHE_MAX_SIZE,
+) -> bool:
+    """
+    Return whether ``local_path`` is a file which fits in the cache.
+    """
+    return local_path.is_file() and local_path.stat().st_size <= max_size
@@ -6,7 +6,9 @@ import abc
 import subprocess
 from ipaddress import IPv4Address
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from dcos_e2e._subprocess_tools import DEFAULT_MAX_MEMORY_SIZE
 
 
 class NodeTransport(abc.ABC):
@@ -25,6 +27,9 @@ class NodeTransport(abc.ABC):
         ssh_key_path: Path,
         public_ip_address: IPv4Address,
         capture_output: bool,
+        stdin: Optional[BinaryIO] = None,
+        lazy_output: bool = False,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
     ) -> subprocess.CompletedProcess:
         """
         Run a command on this node the given user.
@@ -43,6 +48,12 @@ class NodeTransport(abc.ABC):
                 the node as the ``user`` user.
             public_ip_address: The public IP address of the node.
             capture_output: Whether to capture output in the result.
+            stdin: A binary file to send to the standard input of the command.
+            lazy_output: If ``True``, captured stdout and stderr are
+                ``CapturedOutput`` objects rather than ``bytes``.
+            max_memory_size: The number of bytes of each of stdout and stderr
+                to hold in memory before holding the output in a temporary
+                file.
 
         Returns:
             The representation of the finished process.
@@ -74,27 +85,6 @@ class NodeTransport(abc.ABC):
             public_ip_address: The public IP address of the node.
         """
 
-    @abc.abstractmethod
-    def send_file(
-        self,
-        local_path: Path,
-        remote_path: Path,
-        user: str,
-        ssh_key_path: Path,
-        public_ip_address: IPv4Address,
-    ) -> None:
-        """
-        Copy a file to this node.
-
-        Args:
-            local_path: The path on the host of the file to send.
-            remote_path: The path on the node to place the file.
-            user: The name of the remote user to send the file.
-            ssh_key_path: The path to an SSH key which can be used to SSH to
-                the node as the ``user`` user.
-            public_ip_address: The public IP address of the node.
-        """
-
     @abc.abstractmethod
     def download_file(
         self,
@@ -115,3 +105,15 @@ class NodeTransport(abc.ABC):
                 the node as the ``user`` user.
             public_ip_address: The public IP address of the node.
         """
+
+    def close_connections(self, public_ip_address: IPv4Address) -> None:
+        """
+        Close any connections to this node which this transport holds open
+        between commands.
+
+        By default, transports do not hold connections open and so this does
+        nothing.
+
+        Args:
+            public_ip_address: The public IP address of the node.
+        """
@@ -0,0 +1,220 @@
+"""
+Utilities to connect to nodes with the Docker Engine API.
+"""
+
+import logging
+import socket
+import subprocess
+import sys
+import threading
+import time
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from docker.utils.socket import STDERR, STDOUT, frames_iter
+
+from dcos_e2e._archive_tools import CHUNK_SIZE
+from dcos_e2e._node_transports._docker_exec_transport import (
+    DockerExecTransport,
+    _container_from_ip_address,
+    docker_client,
+)
+from dcos_e2e._subprocess_tools import (
+    DEFAULT_MAX_MEMORY_SIZE,
+    CapturedOutput,
+    _LineLogger,
+    captured_result,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# The number of seconds to wait for Docker to record that a command has
+# exited after its output stream ends.
+_EXIT_CODE_TIMEOUT = 60
+
+# The number of seconds to wait for the thread which sends standard input to
+# a command to finish after the command's output stream ends.
+_STDIN_WRITER_TIMEOUT = 60
+
+
+def _send_stdin(stdin: BinaryIO, exec_socket: Any) -> None:
+    """
+    Send the contents of ``stdin`` to the standard input of an exec instance
+    and then close the standard input of the exec instance.
+
+    Args:
+        stdin: The file to send.
+        exec_socket: The socket attached to the exec instance, as returned by
+            ``exec_start``.
+    """
+    # ``exec_start`` returns a ``SocketIO`` wrapper on some platforms.
+    raw_socket = getattr(exec_socket, '_sock', exec_socket)
+    try:
+        for chunk in iter(lambda: stdin.read(CHUNK_SIZE), b''):
+            raw_socket.sendall(chunk)
+        raw_socket.shutdown(socket.SHUT_WR)
+    except OSError:
+        # The command exited without reading all of its standard input.
+        pass
+
+
+def _exit_code(exec_id: str, args: List[str]) -> int:
+    """
+    Return the exit code of a finished exec instance.
+
+    Raises:
+        subprocess.TimeoutExpired: Docker did not record that the command
+            ``args`` run by the exec instance exited within
+            ``_EXIT_CODE_TIMEOUT`` seconds.
+    """
+    client = docker_client()
+    deadline = time.monotonic() + _EXIT_CODE_TIMEOUT
+    # The output stream can end a moment before Docker records that the
+    # process has exited.
+    while time.monotonic() < deadline:
+        exec_info = client.api.exec_inspect(exec_id=exec_id)
+        if not exec_info['Running']:
+            return int(exec_info['ExitCode'])
+        time.sleep(0.01)
+    raise subprocess.TimeoutExpired(cmd=args, timeout=_EXIT_CODE_TIMEOUT)
+
+
+class DockerAPITransport(DockerExecTransport):
+    """
+    A transport for nodes which runs commands with the Docker Engine API.
+
+    This avoids starting a ``docker`` CLI process for each command.
+    ``popen`` still uses the ``docker`` CLI, as the Docker Engine API does
+    not provide a ``subprocess.Popen``.
+    """
+
+    def run(
+        self,
+        args: List[str],
+        user: str,
+        log_output_live: bool,
+        env: Dict[str, Any],
+        tty: bool,
+        ssh_key_path: Path,
+        public_ip_address: IPv4Address,
+        capture_output: bool,
+        stdin: Optional[BinaryIO] = None,
+        lazy_output: bool = False,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command on this node the given user.
+
+        Args:
+            args: The command to run on the node.
+            user: The username to communicate as.
+            log_output_live: If ``True``, log output live. If ``True``, stderr
+                is merged into stdout in the return value.
+            env: Environment variables to be set on the node before running
+                the command. A mapping of environment variable names to
+                values.
+            tty: If ``True``, allocate a pseudo-tty. This means that stderr
+                is merged into stdout.
+            ssh_key_path: The path to an SSH key which can be used to SSH to
+                the node as the ``user`` user.
+            public_ip_address: The public IP address of the node.
+            capture_output: Whether to capture output in the result.
+                If ``False``, output is written to the standard output and
+                standard error of this process.
+            stdin: A binary file to send to the standard input of the command.
+            lazy_output: If ``True``, captured stdout and stderr are
+                ``CapturedOutput`` objects rather than ``bytes``.
+            max_memory_size: The number of bytes of each of stdout and stderr
+                to hold in memory before holding the output in a temporary
+                file.
+
+        Returns:
+            The representation of the finished process.
+
+        Raises:
+            subprocess.CalledProcessError: The process exited with a non-zero
+                code.
+        """
+        client = docker_client()
+        container = _container_from_ip_address(ip_address=public_ip_address)
+        environment = [
+            '{key}={value}'.format(key=key, value=str(value))
+            for key, value in env.items()
+        ]
+        exec_id = client.api.exec_create(
+            container=container.id,
+            cmd=args,
+            stdin=stdin is not None,
+            tty=tty,
+            user=user,
+            environment=environment,
+        )['Id']
+        exec_socket = client.api.exec_start(
+            exec_id=exec_id,
+            tty=tty,
+            socket=True,
+        )
+
+        captured_stdout = CapturedOutput(max_memory_size=max_memory_size)
+        captured_stderr = CapturedOutput(max_memory_size=max_memory_size)
+        stdout_logger = _LineLogger(LOGGER.debug)
+        stderr_logger = _LineLogger(LOGGER.warning)
+        outputs = {
+            STDOUT: (captured_stdout, stdout_logger, sys.stdout),
+            STDERR: (captured_stderr, stderr_logger, sys.stderr),
+        }
+
+        stdin_writer = None  # type: Optional[threading.Thread]
+        if stdin is not None:
+            stdin_writer = threading.Thread(
+                target=_send_stdin,
+                args=(stdin, exec_socket),
+                daemon=True,
+            )
+            stdin_writer.start()
+
+        try:
+            for stream, data in frames_iter(exec_socket, tty=tty):
+                captured_output, line_logger, local_stream = outputs[stream]
+                if not capture_output:
+                    local_stream.buffer.write(data)
+                    local_stream.flush()
+                    continue
+
+                captured_output.write(data)
+                if log_output_live:
+                    line_logger.log(data)
+        finally:
+            # The socket is closed first so that the standard input writer
+            # cannot stay blocked sending to a command which has exited.
+            exec_socket.close()
+            if stdin_writer is not None:
+                stdin_writer.join(timeout=_STDIN_WRITER_TIMEOUT)
+
+        if stdin_writer is not None and stdin_writer.is_alive():
+            raise subprocess.TimeoutExpired(
+                cmd=args,
+                timeout=_STDIN_WRITER_TIMEOUT,
+            )
+
+        stdout_logger.flush()
+        stderr_logger.flush()
+
+        returncode = _exit_code(exec_id=exec_id, args=args)
+        stdout = captured_result(
+            captured_output=captured_stdout if capture_output else None,
+            lazy_output=lazy_output,
+        )
+        stderr = captured_result(
+            captured_output=captured_stderr if capture_output else None,
+            lazy_output=lazy_output,
+        )
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode=returncode,
+                cmd=args,
+                output=stdout,
+                stderr=stderr,
+            )
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
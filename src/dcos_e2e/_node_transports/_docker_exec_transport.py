@@ -4,15 +4,22 @@ Utilities to connect to nodes with Docker exec.
 
 import subprocess
 import sys
+import threading
+from collections import defaultdict
 from ipaddress import IPv4Address
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import DefaultDict  # noqa: F401
+from typing import Any, BinaryIO, Dict, List, Optional
 
 import docker
 from docker.models.containers import Container
 
+from dcos_e2e._archive_tools import CHUNK_SIZE, extract_archive_stream
 from dcos_e2e._node_transports._base_classes import NodeTransport
-from dcos_e2e._subprocess_tools import run_subprocess
+from dcos_e2e._subprocess_tools import (
+    DEFAULT_MAX_MEMORY_SIZE,
+    run_subprocess,
+)
 
 
 def _compose_docker_command(
@@ -21,6 +28,7 @@ def _compose_docker_command(
     env: Dict[str, Any],
     tty: bool,
     public_ip_address: IPv4Address,
+    interactive: bool = False,
 ) -> List[str]:
     """
     Return a command to run ``args`` on a node using ``docker exec``.
@@ -39,6 +47,9 @@ def _compose_docker_command(
         tty: If ``True``, allocate a pseudo-tty. This means that the users
             terminal is attached to the streams of the process.
         public_ip_address: The public IP address of the node.
+        interactive: If ``True``, keep the standard input of the command
+            open, even if the standard input of this process is not a
+            terminal.
 
     Returns:
         The full ``docker exec`` command to be run.
@@ -52,9 +63,11 @@ def _compose_docker_command(
         user,
     ]
 
+    if interactive:
+        docker_exec_args.append('--interactive')
     # Do not cover this because there is currently no test for
     # using this in a terminal in the CI.
-    if sys.stdin.isatty():  # pragma: no cover
+    elif sys.stdin.isatty():  # pragma: no cover
         docker_exec_args.append('--interactive')
 
     if tty:
@@ -85,6 +98,9 @@ class DockerExecTransport(NodeTransport):
         ssh_key_path: Path,
         public_ip_address: IPv4Address,
         capture_output: bool,
+        stdin: Optional[BinaryIO] = None,
+        lazy_output: bool = False,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
     ) -> subprocess.CompletedProcess:
         """
         Run a command on this node the given user.
@@ -103,6 +119,12 @@ class DockerExecTransport(NodeTransport):
                 the node as the ``user`` user.
             public_ip_address: The public IP address of the node.
             capture_output: Whether to capture output in the result.
+            stdin: A binary file to send to the standard input of the command.
+            lazy_output: If ``True``, captured stdout and stderr are
+                ``CapturedOutput`` objects rather than ``bytes``.
+            max_memory_size: The number of bytes of each of stdout and stderr
+                to hold in memory before holding the output in a temporary
+                file.
 
         Returns:
             The representation of the finished process.
@@ -117,12 +139,16 @@ class DockerExecTransport(NodeTransport):
             env=env,
             public_ip_address=public_ip_address,
             tty=tty,
+            interactive=stdin is not None,
         )
 
         return run_subprocess(
             args=docker_exec_args,
             log_output_live=log_output_live,
             pipe_output=capture_output,
+            stdin=stdin,
+            lazy_output=lazy_output,
+            max_memory_size=max_memory_size,
         )
 
     def popen(
@@ -162,38 +188,6 @@ class DockerExecTransport(NodeTransport):
             stderr=subprocess.PIPE,
         )
 
-    def send_file(
-        self,
-        local_path: Path,
-        remote_path: Path,
-        user: str,
-        ssh_key_path: Path,
-        public_ip_address: IPv4Address,
-    ) -> None:
-        """
-        Copy a file to this node.
-
-        Args:
-            local_path: The path on the host of the file to send.
-            remote_path: The path on the node to place the file.
-            user: The name of the remote user to send the file.
-            ssh_key_path: The path to an SSH key which can be used to SSH to
-                the node as the ``user`` user.
-            public_ip_address: The public IP address of the node.
-        """
-        container = _container_from_ip_address(ip_address=public_ip_address)
-        args = [
-            'docker',
-            'cp',
-            str(local_path),
-            container.id + ':' + str(remote_path),
-        ]
-        run_subprocess(
-            args=args,
-            log_output_live=False,
-            pipe_output=True,
-        )
-
     def download_file(
         self,
         remote_path: Path,
@@ -214,31 +208,149 @@ class DockerExecTransport(NodeTransport):
             public_ip_address: The public IP address of the node.
         """
         container = _container_from_ip_address(ip_address=public_ip_address)
-        args = [
-            'docker',
-            'cp',
-            container.id + ':' + str(remote_path),
-            str(local_path),
-        ]
-        run_subprocess(
-            args=args,
-            log_output_live=False,
-            pipe_output=True,
+        chunks, _ = container.get_archive(
+            path=str(remote_path),
+            chunk_size=CHUNK_SIZE,
         )
+        extract_archive_stream(chunks=chunks, local_path=local_path)
+
+
+_CLIENT_LOCK = threading.Lock()
+_CLIENTS = []  # type: List[docker.DockerClient]
+
+
+def docker_client() -> docker.DockerClient:
+    """
+    Return a Docker client shared by all Docker transports.
+
+    Sharing a client means that the API version is negotiated once and that
+    HTTP connections to the Docker daemon are pooled between commands.
+    """
+    with _CLIENT_LOCK:
+        if not _CLIENTS:
+            _CLIENTS.append(docker.from_env(version='auto'))
+        return _CLIENTS[0]
+
+
+# A label given to node containers by the Docker backend, so that they can be
+# listed without listing every container on the host.
+NODE_CONTAINER_LABEL_KEY = 'dcos_e2e.node'
+
+# Docker events which may change which container has which IP address.
+_ADDRESS_EVENTS = ['start', 'die', 'destroy', 'connect', 'disconnect']
+
+
+def _container_ids_by_ip(
+    client: docker.DockerClient,
+    filters: Dict[str, Any],
+) -> Dict[str, List[str]]:
+    """
+    Return a mapping of IP addresses to the IDs of running containers with
+    those IP addresses.
+
+    This uses one API request, rather than one request per container.
+    """
+    container_ids = defaultdict(list)  # type: DefaultDict[str, List[str]]
+    for summary in client.api.containers(filters=filters):
+        networks = summary['NetworkSettings']['Networks']
+        for network in networks.values():
+            container_ids[network['IPAddress']].append(summary['Id'])
+    return dict(container_ids)
+
+
+class _ContainerIndex:
+    """
+    An index of running node containers by IP address, shared by all Docker
+    exec transports.
+
+    The index is built from one listing of containers with the node label.
+    It is marked as stale whenever Docker reports an event which may change
+    container IP addresses, and it is rebuilt on the next lookup.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._container_ids = {}  # type: Dict[str, List[str]]
+        self._stale = True
+        self._watcher = None  # type: Optional[threading.Thread]
+
+    def invalidate(self) -> None:
+        """
+        Mark the index as stale, so that it is rebuilt on the next lookup.
+        """
+        with self._lock:
+            self._stale = True
+
+    def _watch_events(self) -> None:
+        """
+        Start a thread which marks the index as stale on relevant Docker
+        events, if there is not one running already.
+
+        The event stream is opened before this returns, so no events which
+        happen after this returns are missed.
+
+        This must be called with the lock held.
+        """
+        if self._watcher is not None:
+            return
+
+        # The event stream holds a connection open, so it has its own client.
+        events_client = docker.from_env(version='auto')
+        events = events_client.events(
+            decode=True,
+            filters={
+                'type': ['container', 'network'],
+                'event': _ADDRESS_EVENTS,
+            },
+        )
+
+        def _invalidate_on_events() -> None:
+            try:
+                for _ in events:
+                    self.invalidate()
+            finally:
+                # Without the event stream, the index cannot be trusted.
+                # The watcher is cleared with the index marked as stale, so
+                # that the next lookup starts a new watcher.
+                with self._lock:
+                    self._watcher = None
+                    self._stale = True
+
+        watcher = threading.Thread(target=_invalidate_on_events, daemon=True)
+        self._watcher = watcher
+        watcher.start()
+
+    def container(self, ip_address: IPv4Address) -> Container:
+        """
+        Return the running ``Container`` with the given ``ip_address``.
+        """
+        client = docker_client()
+        with self._lock:
+            if self._stale:
+                self._watch_events()
+                self._container_ids = _container_ids_by_ip(
+                    client=client,
+                    filters={'label': NODE_CONTAINER_LABEL_KEY},
+                )
+                self._stale = False
+
+            matching_ids = self._container_ids.get(str(ip_address), [])
+
+        if not matching_ids:
+            # Containers which were not created by the Docker backend do not
+            # have the node label.
+            all_container_ids = _container_ids_by_ip(client=client, filters={})
+            matching_ids = all_container_ids.get(str(ip_address), [])
+
+        assert len(matching_ids) == 1
+        return client.containers.prepare_model(attrs={'Id': matching_ids[0]})
+
+
+_CONTAINER_INDEX = _ContainerIndex()
 
 
 def _container_from_ip_address(ip_address: IPv4Address) -> Container:
     """
     Return the ``Container`` with the given ``ip_address``.
     """
-    client = docker.from_env(version='auto')
-    containers = client.containers.list()
-    matching_containers = []
-    for container in containers:
-        networks = container.attrs['NetworkSettings']['Networks']
-        for net in networks:
-            if networks[net]['IPAddress'] == str(ip_address):
-                matching_containers.append(container)
-
-    assert len(matching_containers) == 1
-    return matching_containers[0]
+    return _CONTAINER_INDEX.container(ip_address=ip_address)
@@ -2,16 +2,214 @@
 Utilities to connect to nodes with SSH.
 """
 
+import atexit
+import hashlib
 import subprocess
+import sys
+import tempfile
+import threading
+from collections import defaultdict
 from ipaddress import IPv4Address
 from pathlib import Path
 from shlex import quote
-from typing import Any, Dict, List
+from shutil import rmtree
+from typing import DefaultDict  # noqa: F401
+from typing import Set  # noqa: F401
+from typing import Any, BinaryIO, Dict, List, Optional
 
 import paramiko
 
 from dcos_e2e._node_transports._base_classes import NodeTransport
-from dcos_e2e._subprocess_tools import run_subprocess
+from dcos_e2e._subprocess_tools import (
+    DEFAULT_MAX_MEMORY_SIZE,
+    run_subprocess,
+)
+
+# The number of seconds that a master connection stays open after the last
+# command which uses it has finished.
+_CONTROL_PERSIST_SECONDS = 300
+
+# The number of seconds to wait for a master connection to be established
+# before commands connect directly instead.
+_CONNECT_TIMEOUT_SECONDS = 30
+
+# The port which nodes accept SSH connections on.
+_SSH_PORT = 22
+
+_CONTROL_LOCK = threading.Lock()
+_CONTROL_DIRS = []  # type: List[Path]
+_CONTROL_PATHS = defaultdict(set)  # type: DefaultDict[str, Set[Path]]
+# Guarded by ``_CONTROL_LOCK``.
+_MASTER_LOCKS = defaultdict(
+    threading.Lock,
+)  # type: DefaultDict[Path, threading.Lock]
+
+
+def _connection_options(ssh_key_path: Path, user: str) -> List[str]:
+    """
+    Return ``ssh`` options which are common to every connection we make.
+    """
+    return [
+        # This makes sure that only keys passed with the -i option are
+        # used. Needed when there are already keys present in the SSH
+        # key chain, which cause `Error: Too many Authentication
+        # Failures`.
+        '-o',
+        'IdentitiesOnly=yes',
+        # The node may be an unknown host.
+        '-o',
+        'StrictHostKeyChecking=no',
+        # Use an SSH key which is authorized.
+        '-i',
+        str(ssh_key_path),
+        # Run commands as the specified user.
+        '-l',
+        user,
+        '-p',
+        str(_SSH_PORT),
+        # Bypass password checking.
+        '-o',
+        'PreferredAuthentications=publickey',
+        # Do not add this node to the standard known hosts file.
+        '-o',
+        'UserKnownHostsFile=/dev/null',
+        # Ignore warnings about remote host identification changes and new
+        # hosts being added to the known hosts file in particular.
+        # Also ignore "Connection to <IP-ADDRESS> closed".
+        '-o',
+        'LogLevel=QUIET',
+    ]
+
+
+def _control_path(
+    user: str,
+    ssh_key_path: Path,
+    public_ip_address: IPv4Address,
+) -> Path:
+    """
+    Return the path to a control socket to share between connections to the
+    given node as the given user with the given key.
+
+    Nodes in different clusters may have the same IP address, for example
+    Docker containers, and so the user, port and key path are part of the
+    socket name as well as the IP address.
+    """
+    with _CONTROL_LOCK:
+        if not _CONTROL_DIRS:
+            # Unix socket paths are limited to around 100 characters, so we
+            # keep both the directory name and the socket name short.
+            control_dir = Path(tempfile.mkdtemp(prefix='dcos-e2e-ssh-'))
+            _CONTROL_DIRS.append(control_dir)
+            atexit.register(_close_all_connections)
+
+        connection = '{user}@{ip}:{port}:{key}'.format(
+            user=user,
+            ip=public_ip_address,
+            port=_SSH_PORT,
+            key=ssh_key_path.resolve(),
+        )
+        digest = hashlib.sha1(connection.encode()).hexdigest()[:16]
+        control_path = _CONTROL_DIRS[0] / digest
+        _CONTROL_PATHS[str(public_ip_address)].add(control_path)
+        return control_path
+
+
+def _ensure_control_master(
+    control_path: Path,
+    user: str,
+    ssh_key_path: Path,
+    public_ip_address: IPv4Address,
+) -> None:
+    """
+    Start a background master connection listening on ``control_path``, if
+    there is not one already.
+
+    The master is started as its own process, with no pipes attached, so that
+    it does not hold open the output pipes of the first command to use it.
+    If the master cannot be started, for example because the node is not yet
+    accepting SSH connections, commands connect directly instead.
+    """
+    with _CONTROL_LOCK:
+        master_lock = _MASTER_LOCKS[control_path]
+
+    with master_lock:
+        if control_path.exists():
+            return
+
+        master_args = [
+            'ssh',
+            *_connection_options(ssh_key_path=ssh_key_path, user=user),
+            '-o',
+            'ControlMaster=yes',
+            '-o',
+            'ControlPath={control_path}'.format(control_path=control_path),
+            '-o',
+            'ControlPersist={seconds}'.format(
+                seconds=_CONTROL_PERSIST_SECONDS,
+            ),
+            # Notice when a node goes away so that the master does not hang
+            # on to a dead connection.
+            '-o',
+            'ServerAliveInterval=5',
+            '-o',
+            'ServerAliveCountMax=3',
+            # Do not hold up commands for long if the node is not reachable.
+            '-o',
+            'ConnectTimeout={seconds}'.format(
+                seconds=_CONNECT_TIMEOUT_SECONDS,
+            ),
+            # Do not run a command, and go to the background after
+            # authentication.
+            '-N',
+            '-f',
+            str(public_ip_address),
+        ]
+        subprocess.run(
+            args=master_args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+def _close_control_master(control_path: Path) -> None:
+    """
+    Ask the master connection listening on ``control_path`` to exit.
+    """
+    if not control_path.exists():
+        return
+
+    exit_args = [
+        'ssh',
+        '-o',
+        'ControlPath={control_path}'.format(control_path=control_path),
+        '-O',
+        'exit',
+        # The destination is required but it is not used.
+        'localhost',
+    ]
+    subprocess.run(
+        args=exit_args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _close_all_connections() -> None:
+    """
+    Close all master connections started by this process and remove the
+    directory which holds their control sockets.
+    """
+    with _CONTROL_LOCK:
+        control_paths = set().union(*_CONTROL_PATHS.values())
+        _CONTROL_PATHS.clear()
+
+    for control_path in control_paths:
+        _close_control_master(control_path=control_path)
+
+    for control_dir in _CONTROL_DIRS:
+        rmtree(path=str(control_dir), ignore_errors=True)
 
 
 def _compose_ssh_command(
@@ -21,6 +219,7 @@ def _compose_ssh_command(
     tty: bool,
     ssh_key_path: Path,
     public_ip_address: IPv4Address,
+    control_path: Optional[Path] = None,
 ) -> List[str]:
     """
     Return a command to run ``args`` on a node over SSH.
@@ -36,6 +235,8 @@ def _compose_ssh_command(
         public_ip_address: The public IP address of the node.
         ssh_key_path: The path to an SSH key which can be used to SSH to
             the node as the ``user`` user.
+        control_path: The path to a control socket of a master connection to
+            share. If ``None``, a new connection is made.
 
     Returns:
         The full SSH command to be run.
@@ -45,33 +246,18 @@ def _compose_ssh_command(
     if tty:
         ssh_args.append('-t')
 
+    if control_path is not None:
+        ssh_args += [
+            # Never become a master ourselves.
+            # If the socket does not exist, connect directly.
+            '-o',
+            'ControlMaster=no',
+            '-o',
+            'ControlPath={control_path}'.format(control_path=control_path),
+        ]
+
+    ssh_args += _connection_options(ssh_key_path=ssh_key_path, user=user)
     ssh_args += [
-        # This makes sure that only keys passed with the -i option are
-        # used. Needed when there are already keys present in the SSH
-        # key chain, which cause `Error: Too many Authentication
-        # Failures`.
-        '-o',
-        'IdentitiesOnly=yes',
-        # The node may be an unknown host.
-        '-o',
-        'StrictHostKeyChecking=no',
-        # Use an SSH key which is authorized.
-        '-i',
-        str(ssh_key_path),
-        # Run commands as the specified user.
-        '-l',
-        user,
-        # Bypass password checking.
-        '-o',
-        'PreferredAuthentications=publickey',
-        # Do not add this node to the standard known hosts file.
-        '-o',
-        'UserKnownHostsFile=/dev/null',
-        # Ignore warnings about remote host identification changes and new
-        # hosts being added to the known hosts file in particular.
-        # Also ignore "Connection to <IP-ADDRESS> closed".
-        '-o',
-        'LogLevel=QUIET',
         str(public_ip_address),
     ] + [
         '{key}={value}'.format(key=k, value=quote(str(v)))
@@ -86,6 +272,57 @@ class SSHTransport(NodeTransport):
     An SSH transport for nodes.
     """
 
+    def __init__(self, reuse_connections: bool = True) -> None:
+        """
+        Args:
+            reuse_connections: Whether to share one master connection per
+                node, user and key between commands, rather than making a
+                new connection for each command. This is not supported on
+                Windows, where a new connection is always made.
+        """
+        self._reuse_connections = bool(
+            reuse_connections and sys.platform != 'win32',
+        )
+
+    def _control_path(
+        self,
+        user: str,
+        ssh_key_path: Path,
+        public_ip_address: IPv4Address,
+    ) -> Optional[Path]:
+        """
+        Return the path to the control socket of a running master connection
+        to share, or ``None`` if connections are not shared.
+        """
+        if not self._reuse_connections:
+            return None
+
+        control_path = _control_path(
+            user=user,
+            ssh_key_path=ssh_key_path,
+            public_ip_address=public_ip_address,
+        )
+        _ensure_control_master(
+            control_path=control_path,
+            user=user,
+            ssh_key_path=ssh_key_path,
+            public_ip_address=public_ip_address,
+        )
+        return control_path
+
+    def close_connections(self, public_ip_address: IPv4Address) -> None:
+        """
+        Close any master connections to the node with the given IP address.
+
+        Args:
+            public_ip_address: The public IP address of the node.
+        """
+        with _CONTROL_LOCK:
+            control_paths = _CONTROL_PATHS.pop(str(public_ip_address), set())
+
+        for control_path in control_paths:
+            _close_control_master(control_path=control_path)
+
     def run(
         self,
         args: List[str],
@@ -96,6 +333,9 @@ class SSHTransport(NodeTransport):
         ssh_key_path: Path,
         public_ip_address: IPv4Address,
         capture_output: bool,
+        stdin: Optional[BinaryIO] = None,
+        lazy_output: bool = False,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
     ) -> subprocess.CompletedProcess:
         """
         Run a command on this node the given user.
@@ -116,6 +356,12 @@ class SSHTransport(NodeTransport):
                 the node as the ``user`` user.
             public_ip_address: The public IP address of the node.
             capture_output: Whether to capture output in the result.
+            stdin: A binary file to send to the standard input of the command.
+            lazy_output: If ``True``, captured stdout and stderr are
+                ``CapturedOutput`` objects rather than ``bytes``.
+            max_memory_size: The number of bytes of each of stdout and stderr
+                to hold in memory before holding the output in a temporary
+                file.
 
         Returns:
             The representation of the finished process.
@@ -131,12 +377,20 @@ class SSHTransport(NodeTransport):
             tty=tty,
             ssh_key_path=ssh_key_path,
             public_ip_address=public_ip_address,
+            control_path=self._control_path(
+                user=user,
+                ssh_key_path=ssh_key_path,
+                public_ip_address=public_ip_address,
+            ),
         )
 
         return run_subprocess(
             args=ssh_args,
             log_output_live=log_output_live,
             pipe_output=capture_output,
+            stdin=stdin,
+            lazy_output=lazy_output,
+            max_memory_size=max_memory_size,
         )
 
     def popen(
@@ -169,6 +423,11 @@ class SSHTransport(NodeTransport):
             tty=False,
             ssh_key_path=ssh_key_path,
             public_ip_address=public_ip_address,
+            control_path=self._control_path(
+                user=user,
+                ssh_key_path=ssh_key_path,
+                public_ip_address=public_ip_address,
+            ),
         )
         return subprocess.Popen(
             args=ssh_args,
@@ -176,39 +435,6 @@ class SSHTransport(NodeTransport):
             stderr=subprocess.PIPE,
         )
 
-    def send_file(
-        self,
-        local_path: Path,
-        remote_path: Path,
-        user: str,
-        ssh_key_path: Path,
-        public_ip_address: IPv4Address,
-    ) -> None:
-        """
-        Copy a file to this node.
-
-        Args:
-            local_path: The path on the host of the file to send.
-            remote_path: The path on the node to place the file.
-            user: The name of the remote user to send the file.
-            ssh_key_path: The path to an SSH key which can be used to SSH to
-                the node as the ``user`` user.
-            public_ip_address: The public IP address of the node.
-        """
-        with paramiko.SSHClient() as ssh_client:
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh_client.connect(
-                str(public_ip_address),
-                username=user,
-                key_filename=str(ssh_key_path),
-            )
-
-            with ssh_client.open_sftp() as sftp:
-                sftp.put(
-                    localpath=str(local_path),
-                    remotepath=str(remote_path),
-                )
-
     def download_file(
         self,
         remote_path: Path,
@@ -0,0 +1,76 @@
+"""
+Utilities for serving files from a node over HTTP to other nodes.
+
+A directory is served by a Python HTTP server running in the background.
+The ID of the server process is kept in a file next to the directory, so
+that the server can be stopped or replaced later.
+"""
+
+import textwrap
+from pathlib import Path
+from shlex import quote
+
+
+def _pid_file(directory: Path) -> Path:
+    """
+    Return the path to the file which holds the ID of the process serving
+    ``directory``.
+    """
+    return directory.parent / (directory.name + '.pid')
+
+
+def stop_serving_script(directory: Path) -> str:
+    """
+    Return a shell script which stops any server which serves ``directory``
+    and waits for it to exit.
+    """
+    return textwrap.dedent(
+        """\
+        if [ -f {pid_file} ]; then
+            pid="$(cat {pid_file})"
+            kill "$pid" 2>/dev/null || true
+            while kill -0 "$pid" 2>/dev/null; do
+                sleep 1
+            done
+            rm -f {pid_file}
+        fi
+        """,
+    ).format(pid_file=quote(str(_pid_file(directory=directory))))
+
+
+def serve_script(directory: Path, port: int, check_url: str) -> str:
+    """
+    Return a shell script which serves ``directory`` over HTTP on ``port`` in
+    the background, replacing any server which already serves it, and waits
+    until ``check_url`` can be downloaded.
+    """
+    log_file = directory.parent / (directory.name + '.log')
+    start_script = textwrap.dedent(
+        """\
+        set -e
+        cd {directory}
+        if command -v python3 >/dev/null; then
+            server='python3 -m http.server {port}'
+        else
+            server='python -m SimpleHTTPServer {port}'
+        fi
+        nohup $server > {log_file} 2>&1 < /dev/null &
+        echo $! > {pid_file}
+        for _ in $(seq 60); do
+            if curl --fail --silent --output /dev/null {url}; then
+                exit 0
+            fi
+            sleep 1
+        done
+        echo 'Serving {directory} failed:' >&2
+        cat {log_file} >&2
+        exit 1
+        """,
+    ).format(
+        directory=quote(str(directory)),
+        port=port,
+        log_file=quote(str(log_file)),
+        pid_file=quote(str(_pid_file(directory=directory))),
+        url=quote(check_url),
+    )
+    return stop_serving_script(directory=directory) + start_script
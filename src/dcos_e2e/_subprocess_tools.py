@@ -2,16 +2,39 @@
 Utilities for running subprocesses.
 """
 
+import io
 import logging
+import mmap
+import os
+import queue
+import shutil
 import subprocess
-import time
+import tempfile
+import threading
 from subprocess import CompletedProcess
-from typing import Callable, Dict, List, Optional, Union
-
-import sarge
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# The maximum number of bytes to read from a pipe at once.
+_READ_SIZE = 64 * 1024
+
+# The default number of bytes of each of stdout and stderr to hold in memory
+# before writing further output to a temporary file.
+DEFAULT_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
 
 def _safe_decode(output_bytes: bytes) -> str:
     """
@@ -29,28 +52,323 @@ def _safe_decode(output_bytes: bytes) -> str:
         )
 
 
+class _LineBuffer:
+    """
+    A buffer which splits chunks of output into full lines.
+    """
+
+    def __init__(self) -> None:
+        # Chunks of a line which has not yet ended.
+        # These are joined when the line ends, so that splitting a long line
+        # takes time linear in its length.
+        self._partial_line = []  # type: List[bytes]
+
+    def add(self, data: bytes) -> List[bytes]:
+        """
+        Add ``data`` to the buffer and return the lines which it ends, without
+        their line endings.
+        """
+        last_newline = data.rfind(b'\n')
+        if last_newline == -1:
+            if data:
+                self._partial_line.append(data)
+            return []
+
+        self._partial_line.append(data[:last_newline])
+        lines = b''.join(self._partial_line).split(b'\n')
+        rest = data[last_newline + 1:]
+        self._partial_line = [rest] if rest else []
+        return lines
+
+    def flush(self) -> Optional[bytes]:
+        """
+        Return any output which is not followed by a line ending, and empty
+        the buffer.
+        """
+        if not self._partial_line:
+            return None
+
+        line = b''.join(self._partial_line)
+        self._partial_line = []
+        return line
+
+
 class _LineLogger:
     """
     A logger which logs full lines.
     """
 
     def __init__(self, logger: Callable[[str], None]) -> None:
-        self._buffer = b''
+        self._buffer = _LineBuffer()
         self._logger = logger
 
     def log(self, data: bytes) -> None:
-        self._buffer += data
+        for line in self._buffer.add(data):
+            self._logger(_safe_decode(line))
+
+    def flush(self) -> None:
+        line = self._buffer.flush()
+        if line is not None:
+            self._logger(_safe_decode(line))
+
+
+class CapturedOutput:
+    """
+    Output captured from a command.
+
+    Output is held in memory until it is larger than a given size, and then it
+    is held in a temporary file.
+    """
+
+    def __init__(self, max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE) -> None:
+        """
+        Args:
+            max_memory_size: The number of bytes to hold in memory before
+                moving the output to a temporary file.
+        """
+        self._max_memory_size = max_memory_size
+        self._file = io.BytesIO()  # type: BinaryIO
+        self._size = 0
+        self._spilled = False
+
+    def write(self, data: bytes) -> None:
+        """
+        Add ``data`` to the end of the output.
+        """
+        new_size = self._size + len(data)
+        if not self._spilled and new_size > self._max_memory_size:
+            temporary_file = tempfile.TemporaryFile()
+            temporary_file.write(self._file.getvalue())  # type: ignore
+            self._file.close()
+            self._file = temporary_file  # type: ignore
+            self._spilled = True
+
+        self._file.write(data)
+        self._size = new_size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bytes__(self) -> bytes:
+        return self.getvalue()
+
+    @property
+    def spilled(self) -> bool:
+        """
+        Whether the output is held in a temporary file rather than in memory.
+        """
+        return self._spilled
+
+    def getvalue(self) -> bytes:
+        """
+        Return all of the output.
+        """
+        self._file.seek(0)
+        return self._file.read()
+
+    def open(self) -> BinaryIO:
+        """
+        Return a file from which the output can be read from the start.
+
+        The file is shared by every call, so only one reader should be used at
+        a time.
+        """
+        self._file.seek(0)
+        return self._file
+
+    def memoryview(self) -> memoryview:
+        """
+        Return a view of the output.
+
+        When the output is in a temporary file, the file is memory mapped
+        rather than copied.
+        Output held in memory is copied, as a view of the in-memory buffer
+        would stop the output from being closed.
+        """
+        if not self._size:
+            return memoryview(b'')
+
+        if not self._spilled:
+            return memoryview(self._file.getvalue())  # type: ignore
+
+        self._file.flush()
+        mapped_file = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        )
+        return memoryview(mapped_file)
+
+    def close(self) -> None:
+        """
+        Discard the output, removing any temporary file.
+        """
+        self._file.close()
+
+
+def _has_fileno(stdin: BinaryIO) -> bool:
+    """
+    Return whether ``stdin`` is backed by a file descriptor which a
+    subprocess can read from directly.
+    """
+    try:
+        stdin.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return True
+
+
+def _write_stdin(source: BinaryIO, destination: BinaryIO) -> None:
+    """
+    Copy ``source`` to the standard input pipe of a subprocess and close the
+    pipe.
+    """
+    try:
+        shutil.copyfileobj(source, destination)
+    except BrokenPipeError:
+        # The subprocess exited before reading all of its input.
+        # Its exit status reports any error.
+        pass
+    finally:
+        try:
+            destination.close()
+        except BrokenPipeError:
+            pass
 
-        lines = self._buffer.split(b'\n')
-        self._buffer = lines.pop()
+
+def _read_pipe(pipe: IO[bytes], chunks: queue.Queue) -> None:
+    """
+    Put each chunk read from ``pipe`` on ``chunks`` with the pipe, until the
+    pipe is closed.
+    An empty chunk is put on ``chunks`` when the pipe is closed, and an
+    exception is put on ``chunks`` if reading fails.
+    """
+    try:
+        file_descriptor = pipe.fileno()
+        while True:
+            data = os.read(file_descriptor, _READ_SIZE)
+            chunks.put((pipe, data))
+            if not data:
+                return
+    except Exception as exc:  # pylint: disable=broad-except
+        chunks.put((pipe, exc))
+
+
+def _iter_chunks(
+    pipes: Sequence[IO[bytes]],
+) -> Iterator[Tuple[IO[bytes], bytes]]:
+    """
+    Yield chunks read from ``pipes`` as they are written, until all of the
+    pipes are closed.
+
+    Each pipe is read in its own thread, as pipes cannot be selected on
+    Windows.
+    This blocks until there is data to read, so it does not poll.
+
+    Yields:
+        Pairs of a pipe and a chunk read from it. An empty chunk is yielded
+        when a pipe is closed.
+    """
+    chunks = queue.Queue()  # type: queue.Queue
+    for pipe in pipes:
+        reader = threading.Thread(
+            target=_read_pipe,
+            args=(pipe, chunks),
+            daemon=True,
+        )
+        reader.start()
+
+    open_pipes = len(pipes)
+    while open_pipes:
+        pipe, data = chunks.get()
+        if isinstance(data, Exception):
+            raise data
+        if not data:
+            open_pipes -= 1
+        yield pipe, data
+
+
+def _pump_output(
+    process: subprocess.Popen,
+    log_output_live: bool,
+    max_memory_size: int,
+) -> Tuple[CapturedOutput, CapturedOutput]:
+    """
+    Read stdout and stderr of ``process`` until both are closed.
+
+    Output which is larger than ``max_memory_size`` is held in a temporary
+    file.
+
+    Returns:
+        The stdout and stderr of ``process``.
+    """
+    stdout = CapturedOutput(max_memory_size=max_memory_size)
+    stderr = CapturedOutput(max_memory_size=max_memory_size)
+    stdout_logger = _LineLogger(LOGGER.debug)
+    stderr_logger = _LineLogger(LOGGER.warning)
+    outputs = {
+        process.stdout: (stdout, stdout_logger),
+        process.stderr: (stderr, stderr_logger),
+    }  # type: Dict[IO[bytes], Tuple[CapturedOutput, _LineLogger]]
+
+    for pipe, data in _iter_chunks(pipes=[process.stdout, process.stderr]):
+        captured_output, line_logger = outputs[pipe]
+        captured_output.write(data)
+        if log_output_live:
+            line_logger.log(data)
+
+    stdout_logger.flush()
+    stderr_logger.flush()
+    return stdout, stderr
+
+
+def iter_output_lines(
+    process: subprocess.Popen,
+) -> Iterator[Tuple[IO[bytes], str]]:
+    """
+    Yield lines from the stdout and stderr of ``process`` as they are
+    written, until both are closed.
+
+    Yields:
+        Pairs of the pipe, ``process.stdout`` or ``process.stderr``, which a
+        line was read from and the decoded line without its line ending.
+    """
+    line_buffers = {
+        pipe: _LineBuffer()
+        for pipe in (process.stdout, process.stderr)
+    }  # type: Dict[IO[bytes], _LineBuffer]
+
+    for pipe, data in _iter_chunks(pipes=[process.stdout, process.stderr]):
+        line_buffer = line_buffers[pipe]
+        if data:
+            lines = line_buffer.add(data)
+        else:
+            last_line = line_buffer.flush()
+            lines = [] if last_line is None else [last_line]
 
         for line in lines:
-            self._logger(_safe_decode(line))
+            yield pipe, _safe_decode(line)
 
-    def flush(self) -> None:
-        if self._buffer:
-            self._logger(_safe_decode(self._buffer))
-            self._buffer = b''
+
+def captured_result(
+    captured_output: Optional[CapturedOutput],
+    lazy_output: bool,
+) -> Union[None, bytes, CapturedOutput]:
+    """
+    Return the value to put in a ``subprocess.CompletedProcess`` for
+    ``captured_output``.
+
+    Args:
+        captured_output: The captured output, if output was captured.
+        lazy_output: Whether to return the ``CapturedOutput`` itself rather
+            than its ``bytes``.
+    """
+    if captured_output is None or lazy_output:
+        return captured_output
+
+    value = captured_output.getvalue()
+    captured_output.close()
+    return value
 
 
 def run_subprocess(
@@ -59,6 +377,9 @@ def run_subprocess(
     cwd: Optional[Union[bytes, str]] = None,
     env: Optional[Dict[str, str]] = None,
     pipe_output: bool = True,
+    stdin: Optional[BinaryIO] = None,
+    lazy_output: bool = False,
+    max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
 ) -> CompletedProcess:
     """
     Run a command in a subprocess.
@@ -74,6 +395,12 @@ def run_subprocess(
             sent to a logger, given ``log_output_live``.
             If ``False``, no output is sent to a logger and the values are
             not returned.
+        stdin: A binary file to use as the standard input of the command.
+            If ``None``, the standard input of this process is inherited.
+        lazy_output: If ``True``, stdout and stderr in the result are
+            ``CapturedOutput`` objects rather than ``bytes``.
+        max_memory_size: The number of bytes of each of stdout and stderr to
+            hold in memory before holding the output in a temporary file.
 
     Returns:
         See :py:func:`subprocess.run`.
@@ -82,61 +409,72 @@ def run_subprocess(
         subprocess.CalledProcessError: See :py:func:`subprocess.run`.
         Exception: An exception was raised in getting the output from the call.
     """
-    stdout_list = []  # type: List[bytes]
-    stderr_list = []  # type: List[bytes]
-    stdout_logger = _LineLogger(LOGGER.debug)
-    stderr_logger = _LineLogger(LOGGER.warning)
+    stdin_writer = None  # type: Optional[threading.Thread]
+    if stdin is None or _has_fileno(stdin=stdin):
+        process_stdin = stdin  # type: Any
+    else:
+        process_stdin = subprocess.PIPE
 
-    def _read_output(process: sarge.Pipeline) -> None:
-        stdout_line = process.stdout.read(block=False)
-        stderr_line = process.stderr.read(block=False)
-        if stdout_line:
-            stdout_list.append(stdout_line)
-            if log_output_live:
-                stdout_logger.log(stdout_line)
-        if stderr_line:
-            stderr_list.append(stderr_line)
-            if log_output_live:
-                stderr_logger.log(stderr_line)
+    output_pipe = subprocess.PIPE if pipe_output else None
+    process = subprocess.Popen(
+        args,
+        cwd=cwd,
+        env=env,
+        stdin=process_stdin,
+        stdout=output_pipe,
+        stderr=output_pipe,
+    )
 
+    captured_stdout = None  # type: Optional[CapturedOutput]
+    captured_stderr = None  # type: Optional[CapturedOutput]
     try:
+        if process_stdin is subprocess.PIPE:
+            stdin_writer = threading.Thread(
+                target=_write_stdin,
+                args=(stdin, process.stdin),
+                daemon=True,
+            )
+            stdin_writer.start()
+
         if pipe_output:
-            process = sarge.capture_both(args, cwd=cwd, env=env, async_=True)
-            while all(
-                command.returncode is None for command in process.commands
-            ):
-                _read_output(process=process)
-                process.poll_all()
-                time.sleep(0.05)
-
-            _read_output(process=process)
-        else:
-            process = sarge.run(args, cwd=cwd, env=env, async_=True)
-
-        stdout_logger.flush()
-        stderr_logger.flush()
-        # stderr/stdout are not readable anymore which usually means
-        # that the child process has exited. However, the child
-        # process has not been wait()ed for yet, i.e. it has not yet
-        # been reaped. That is, its exit status is unknown. Read its
-        # exit status
+            captured_stdout, captured_stderr = _pump_output(
+                process=process,
+                log_output_live=log_output_live,
+                max_memory_size=max_memory_size,
+            )
+
+        # stderr/stdout are closed which usually means that the child
+        # process has exited. However, the child process has not been
+        # wait()ed for yet, i.e. it has not yet been reaped. That is, its exit
+        # status is unknown. Read its exit status
         process.wait()
+        if stdin_writer is not None:
+            stdin_writer.join()
     except Exception:  # pragma: no cover pylint: disable=broad-except
-        for popen_process in process.processes:
-            # We clean up if there is an error while getting the output.
-            # This may not happen while running tests so we ignore coverage.
-
-            # Attempt to give the subprocess(es) a chance to terminate.
-            popen_process.terminate()
-            try:
-                popen_process.wait(1)
-            except subprocess.TimeoutExpired:
-                # If the process cannot terminate cleanly, we just kill it.
-                popen_process.kill()
-            raise
-
-    stdout = b''.join(stdout_list) if pipe_output else None
-    stderr = b''.join(stderr_list) if pipe_output else None
+        # We clean up if there is an error while getting the output.
+        # This may not happen while running tests so we ignore coverage.
+
+        # Attempt to give the subprocess a chance to terminate.
+        process.terminate()
+        try:
+            process.wait(1)
+        except subprocess.TimeoutExpired:
+            # If the process cannot terminate cleanly, we just kill it.
+            process.kill()
+        raise
+    finally:
+        for pipe in (process.stdout, process.stderr):
+            if pipe is not None:
+                pipe.close()
+
+    stdout = captured_result(
+        captured_output=captured_stdout,
+        lazy_output=lazy_output,
+    )
+    stderr = captured_result(
+        captured_output=captured_stderr,
+        lazy_output=lazy_output,
+    )
     if process.returncode != 0:
         raise subprocess.CalledProcessError(
             returncode=process.returncode,
@@ -362,6 +362,8 @@ class AWSCluster(ClusterManager):
                 masters=self.masters,
                 agents=self.agents,
                 public_agents=self.public_agents,
+                wait_for_ssh=False,
+                bootstrap_node=self._bootstrap_node,
             )
 
             cluster.install_dcos_from_url(
@@ -390,6 +392,9 @@ class AWSCluster(ClusterManager):
         """
         Install DC/OS from a given installer with a bootstrap node.
 
+        The installer is sent to the bootstrap node of the AWS stack once, and
+        every node installs DC/OS from the files which it serves.
+
         Args:
             dcos_installer: The ``Path`` to an installer to install DC/OS
                 from.
@@ -405,6 +410,8 @@ class AWSCluster(ClusterManager):
             masters=self.masters,
             agents=self.agents,
             public_agents=self.public_agents,
+            wait_for_ssh=False,
+            bootstrap_node=self._bootstrap_node,
         )
 
         cluster.install_dcos_from_path(
@@ -436,6 +443,19 @@ class AWSCluster(ClusterManager):
 
         rmtree(path=str(self._path), ignore_errors=True)
 
+    @property
+    def _bootstrap_node(self) -> Node:
+        """
+        Return the bootstrap node of the AWS stack.
+        """
+        bootstrap_host = self.cluster_info['bootstrap_host']
+        return Node(
+            public_ip_address=IPv4Address(bootstrap_host.get('public_ip')),
+            private_ip_address=IPv4Address(bootstrap_host.get('private_ip')),
+            default_user=self.launcher.config['bootstrap_ssh_user'],
+            ssh_key_path=self._ssh_key_path,
+        )
+
     @property
     def masters(self) -> Set[Node]:
         """
@@ -23,13 +23,22 @@ from docker.types import Mount
 from dcos_e2e._subprocess_tools import run_subprocess
 from dcos_e2e.base_classes import ClusterBackend, ClusterManager
 from dcos_e2e.cluster import Cluster
+from dcos_e2e.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 from dcos_e2e.distributions import Distribution
 from dcos_e2e.docker_storage_drivers import DockerStorageDriver
 from dcos_e2e.docker_versions import DockerVersion
+from dcos_e2e.exceptions import NodeErrors
 from dcos_e2e.node import Node, Output, Transport
 
 from ._containers import start_dcos_container
 from ._docker_build import build_docker_image
+from ._genconf_cache import (
+    DEFAULT_GENCONF_CACHE_DIR,
+    GENCONF_CACHE_MAX_SIZE,
+    genconf_cache_key,
+    restore_genconf_serve,
+    store_genconf_serve,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -107,6 +116,25 @@ def _get_fallback_storage_driver() -> DockerStorageDriver:
         return DockerStorageDriver.AUFS
 
 
+def _remove_containers(names: Iterable[str]) -> None:
+    """
+    Remove the containers with the given names, if they exist.
+
+    Errors are logged rather than raised, so that they do not hide the error
+    which caused the containers to be removed.
+    """
+    client = docker.from_env(version='auto')
+    for name in names:
+        try:
+            container = client.containers.get(name)
+            container.remove(force=True, v=True)
+        except docker.errors.NotFound:
+            pass
+        except docker.errors.APIError as exc:
+            message = 'Removing container `{name}` failed: {exc}'
+            LOGGER.warning(message.format(name=name, exc=exc))
+
+
 class Docker(ClusterBackend):
     """
     A record of a Docker backend which can be used to create clusters.
@@ -131,6 +159,10 @@ class Docker(ClusterBackend):
         network: Optional[docker.models.networks.Network] = None,
         one_master_host_port_map: Optional[Dict[str, int]] = None,
         mount_sys_fs_cgroup: bool = True,
+        genconf_cache_dir: Optional[Path] = None,
+        genconf_cache_max_size: int = GENCONF_CACHE_MAX_SIZE,
+        docker_binaries_dir: Optional[Path] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> None:
         """
         Create a configuration for a Docker cluster backend.
@@ -183,6 +215,24 @@ class Docker(ClusterBackend):
             mount_sys_fs_cgroup: Whether to mount ``/sys/fs/cgroup`` from the
                 host. This is required to run applications which require
                 cgroup isolation.
+            genconf_cache_dir: The directory in which to cache the files
+                generated by DC/OS installers, so that clusters with the same
+                installer and configuration do not generate them again. By
+                default, a directory in the temporary directory is used.
+                Files are hard linked from this directory when it is on the
+                same file system as ``workspace_dir``, and copied otherwise.
+            genconf_cache_max_size: The maximum number of bytes of files to
+                keep in ``genconf_cache_dir``. The least recently used files
+                are removed first. If this is ``0``, no files are cached.
+            docker_binaries_dir: The directory in which to store the Docker
+                binaries which are installed on nodes. Binaries are
+                downloaded to this directory when they are first needed. If
+                ``None``, the directory given by
+                :py:func:`dcos_e2e.docker_binaries.default_docker_binaries_dir`
+                is used.
+            max_workers: The maximum number of node containers to start, or
+                to install DC/OS on, at once. If any container fails to
+                start, every container of the cluster is removed.
 
         Attributes:
             default_user: A user which can be used to SSH into nodes.
@@ -227,6 +277,15 @@ class Docker(ClusterBackend):
                 start with. This is useful, for example, for later finding all
                 containers started with this backend.
             cgroup_mounts: Mounts to use for cgroups.
+            genconf_cache_dir: The directory in which to cache the files
+                generated by DC/OS installers.
+            genconf_cache_max_size: The maximum number of bytes of files to
+                keep in ``genconf_cache_dir``.
+            docker_binaries_dir: The directory in which to store the Docker
+                binaries which are installed on nodes, or ``None`` to use the
+                default directory.
+            max_workers: The maximum number of node containers to start, or
+                to install DC/OS on, at once.
 
         .. _Containers.run:
             http://docker-py.readthedocs.io/en/stable/containers.html#docker.models.containers.ContainerCollection.run
@@ -250,6 +309,12 @@ class Docker(ClusterBackend):
         self.network = network
         self.one_master_host_port_map = one_master_host_port_map or {}
         self.container_name_prefix = container_name_prefix
+        self.genconf_cache_dir = (
+            genconf_cache_dir or DEFAULT_GENCONF_CACHE_DIR
+        )
+        self.genconf_cache_max_size = genconf_cache_max_size
+        self.docker_binaries_dir = docker_binaries_dir
+        self.max_workers = max_workers
 
         # Deploying some applications, such as Kafka, read from the cgroups
         # isolator to know their CPU quota.
@@ -334,6 +399,9 @@ class DockerCluster(ClusterManager):
         self._default_user = cluster_backend.default_user
         self._default_transport = cluster_backend.transport
         self._bootstrap_tmp_path = cluster_backend.bootstrap_tmp_path
+        self._genconf_cache_dir = cluster_backend.genconf_cache_dir
+        self._genconf_cache_max_size = cluster_backend.genconf_cache_max_size
+        self._max_workers = cluster_backend.max_workers
 
         # To avoid conflicts, we use random container names.
         # We use the same random string for each container in a cluster so
@@ -378,8 +446,8 @@ class DockerCluster(ClusterManager):
         self._agent_prefix = self._cluster_id + '-agent-'
         self._public_agent_prefix = self._cluster_id + '-public-agent-'
 
-        bootstrap_genconf_path = self._genconf_dir / 'serve'
-        bootstrap_genconf_path.mkdir()
+        self._bootstrap_genconf_path = self._genconf_dir / 'serve'
+        self._bootstrap_genconf_path.mkdir()
 
         # See https://success.docker.com/KBase/Different_Types_of_Volumes
         # for a definition of different types of volumes.
@@ -393,6 +461,7 @@ class DockerCluster(ClusterManager):
             tag=docker_image_tag,
             linux_distribution=cluster_backend.linux_distribution,
             docker_version=cluster_backend.docker_version,
+            docker_binaries_dir=cluster_backend.docker_binaries_dir,
         )
 
         certs_mount = Mount(
@@ -403,7 +472,7 @@ class DockerCluster(ClusterManager):
         )
 
         bootstrap_genconf_mount = Mount(
-            source=str(bootstrap_genconf_path),
+            source=str(self._bootstrap_genconf_path),
             target=str(self._bootstrap_tmp_path),
             read_only=True,
             type='bind',
@@ -436,26 +505,25 @@ class DockerCluster(ClusterManager):
             *cluster_backend.custom_master_mounts,
         ]
 
+        # Containers are described first and then started concurrently.
+        # Each container is keyed by its name, which is the same as it would
+        # be if containers were started one at a time.
+        containers = {}  # type: Dict[str, Dict[str, Any]]
         for master_container_number in range(masters):
             ports = {}  # type: Dict[str, int]
             if master_container_number == 0:
                 ports = cluster_backend.one_master_host_port_map
-            start_dcos_container(
-                container_base_name=self._master_prefix,
-                container_number=master_container_number,
-                mounts=master_mounts,
-                tmpfs=node_tmpfs_mounts,
-                docker_image=docker_image_tag,
-                labels={
+            name = self._master_prefix + str(master_container_number)
+            containers[name] = {
+                'container_base_name': self._master_prefix,
+                'container_number': master_container_number,
+                'mounts': master_mounts,
+                'labels': {
                     **cluster_backend.docker_container_labels,
                     **cluster_backend.docker_master_labels,
                 },
-                public_key_path=public_key_path,
-                docker_storage_driver=(cluster_backend.docker_storage_driver),
-                docker_version=cluster_backend.docker_version,
-                network=cluster_backend.network,
-                ports=ports,
-            )
+                'ports': ports,
+            }
 
         for nodes, prefix, labels, mounts in (
             (
@@ -472,23 +540,37 @@ class DockerCluster(ClusterManager):
             ),
         ):
             for agent_container_number in range(nodes):
-                start_dcos_container(
-                    container_base_name=prefix,
-                    container_number=agent_container_number,
-                    mounts=mounts,
-                    tmpfs=node_tmpfs_mounts,
-                    docker_image=docker_image_tag,
-                    labels={
+                name = prefix + str(agent_container_number)
+                containers[name] = {
+                    'container_base_name': prefix,
+                    'container_number': agent_container_number,
+                    'mounts': mounts,
+                    'labels': {
                         **cluster_backend.docker_container_labels,
                         **labels,
                     },
-                    public_key_path=public_key_path,
-                    docker_storage_driver=(
-                        cluster_backend.docker_storage_driver
-                    ),
-                    docker_version=cluster_backend.docker_version,
-                    network=cluster_backend.network,
-                )
+                }
+
+        def _start(name: str) -> None:
+            start_dcos_container(
+                tmpfs=node_tmpfs_mounts,
+                docker_image=docker_image_tag,
+                public_key_path=public_key_path,
+                docker_storage_driver=cluster_backend.docker_storage_driver,
+                docker_version=cluster_backend.docker_version,
+                network=cluster_backend.network,
+                **containers[name],
+            )
+
+        try:
+            run_concurrently(
+                function=_start,
+                items=containers.keys(),
+                max_workers=cluster_backend.max_workers,
+            )
+        except Exception:
+            _remove_containers(names=containers.keys())
+            raise
 
     def install_dcos_from_url(
         self,
@@ -516,6 +598,7 @@ class DockerCluster(ClusterManager):
             masters=self.masters,
             agents=self.agents,
             public_agents=self.public_agents,
+            wait_for_ssh=False,
         )
 
         cluster.install_dcos_from_url(
@@ -550,6 +633,110 @@ class DockerCluster(ClusterManager):
 
         Raises:
             CalledProcessError: There was an error installing DC/OS on a node.
+                DC/OS is installed on every node even if it fails on some, and
+                the output from each failed node is logged.
+        """
+        files_to_copy_to_genconf_dir = list(files_to_copy_to_genconf_dir)
+        # Generating the files which nodes install DC/OS from takes minutes,
+        # so we reuse the files generated for an earlier cluster with the
+        # same inputs if there are any.
+        genconf_key = None  # type: Optional[str]
+        if self._genconf_cache_max_size > 0:
+            genconf_key = genconf_cache_key(
+                dcos_installer=dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+            )
+
+        restored = genconf_key is not None and restore_genconf_serve(
+            cache_dir=self._genconf_cache_dir,
+            key=genconf_key,
+            serve_dir=self._bootstrap_genconf_path,
+        )
+        if not restored:
+            self._generate_genconf_serve(
+                dcos_installer=dcos_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=ip_detect_path,
+                output=output,
+                files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+            )
+            if genconf_key is not None:
+                store_genconf_serve(
+                    cache_dir=self._genconf_cache_dir,
+                    key=genconf_key,
+                    serve_dir=self._bootstrap_genconf_path,
+                    max_size=self._genconf_cache_max_size,
+                )
+
+        roles = {}  # type: Dict[Node, str]
+        for role, nodes in [
+            ('master', self.masters),
+            ('slave', self.agents),
+            ('slave_public', self.public_agents),
+        ]:
+            for node in nodes:
+                roles[node] = role
+
+        def _install(node: Node) -> None:
+            dcos_install_args = [
+                '/bin/bash',
+                str(self._bootstrap_tmp_path / 'dcos_install.sh'),
+                '--no-block-dcos-setup',
+                roles[node],
+            ]
+
+            try:
+                node.run(args=dcos_install_args)
+            except subprocess.CalledProcessError as ex:  # pragma: no cover
+                LOGGER.error(
+                    'Installing DC/OS on `{node}` failed'.format(
+                        node=str(node),
+                    ),
+                )
+                LOGGER.error(ex.stdout)
+                LOGGER.error(ex.stderr)
+                raise
+
+        # ``dcos_install.sh`` is run with ``--no-block-dcos-setup`` so it only
+        # unpacks and enables units, and so it is safe to run on every node
+        # at once.
+        try:
+            run_concurrently(
+                function=_install,
+                items=roles.keys(),
+                max_workers=self._max_workers,
+                fail_fast=False,
+            )
+        except NodeErrors as exc:  # pragma: no cover
+            # The error from every node has been logged.
+            # We raise the error from the first node which failed, in the
+            # same way as when installing on one node at a time.
+            raise next(iter(exc.errors.values())) from exc
+
+    def _generate_genconf_serve(
+        self,
+        dcos_installer: Path,
+        dcos_config: Dict[str, Any],
+        ip_detect_path: Path,
+        output: Output,
+        files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
+    ) -> None:
+        """
+        Run the installer to generate the files which nodes install DC/OS
+        from, in the ``genconf/serve`` directory which is mounted to nodes.
+
+        Args:
+            dcos_installer: The ``Path`` to an installer to install DC/OS
+                from.
+            dcos_config: The DC/OS configuration to use.
+            ip_detect_path: The ``ip-detect`` script that is used for
+                installing DC/OS.
+            output: What happens with stdout and stderr.
+            files_to_copy_to_genconf_dir: Pairs of host paths to paths on
+                the installer node. These are files to copy from the host to
+                the installer node before installing DC/OS.
         """
         copyfile(
             src=str(ip_detect_path),
@@ -605,26 +792,6 @@ class DockerCluster(ClusterManager):
             pipe_output=capture_output,
         )
 
-        for role, nodes in [
-            ('master', self.masters),
-            ('slave', self.agents),
-            ('slave_public', self.public_agents),
-        ]:
-            dcos_install_args = [
-                '/bin/bash',
-                str(self._bootstrap_tmp_path / 'dcos_install.sh'),
-                '--no-block-dcos-setup',
-                role,
-            ]
-
-            for node in nodes:
-                try:
-                    node.run(args=dcos_install_args)
-                except subprocess.CalledProcessError as ex:  # pragma: no cover
-                    LOGGER.error(ex.stdout)
-                    LOGGER.error(ex.stderr)
-                    raise
-
     def destroy_node(self, node: Node) -> None:
         """
         Destroy a node in the cluster.
@@ -4,15 +4,80 @@ Helpers for starting DC/OS containers.
 
 import configparser
 import io
+import logging
 import shlex
+import tarfile
+import textwrap
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import docker
 
+from dcos_e2e._node_transports._docker_exec_transport import (
+    NODE_CONTAINER_LABEL_KEY,
+)
 from dcos_e2e.docker_storage_drivers import DockerStorageDriver
 from dcos_e2e.docker_versions import DockerVersion
 
+LOGGER = logging.getLogger(__name__)
+
+# The directory in node containers which holds files used to set up the
+# container.
+_SETUP_DIR = Path('/var/lib/dcos-e2e')
+_SETUP_SCRIPT_PATH = _SETUP_DIR / 'setup.sh'
+_PUBLIC_KEY_PATH = _SETUP_DIR / 'id_rsa.pub'
+_DOCKER_SERVICE_PATH = Path('/lib/systemd/system/docker.service')
+
+# The steps to set up a node container, in order.
+# Each step is a name and a shell script.
+# All output from a step is shown if it fails.
+_SETUP_STEPS = (
+    (
+        'Configure the Docker cgroup',
+        """
+        CGROUP=`grep memory /proc/1/cgroup | cut -d: -f3`
+        echo "CGROUP_PARENT=$CGROUP/docker" >> /etc/docker/env
+        """,
+    ),
+    (
+        'Start Docker',
+        """
+        systemctl enable docker.service
+        systemctl start docker.service
+        """,
+    ),
+    (
+        'Configure Mesos',
+        # Run Mesos without `systemd` support.
+        """
+        mkdir -p /var/lib/dcos
+        echo 'MESOS_SYSTEMD_ENABLE_SUPPORT=false' >> \\
+            /var/lib/dcos/mesos-slave-common
+        MESOS_CGROUPS_ROOT=`grep memory /proc/1/cgroup | cut -d: -f3`/mesos
+        MESOS_CGROUPS_ROOT=${MESOS_CGROUPS_ROOT:1}
+        echo "MESOS_CGROUPS_ROOT=$MESOS_CGROUPS_ROOT" >> \\
+            /var/lib/dcos/mesos-slave-common
+        """,
+    ),
+    (
+        'Start sshd',
+        """
+        mkdir --parents /root/.ssh
+        cat "$PUBLIC_KEY_PATH" >> /root/.ssh/authorized_keys
+        rm -f /run/nologin
+        systemctl start sshd
+        """,
+    ),
+    (
+        'Create the journal directory',
+        # Work around https://jira.mesosphere.com/browse/DCOS_OSS-1361.
+        """
+        systemd-tmpfiles --create --prefix /run/log/journal
+        """,
+    ),
+)  # type: Tuple[Tuple[str, str], ...]
+
 
 def _docker_service_file(
     storage_driver: DockerStorageDriver,
@@ -77,6 +142,59 @@ def _docker_service_file(
     return config_string.read()
 
 
+def _setup_script() -> str:
+    """
+    Return a shell script which runs each step in ``_SETUP_STEPS``.
+
+    Each step stops at its first failing command.
+    If a step fails, the script prints the name and output of the step and
+    exits with an error.
+    """
+    script = textwrap.dedent(
+        """\
+        #!/bin/bash
+        export PUBLIC_KEY_PATH={public_key_path}
+
+        run_step() {{
+            local output
+            if ! output="$(/bin/bash -e -c "$2" 2>&1)"; then
+                echo "Step failed: $1"
+                echo "$output"
+                exit 1
+            fi
+        }}
+
+        """,
+    ).format(public_key_path=shlex.quote(str(_PUBLIC_KEY_PATH)))
+    for name, step_script in _SETUP_STEPS:
+        script += 'run_step {name} {step_script}\n'.format(
+            name=shlex.quote(name),
+            step_script=shlex.quote(textwrap.dedent(step_script).strip()),
+        )
+    return script
+
+
+def _setup_archive(docker_service_text: str, public_key: str) -> bytes:
+    """
+    Return a tar archive of the files used to set up a node container, to
+    extract at ``/`` in the container.
+    """
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w') as tar:
+        for path, content, mode in (
+            (_SETUP_SCRIPT_PATH, _setup_script(), 0o755),
+            (_PUBLIC_KEY_PATH, public_key, 0o644),
+            (_DOCKER_SERVICE_PATH, docker_service_text, 0o644),
+        ):
+            data = content.encode()
+            tar_info = tarfile.TarInfo(name=str(path.relative_to('/')))
+            tar_info.size = len(data)
+            tar_info.mode = mode
+            tar_info.mtime = int(time.time())
+            tar.addfile(tarinfo=tar_info, fileobj=io.BytesIO(data))
+    return archive.getvalue()
+
+
 def start_dcos_container(
     container_base_name: str,
     container_number: int,
@@ -130,64 +248,43 @@ def start_dcos_container(
         image=docker_image,
         mounts=mounts,
         tmpfs=tmpfs,
-        labels=labels,
+        labels={
+            **labels,
+            NODE_CONTAINER_LABEL_KEY: 'true',
+        },
         stop_signal='SIGRTMIN+3',
         command=['/sbin/init'],
         ports=ports or {},
     )
     if network:
         network.connect(container)
-    container.start()
 
-    disable_systemd_support_cmd = (
-        "echo 'MESOS_SYSTEMD_ENABLE_SUPPORT=false' >> "
-        '/var/lib/dcos/mesos-slave-common'
-    )
-
-    setup_mesos_cgroup_root = (
-        'MESOS_CGROUPS_ROOT=`grep memory /proc/1/cgroup | cut -d: -f3`/mesos; '
-        'MESOS_CGROUPS_ROOT=${MESOS_CGROUPS_ROOT:1}; '
-        'echo "MESOS_CGROUPS_ROOT=$MESOS_CGROUPS_ROOT" >> '
-        '/var/lib/dcos/mesos-slave-common'
+    # Files are added before the container starts, so that the only command
+    # run in the container is the setup script.
+    container.put_archive(
+        path='/',
+        data=_setup_archive(
+            docker_service_text=_docker_service_file(
+                storage_driver=docker_storage_driver,
+                docker_version=docker_version,
+            ),
+            public_key=public_key_path.read_text(),
+        ),
     )
+    container.start()
 
-    docker_service_name = 'docker.service'
-    docker_service_text = _docker_service_file(
-        storage_driver=docker_storage_driver,
-        docker_version=docker_version,
+    start_time = time.monotonic()
+    exit_code, output = container.exec_run(
+        cmd=['/bin/bash', str(_SETUP_SCRIPT_PATH)],
     )
-    docker_service_dst = '/lib/systemd/system/' + docker_service_name
-    echo_docker = [
-        'echo',
-        '-e',
-        shlex.quote(docker_service_text),
-        '>',
-        docker_service_dst,
-    ]
-    docker_env_setup = (
-        'CGROUP=`grep memory /proc/1/cgroup | cut -d: -f3`; '
-        'echo "CGROUP_PARENT=$CGROUP/docker" >> '
-        '/etc/docker/env'
+    message = (
+        'Setting up container `{name}` failed with exit code {exit_code}:\n'
+        '{output}'
+    ).format(name=hostname, exit_code=exit_code, output=output.decode())
+    assert exit_code == 0, message
+    LOGGER.debug(
+        'Set up container `{name}` in {seconds:.2f} seconds'.format(
+            name=hostname,
+            seconds=time.monotonic() - start_time,
+        ),
     )
-
-    public_key = public_key_path.read_text()
-    echo_key = ['echo', public_key, '>>', '/root/.ssh/authorized_keys']
-
-    for cmd in [
-        ['mkdir', '-p', '/var/lib/dcos'],
-        ['/bin/bash', '-c', docker_env_setup],
-        ['mkdir', '-p', '/lib/systemd/system'],
-        '/bin/bash -c "{cmd}"'.format(cmd=' '.join(echo_docker)),
-        ['systemctl', 'enable', docker_service_name],
-        ['systemctl', 'start', docker_service_name],
-        ['/bin/bash', '-c', disable_systemd_support_cmd],
-        ['/bin/bash', '-c', setup_mesos_cgroup_root],
-        ['mkdir', '--parents', '/root/.ssh'],
-        '/bin/bash -c "{cmd}"'.format(cmd=' '.join(echo_key)),
-        ['rm', '-f', '/run/nologin', '||', 'true'],
-        ['systemctl', 'start', 'sshd'],
-        # Work around https://jira.mesosphere.com/browse/DCOS_OSS-1361.
-        ['systemd-tmpfiles', '--create', '--prefix', '/run/log/journal'],
-    ]:
-        exit_code, output = container.exec_run(cmd=cmd)
-        assert exit_code == 0, ' '.join(cmd) + ': ' + output.decode()
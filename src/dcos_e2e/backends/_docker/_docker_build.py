@@ -2,12 +2,23 @@
 Helpers for building Docker images.
 """
 
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
 from pathlib import Path
+from typing import Dict, Optional
 
 import docker
 
 from dcos_e2e.distributions import Distribution
+from dcos_e2e.docker_binaries import (
+    docker_binaries_url,
+    download_docker_binaries,
+)
 from dcos_e2e.docker_versions import DockerVersion
+from dcos_e2e.local_cache import file_sha256
 
 
 def _base_dockerfile(linux_distribution: Distribution) -> Path:
@@ -26,6 +37,55 @@ def _base_dockerfile(linux_distribution: Distribution) -> Path:
     return dockerfiles / distro_path_segment
 
 
+# The label on images built by ``build_docker_image`` which holds a hash of
+# the inputs to the build.
+BUILD_HASH_LABEL_KEY = 'dcos_e2e.build_hash'
+
+
+def _build_hash(
+    context: Path,
+    inputs: Dict[str, str],
+    base_hash: str = '',
+) -> str:
+    """
+    Return a hash of the inputs to building an image from ``context``.
+
+    Args:
+        context: The directory including a Dockerfile to build from.
+        inputs: Inputs to the build other than the files in ``context``.
+        base_hash: The build hash of the image which the Dockerfile is based
+            on, if it is built by ``build_docker_image``.
+    """
+    digest = hashlib.sha256()
+    digest.update(base_hash.encode() + b'\0')
+    for name, value in sorted(inputs.items()):
+        digest.update('{name}={value}'.format(name=name, value=value).encode())
+        digest.update(b'\0')
+
+    for root, dirnames, filenames in os.walk(str(context)):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = Path(root) / filename
+            # Docker copies the permissions of files in the build context.
+            mode = file_path.stat().st_mode & 0o777
+            digest.update(str(file_path.relative_to(context)).encode())
+            digest.update('\0{mode:o}\0'.format(mode=mode).encode())
+            digest.update(file_sha256(path=file_path).encode())
+    return digest.hexdigest()
+
+
+def _existing_image(
+    client: docker.DockerClient,
+    build_hash: str,
+) -> Optional[docker.models.images.Image]:
+    """
+    Return an image built with the given build hash, if there is one.
+    """
+    label = '{key}={value}'.format(key=BUILD_HASH_LABEL_KEY, value=build_hash)
+    images = client.images.list(filters={'label': label})
+    return images[0] if images else None
+
+
 def _docker_dockerfile() -> Path:
     """
     Return the directory including a Dockerfile to use to install Docker.
@@ -34,13 +94,40 @@ def _docker_dockerfile() -> Path:
     return current_parent / 'resources' / 'dockerfiles' / 'base-docker'
 
 
+def _extract_docker_binaries(archive_path: Path, context: Path) -> None:
+    """
+    Extract an archive of Docker static binaries to the ``docker`` directory
+    in ``context``.
+    """
+    with tarfile.open(str(archive_path)) as tar:
+        for member in tar.getmembers():
+            member_path = Path(member.name)
+            if member_path.is_absolute() or '..' in member_path.parts:
+                message = 'Unexpected path in {archive}: {name}'.format(
+                    archive=archive_path,
+                    name=member.name,
+                )
+                raise ValueError(message)
+        tar.extractall(path=str(context))
+
+
 def build_docker_image(
     tag: str,
     linux_distribution: Distribution,
     docker_version: DockerVersion,
+    docker_binaries_dir: Optional[Path] = None,
 ) -> None:
     """
-    Build a Docker image to use for node containers.
+    Build a Docker image to use for node containers, or reuse an image built
+    from the same Dockerfiles and Docker binaries.
+
+    Args:
+        tag: The tag to give the image.
+        linux_distribution: The Linux distribution of the image.
+        docker_version: The version of Docker to install in the image.
+        docker_binaries_dir: The directory which Docker binaries are stored
+            in. If ``None``, the default directory is used. Binaries are only
+            downloaded if they are not in this directory.
     """
     base_tag = tag + ':base'
 
@@ -48,26 +135,56 @@ def build_docker_image(
     base_dockerfile = _base_dockerfile(linux_distribution=linux_distribution)
     docker_dockerfile = _docker_dockerfile()
 
-    docker_urls = {
-        DockerVersion.v1_11_2:
-        'https://get.docker.com/builds/Linux/x86_64/docker-1.11.2.tgz',
-        DockerVersion.v1_13_1:
-        'https://get.docker.com/builds/Linux/x86_64/docker-1.13.1.tgz',
-        DockerVersion.v17_12_1_ce:
-        'https://download.docker.com/linux/static/stable/x86_64/docker-17.12.1-ce.tgz',  # noqa: E501
-    }
-
-    client.images.build(
-        path=str(base_dockerfile),
-        rm=True,
-        forcerm=True,
-        tag=base_tag,
+    inputs = {'DOCKER_URL': docker_binaries_url(docker_version=docker_version)}
+    base_hash = _build_hash(context=base_dockerfile, inputs={})
+    build_hash = _build_hash(
+        context=docker_dockerfile,
+        inputs=inputs,
+        base_hash=base_hash,
     )
 
-    client.images.build(
-        path=str(docker_dockerfile),
-        rm=True,
-        forcerm=True,
-        tag=tag,
-        buildargs={'DOCKER_URL': docker_urls[docker_version]},
+    # Building an image, even if every step is cached, sends the build
+    # context to the Docker daemon and checks each step.
+    # When an image was built from the same inputs, we use it instead.
+    existing_image = _existing_image(client=client, build_hash=build_hash)
+    if existing_image is not None:
+        existing_image.tag(repository=tag, tag='latest')
+        return
+
+    # The Dockerfile which installs Docker is based on the image tagged
+    # ``base_tag``, which may have been built for a different distribution.
+    existing_base_image = _existing_image(client=client, build_hash=base_hash)
+    if existing_base_image is None:
+        client.images.build(
+            path=str(base_dockerfile),
+            rm=True,
+            forcerm=True,
+            tag=base_tag,
+            labels={BUILD_HASH_LABEL_KEY: base_hash},
+        )
+    else:
+        existing_base_image.tag(repository=tag, tag='base')
+
+    # Docker binaries are added to the build context from a local store
+    # rather than downloaded during the build, so that they are downloaded
+    # once, and so that images can be built without network access.
+    archive_path = download_docker_binaries(
+        docker_version=docker_version,
+        store_dir=docker_binaries_dir,
     )
+    with tempfile.TemporaryDirectory() as context:
+        shutil.copy(
+            src=str(docker_dockerfile / 'Dockerfile'),
+            dst=context,
+        )
+        _extract_docker_binaries(
+            archive_path=archive_path,
+            context=Path(context),
+        )
+        client.images.build(
+            path=context,
+            rm=True,
+            forcerm=True,
+            tag=tag,
+            labels={BUILD_HASH_LABEL_KEY: build_hash},
+        )
@@ -0,0 +1,226 @@
+"""
+A cache of the ``genconf/serve`` directories made by DC/OS installers, so
+that clusters with the same installer and configuration do not generate
+them again.
+
+Each entry is a directory named by a key which is the SHA-256 hash of the
+installer, the configuration, the ``ip-detect`` script and the files copied
+to the ``genconf`` directory.
+Files are hard linked into and out of the cache where possible, and copied
+otherwise, for example when the cache is on a different file system to the
+cluster's workspace.
+When an entry is added, the least recently used entries are removed until
+the cache is no larger than a maximum size.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from tempfile import gettempdir
+from typing import Any, Dict, Iterable, List, Tuple
+
+from dcos_e2e.local_cache import file_sha256, local_file_sha256
+
+LOGGER = logging.getLogger(__name__)
+
+# The default maximum number of bytes of files to keep in the cache.
+GENCONF_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+# The default directory to keep the cache in.
+# A directory which is shared between workspaces is used, so that clusters
+# created with different workspaces share cached files.
+DEFAULT_GENCONF_CACHE_DIR = Path(gettempdir()) / 'dcos-e2e-genconf-cache'
+
+# The version of the layout of cache entries.
+# Changing this makes existing entries unused, and they are later evicted.
+_CACHE_FORMAT_VERSION = 1
+
+
+def _link_or_copy_tree(src: Path, dst: Path) -> None:
+    """
+    Recreate the directory tree at ``src`` in the existing directory ``dst``,
+    hard linking files where possible and copying them otherwise.
+    """
+    for root, dirnames, filenames in os.walk(str(src)):
+        relative_root = Path(root).relative_to(src)
+        for dirname in dirnames:
+            source_dir = Path(root) / dirname
+            destination_dir = dst / relative_root / dirname
+            if source_dir.is_symlink():
+                os.symlink(os.readlink(str(source_dir)), str(destination_dir))
+            else:
+                destination_dir.mkdir()
+
+        for filename in filenames:
+            source_file = Path(root) / filename
+            destination_file = dst / relative_root / filename
+            if source_file.is_symlink():
+                os.symlink(
+                    os.readlink(str(source_file)),
+                    str(destination_file),
+                )
+                continue
+
+            try:
+                os.link(str(source_file), str(destination_file))
+            except OSError:
+                shutil.copy2(str(source_file), str(destination_file))
+
+
+def _tree_size(path: Path) -> int:
+    """
+    Return the total size in bytes of the files in the tree at ``path``.
+    """
+    size = 0
+    for root, _, filenames in os.walk(str(path)):
+        for filename in filenames:
+            file_path = Path(root) / filename
+            if not file_path.is_symlink():
+                size += file_path.stat().st_size
+    return size
+
+
+def _update_with_tree(digest: Any, path: Path) -> None:
+    """
+    Update ``digest`` with the relative paths and contents of the files in
+    the tree at ``path``, in a stable order.
+    """
+    if path.is_file():
+        digest.update(file_sha256(path=path).encode())
+        return
+
+    for root, dirnames, filenames in os.walk(str(path)):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = Path(root) / filename
+            digest.update(str(file_path.relative_to(path)).encode() + b'\0')
+            digest.update(file_sha256(path=file_path).encode())
+
+
+def genconf_cache_key(
+    dcos_installer: Path,
+    dcos_config: Dict[str, Any],
+    ip_detect_path: Path,
+    files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
+) -> str:
+    """
+    Return the key of the cache entry for the ``genconf/serve`` directory
+    made by ``dcos_installer`` with the given inputs.
+
+    The configuration is normalized, so that configurations which differ only
+    in the order of keys have the same key.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(_CACHE_FORMAT_VERSION).encode() + b'\0')
+    digest.update(local_file_sha256(local_path=dcos_installer).encode())
+    config = json.dumps(dcos_config, sort_keys=True, default=str)
+    digest.update(hashlib.sha256(config.encode()).hexdigest().encode())
+    digest.update(file_sha256(path=ip_detect_path).encode())
+    for host_path, installer_path in sorted(
+        files_to_copy_to_genconf_dir,
+        key=lambda paths: str(paths[1]),
+    ):
+        digest.update(str(installer_path).encode() + b'\0')
+        _update_with_tree(digest=digest, path=host_path)
+    return digest.hexdigest()
+
+
+def restore_genconf_serve(
+    cache_dir: Path,
+    key: str,
+    serve_dir: Path,
+) -> bool:
+    """
+    Fill the empty directory ``serve_dir`` from the cache entry ``key``.
+
+    Returns:
+        Whether there was an entry to fill ``serve_dir`` from. If there was
+        not, or it could not be used, ``serve_dir`` is left empty.
+    """
+    entry = cache_dir / key
+    if not entry.is_dir():
+        return False
+
+    try:
+        _link_or_copy_tree(src=entry, dst=serve_dir)
+        # The modification time of an entry records when it was last used.
+        os.utime(str(entry))
+    except OSError as exc:
+        # For example, another process may be evicting the entry.
+        message = 'Using the cached genconf files in `{entry}` failed: {exc}'
+        LOGGER.warning(message.format(entry=entry, exc=exc))
+        for child in serve_dir.iterdir():
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(str(child))
+            else:
+                child.unlink()
+        return False
+
+    return True
+
+
+def store_genconf_serve(
+    cache_dir: Path,
+    key: str,
+    serve_dir: Path,
+    max_size: int = GENCONF_CACHE_MAX_SIZE,
+) -> None:
+    """
+    Add ``serve_dir`` to the cache as the entry ``key``, and then remove the
+    least recently used entries until the cache holds at most ``max_size``
+    bytes.
+
+    Errors are logged rather than raised, as the cache is only an
+    optimization.
+    """
+    entry = cache_dir / key
+    # Entries are built under a temporary name and then renamed, so that an
+    # entry is never seen partly built.
+    partial_entry = cache_dir / '.{key}-{random}'.format(
+        key=key,
+        random=uuid.uuid4().hex,
+    )
+    try:
+        if _tree_size(path=serve_dir) > max_size:
+            return
+        partial_entry.mkdir(parents=True)
+        _link_or_copy_tree(src=serve_dir, dst=partial_entry)
+        os.rename(str(partial_entry), str(entry))
+    except OSError as exc:
+        # Another process may have added the same entry first.
+        if not entry.is_dir():
+            message = 'Caching the genconf files in `{path}` failed: {exc}'
+            LOGGER.warning(message.format(path=serve_dir, exc=exc))
+        shutil.rmtree(str(partial_entry), ignore_errors=True)
+        return
+
+    _evict(cache_dir=cache_dir, keep=entry, max_size=max_size)
+
+
+def _evict(cache_dir: Path, keep: Path, max_size: int) -> None:
+    """
+    Remove the least recently used entries other than ``keep`` from the cache
+    until it holds at most ``max_size`` bytes.
+    """
+    entries = []  # type: List[Tuple[float, int, Path]]
+    for child in cache_dir.iterdir():
+        if child.name.startswith('.') or not child.is_dir():
+            continue
+        try:
+            entries.append(
+                (child.stat().st_mtime, _tree_size(path=child), child),
+            )
+        except OSError:
+            # Another process may be evicting the entry.
+            continue
+
+    total = 0
+    for _, size, child in sorted(entries, reverse=True):
+        total += size
+        if total > max_size and child != keep:
+            shutil.rmtree(str(child), ignore_errors=True)
+
@@ -180,6 +180,7 @@ class VagrantCluster(ClusterManager):
             masters=self.masters,
             agents=self.agents,
             public_agents=self.public_agents,
+            wait_for_ssh=False,
         )
 
         cluster.install_dcos_from_url(
@@ -215,6 +216,7 @@ class VagrantCluster(ClusterManager):
             masters=self.masters,
             agents=self.agents,
             public_agents=self.public_agents,
+            wait_for_ssh=False,
         )
 
         cluster.install_dcos_from_path(
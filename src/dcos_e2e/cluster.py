@@ -14,11 +14,13 @@ import timeout_decorator
 from retry import retry
 
 from ._existing_cluster import ExistingCluster as _ExistingCluster
+from ._file_distribution import distribute_file
 from ._vendor.dcos_test_utils.dcos_api import DcosApiSession, DcosUser
 from ._vendor.dcos_test_utils.enterprise import EnterpriseApiSession
 from ._vendor.dcos_test_utils.helpers import CI_CREDENTIALS
 from .base_classes import ClusterManager  # noqa: F401
 from .base_classes import ClusterBackend
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 from .exceptions import DCOSTimeoutError
 from .node import Node, Output, Transport
 
@@ -80,6 +82,7 @@ class Cluster(ContextDecorator):
         masters: int = 1,
         agents: int = 1,
         public_agents: int = 1,
+        wait_for_ssh: bool = True,
     ) -> None:
         """
         Create a DC/OS cluster.
@@ -89,6 +92,8 @@ class Cluster(ContextDecorator):
             masters: The number of master nodes to create.
             agents: The number of agent nodes to create.
             public_agents: The number of public agent nodes to create.
+            wait_for_ssh: Whether to wait until SSH is available on all nodes
+                before returning. Nodes are checked at the same time.
         """
         self._cluster = cluster_backend.cluster_cls(
             masters=masters,
@@ -98,12 +103,15 @@ class Cluster(ContextDecorator):
         )  # type: ClusterManager
         self._base_config = cluster_backend.base_config
 
-        for node in {
-            *self.masters,
-            *self.agents,
-            *self.public_agents,
-        }:
-            _wait_for_ssh(node=node)
+        if wait_for_ssh:
+            run_concurrently(
+                function=_wait_for_ssh,
+                items={
+                    *self.masters,
+                    *self.agents,
+                    *self.public_agents,
+                },
+            )
 
     @classmethod
     def from_nodes(
@@ -111,6 +119,10 @@ class Cluster(ContextDecorator):
         masters: Set[Node],
         agents: Set[Node],
         public_agents: Set[Node],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        wait_for_ssh: bool = True,
+        bootstrap_node: Optional[Node] = None,
+        send_between_nodes: bool = False,
     ) -> 'Cluster':
         """
         Create a cluster from existing nodes.
@@ -119,6 +131,21 @@ class Cluster(ContextDecorator):
             masters: The master nodes in an existing cluster.
             agents: The agent nodes in an existing cluster.
             public_agents: The public agent nodes in an existing cluster.
+            max_workers: The maximum number of nodes to install DC/OS on at
+                once.
+            wait_for_ssh: Whether to wait until SSH is available on all nodes
+                before returning. Set this to ``False`` for nodes which are
+                known to be up.
+            bootstrap_node: A node to generate DC/OS installation files on
+                and to serve them from, over HTTP on port ``8086``, when
+                installing DC/OS.
+                This may be one of the ``masters``.
+                If this is ``None``, the installer is sent to and run on every
+                node.
+            send_between_nodes: If ``True`` and there is no
+                ``bootstrap_node``, an installer given to
+                :meth:`install_dcos_from_path` is sent from the host to one
+                node and then between nodes, as with :meth:`send_file`.
 
         Returns:
             A cluster object with the nodes of an existing cluster.
@@ -127,6 +154,9 @@ class Cluster(ContextDecorator):
             masters=masters,
             agents=agents,
             public_agents=public_agents,
+            max_workers=max_workers,
+            bootstrap_node=bootstrap_node,
+            send_between_nodes=send_between_nodes,
         )
 
         return cls(
@@ -134,6 +164,7 @@ class Cluster(ContextDecorator):
             agents=len(agents),
             public_agents=len(public_agents),
             cluster_backend=backend,
+            wait_for_ssh=wait_for_ssh,
         )
 
     @retry(
@@ -150,29 +181,31 @@ class Cluster(ContextDecorator):
         exists on DC/OS 1.9. ``node-poststart`` requires ``sudo`` to allow
         reading the CA certificate used by certain checks.
         """
-        for node in self.masters:
-            log_msg = 'Running a poststart check on `{}`'.format(str(node))
-            LOGGER.debug(log_msg)
-            node.run(
-                args=[
-                    'sudo',
-                    '/opt/mesosphere/bin/dcos-check-runner',
-                    'check',
-                    'node-poststart',
-                    '||',
-                    'sudo',
-                    '/opt/mesosphere/bin/dcos-diagnostics',
-                    'check',
-                    'node-poststart',
-                    '||',
-                    '/opt/mesosphere/bin/3dt',
-                    '--diag',
-                ],
-                # We capture output because else we would see a lot of output
-                # in a normal cluster start up, for example during tests.
-                output=Output.CAPTURE,
-                shell=True,
-            )
+        log_msg = 'Running a poststart check on `{masters}`'.format(
+            masters=', '.join(str(node) for node in self.masters),
+        )
+        LOGGER.debug(log_msg)
+        self.run_on_nodes(
+            nodes=self.masters,
+            args=[
+                'sudo',
+                '/opt/mesosphere/bin/dcos-check-runner',
+                'check',
+                'node-poststart',
+                '||',
+                'sudo',
+                '/opt/mesosphere/bin/dcos-diagnostics',
+                'check',
+                'node-poststart',
+                '||',
+                '/opt/mesosphere/bin/3dt',
+                '--diag',
+            ],
+            # We capture output because else we would see a lot of output
+            # in a normal cluster start up, for example during tests.
+            output=Output.CAPTURE,
+            shell=True,
+        )
 
     def wait_for_dcos_oss(
         self,
@@ -444,6 +477,212 @@ class Cluster(ContextDecorator):
             **self._base_config,
         }
 
+    def run_on_nodes(
+        self,
+        nodes: Iterable[Node],
+        args: List[str],
+        user: Optional[str] = None,
+        output: Output = Output.CAPTURE,
+        env: Optional[Dict[str, Any]] = None,
+        shell: bool = False,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        fail_fast: bool = True,
+    ) -> Dict[Node, subprocess.CompletedProcess]:
+        """
+        Run a command on many nodes at once.
+
+        Args:
+            nodes: The nodes to run the command on.
+            args: The command to run on each node.
+            user: See :py:meth:`dcos_e2e.node.Node.run`.
+            output: See :py:meth:`dcos_e2e.node.Node.run`.
+            env: See :py:meth:`dcos_e2e.node.Node.run`.
+            shell: See :py:meth:`dcos_e2e.node.Node.run`.
+            transport: See :py:meth:`dcos_e2e.node.Node.run`.
+            sudo: See :py:meth:`dcos_e2e.node.Node.run`.
+            max_workers: The maximum number of nodes to run the command on at
+                once.
+            fail_fast: If ``True``, the command is not started on any more
+                nodes after it fails on a node. Commands which are already
+                running are waited for, and then the error from the first node
+                on which the command failed is raised.
+                If ``False``, the command is run on every node and then any
+                errors are raised together.
+
+        Returns:
+            A mapping of each node to the result of running the command on that
+            node.
+
+        Raises:
+            subprocess.CalledProcessError: ``fail_fast`` is ``True`` and the
+                command exited with a non-zero code on a node.
+            dcos_e2e.exceptions.NodeErrors: ``fail_fast`` is ``False`` and
+                the command failed on at least one node. The errors and the
+                results for each node are available on this exception.
+        """
+
+        def _run(node: Node) -> subprocess.CompletedProcess:
+            return node.run(
+                args=args,
+                user=user,
+                output=output,
+                env=env,
+                shell=shell,
+                transport=transport,
+                sudo=sudo,
+            )
+
+        return run_concurrently(
+            function=_run,
+            items=nodes,
+            max_workers=max_workers,
+            fail_fast=fail_fast,
+        )
+
+    def send_file(
+        self,
+        local_path: Path,
+        remote_path: Path,
+        nodes: Optional[Iterable[Node]] = None,
+        user: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+        between_nodes: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        """
+        Send a file to many nodes at once.
+
+        Args:
+            local_path: The path on the host of the file to send.
+            remote_path: The path on each node to place the file.
+            nodes: The nodes to send the file to. If ``None``, the file is
+                sent to all nodes in the cluster.
+            user: See :py:meth:`dcos_e2e.node.Node.send_file`.
+            transport: See :py:meth:`dcos_e2e.node.Node.send_file`.
+            sudo: See :py:meth:`dcos_e2e.node.Node.send_file`.
+            between_nodes: If ``True``, the file is sent from the host to one
+                node only. Nodes which have the file then serve it over HTTP,
+                on their private IP addresses and port ``8087``, to nodes which
+                do not, so that the number of nodes with the file doubles
+                until all nodes have it. The SHA-256 hash of the file is
+                checked on each node.
+                This sends much less data from the host to large clusters.
+                Nodes need ``curl``, ``sha256sum`` and Python.
+                If ``False``, the file is sent from the host to each node.
+            max_workers: The maximum number of nodes to send the file to at
+                once.
+
+        Raises:
+            subprocess.CalledProcessError: Sending the file to a node failed.
+        """
+        if nodes is None:
+            nodes = {*self.masters, *self.agents, *self.public_agents}
+
+        if between_nodes:
+            distribute_file(
+                local_path=local_path,
+                remote_path=remote_path,
+                nodes=nodes,
+                user=user,
+                transport=transport,
+                sudo=sudo,
+                max_workers=max_workers,
+            )
+            return
+
+        def _send_file(node: Node) -> None:
+            node.send_file(
+                local_path=local_path,
+                remote_path=remote_path,
+                user=user,
+                transport=transport,
+                sudo=sudo,
+            )
+
+        run_concurrently(
+            function=_send_file,
+            items=nodes,
+            max_workers=max_workers,
+        )
+
+    def download(
+        self,
+        remote_paths: Iterable[Path],
+        local_dir: Path,
+        nodes: Optional[Iterable[Node]] = None,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+        compress: Optional[bool] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        fail_fast: bool = False,
+    ) -> Dict[Node, Path]:
+        """
+        Download files and directories from many nodes at once.
+
+        Each node's files are put in a directory in ``local_dir`` named after
+        the node's public IP address.
+        In that directory, each remote path is put at its own path, relative to
+        ``/``.
+        For example, ``/var/log`` on a node with the IP address ``10.0.0.1``
+        is downloaded to ``local_dir / '10.0.0.1' / 'var' / 'log'``.
+
+        Args:
+            remote_paths: The paths on the nodes of files and directories to
+                download.
+            local_dir: The existing directory on the host to download to.
+            nodes: The nodes to download from. If ``None``, all nodes in the
+                cluster are used.
+            transport: See :py:meth:`dcos_e2e.node.Node.download`.
+            sudo: See :py:meth:`dcos_e2e.node.Node.download`.
+            compress: See :py:meth:`dcos_e2e.node.Node.download`.
+            max_workers: The maximum number of nodes to download from at once.
+            fail_fast: If ``True``, no more downloads are started after a
+                download fails. Downloads which are already running are
+                waited for, and then the error from the first node which failed
+                is raised.
+                If ``False``, every node is downloaded from and then any errors
+                are raised together.
+
+        Returns:
+            A mapping of each node to the directory its files were downloaded
+            to.
+
+        Raises:
+            subprocess.CalledProcessError: ``fail_fast`` is ``True`` and a
+                download failed on a node.
+            dcos_e2e.exceptions.NodeErrors: ``fail_fast`` is ``False`` and
+                a download failed on at least one node.
+        """
+        if nodes is None:
+            nodes = {*self.masters, *self.agents, *self.public_agents}
+
+        remote_paths = list(remote_paths)
+
+        def _download(node: Node) -> Path:
+            node_dir = local_dir / str(node.public_ip_address)
+            for remote_path in remote_paths:
+                relative_path = remote_path.relative_to(remote_path.anchor)
+                local_path = node_dir / relative_path
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                node.download(
+                    remote_path=remote_path,
+                    local_path=local_path,
+                    transport=transport,
+                    sudo=sudo,
+                    compress=compress,
+                )
+            return node_dir
+
+        return run_concurrently(
+            function=_download,
+            items=nodes,
+            max_workers=max_workers,
+            fail_fast=fail_fast,
+        )
+
     def install_dcos_from_url(
         self,
         dcos_installer: str,
@@ -465,8 +704,12 @@ class Cluster(ContextDecorator):
 
         However, some backends may not support using a bootstrap node. For
         these backends, each node will download and extract the installer.
-        This may be very slow, as the installer is downloaded to
-        and extracted on each node, one at a time.
+        This may be slow, as the installer is downloaded to and extracted on
+        each node.
+        Clusters created with :meth:`Cluster.from_nodes` use a bootstrap node
+        if one is given.
+        DC/OS is installed on all masters at once, and then on all agents and
+        public agents at once.
 
         Args:
             dcos_installer: The URL string to an installer to install DC/OS
@@ -594,12 +837,20 @@ class Cluster(ContextDecorator):
         """
         Destroy all nodes in the cluster.
         """
+        for node in {
+            *self.masters,
+            *self.agents,
+            *self.public_agents,
+        }:
+            node.close_connections()
+
         self._cluster.destroy()
 
     def destroy_node(self, node: Node) -> None:
         """
         Destroy a node in the cluster.
         """
+        node.close_connections()
         self._cluster.destroy_node(node=node)
 
     def __exit__(
@@ -0,0 +1,93 @@
+"""
+Utilities for running an operation on many nodes at once.
+"""
+
+from concurrent.futures import Future  # noqa: F401
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import List  # noqa: F401
+from typing import Callable, Dict, Iterable, TypeVar
+
+from .exceptions import NodeErrors
+
+# The default maximum number of operations to run at once.
+DEFAULT_MAX_WORKERS = 16
+
+_Item = TypeVar('_Item')
+_Result = TypeVar('_Result')
+
+
+def run_concurrently(
+    function: Callable[[_Item], _Result],
+    items: Iterable[_Item],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    fail_fast: bool = True,
+) -> Dict[_Item, _Result]:
+    """
+    Call ``function`` with each item in ``items``, in a pool of threads.
+
+    Args:
+        function: The function to call with each item.
+        items: The items, for example nodes, to call ``function`` with.
+        max_workers: The maximum number of calls to run at once.
+        fail_fast: If ``True``, no new calls are started after a call raises
+            an exception. Calls which are already running are waited for,
+            and then the exception from the first failed item is raised.
+            If ``False``, every call is made and then any errors are raised
+            together.
+
+    Returns:
+        A mapping of each item to the result of calling ``function`` with it.
+
+    Raises:
+        NodeErrors: ``fail_fast`` is ``False`` and at least one call raised
+            an exception.
+        Exception: ``fail_fast`` is ``True`` and a call raised this
+            exception.
+    """
+    ordered_items = []  # type: List[_Item]
+    for item in items:
+        if item not in ordered_items:
+            ordered_items.append(item)
+
+    if not ordered_items:
+        return {}
+
+    return_when = FIRST_EXCEPTION if fail_fast else ALL_COMPLETED
+    workers = min(max_workers, len(ordered_items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            item: executor.submit(function, item)
+            for item in ordered_items
+        }  # type: Dict[_Item, Future]
+        _, not_done = wait(futures.values(), return_when=return_when)
+        for future in not_done:
+            # This only cancels calls which have not started.
+            future.cancel()
+
+    results = {}  # type: Dict[_Item, _Result]
+    errors = {}  # type: Dict[_Item, BaseException]
+    for item in ordered_items:
+        future = futures[item]
+        if future.cancelled():
+            continue
+        error = future.exception()
+        if error is None:
+            results[item] = future.result()
+        else:
+            errors[item] = error
+
+    if not errors:
+        return results
+
+    if fail_fast:
+        first_failed_item = next(
+            item for item in ordered_items if item in errors
+        )
+        raise errors[first_failed_item]
+
+    raise NodeErrors(errors=errors, results=results)
@@ -0,0 +1,141 @@
+"""
+A local store of the Docker static binaries which are installed on nodes.
+
+Each binaries archive is downloaded once, and is only used if its SHA-256
+hash matches the hash pinned for its Docker version.
+The hash is recorded next to the archive after it is downloaded.
+An archive which does not match is downloaded again.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from ._archive_tools import CHUNK_SIZE
+from .docker_versions import DockerVersion
+from .local_cache import default_cache_dir, file_sha256
+
+# The URL and the SHA-256 hash of the archive of binaries for each Docker
+# version.
+_DOCKER_BINARIES = {
+    DockerVersion.v1_11_2: (
+        'https://get.docker.com/builds/Linux/x86_64/docker-1.11.2.tgz',
+        '8c2e0c35e3cda11706f54b2d46c2521a6e9026a7b13c7d4b8ae1f3a706fc55e1',
+    ),
+    DockerVersion.v1_13_1: (
+        'https://get.docker.com/builds/Linux/x86_64/docker-1.13.1.tgz',
+        '97892375e756fd29a304bd8cd9ffb256c2e7c8fd759e12a55a6336e15100ad75',
+    ),
+    DockerVersion.v17_12_1_ce: (
+        'https://download.docker.com/linux/static/stable/x86_64/docker-17.12.1-ce.tgz',  # noqa: E501
+        '1270dce1bd7e1838d62ae21d2505d87f16efc1d9074645571daaefdfd0c14054',
+    ),
+}
+
+
+def docker_binaries_url(docker_version: DockerVersion) -> str:
+    """
+    Return the URL of the archive of Docker static binaries for
+    ``docker_version``.
+    """
+    url, _ = _DOCKER_BINARIES[docker_version]
+    return url
+
+
+def default_docker_binaries_dir() -> Path:
+    """
+    Return the directory which Docker binaries are stored in by default.
+
+    This is in the directory given by
+    :py:func:`dcos_e2e.local_cache.default_cache_dir`.
+    """
+    return default_cache_dir() / 'docker-binaries'
+
+
+def _is_valid(archive_path: Path, sha256: str) -> bool:
+    """
+    Return whether the archive at ``archive_path`` has the SHA-256 hash
+    ``sha256``.
+    """
+    try:
+        return file_sha256(path=archive_path) == sha256
+    except OSError:
+        return False
+
+
+def _write_atomically(path: Path, text: str) -> None:
+    """
+    Write ``text`` to ``path`` so that other processes see either the old
+    file or the complete new file.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=str(path.parent))
+    try:
+        with os.fdopen(file_descriptor, 'w') as file:
+            file.write(text)
+        os.replace(temporary_path, str(path))
+    except BaseException:
+        Path(temporary_path).unlink()
+        raise
+
+
+def download_docker_binaries(
+    docker_version: DockerVersion,
+    store_dir: Optional[Path] = None,
+) -> Path:
+    """
+    Download the archive of Docker static binaries for ``docker_version`` to
+    a local store, unless it is already there.
+
+    Args:
+        docker_version: The Docker version to get binaries for.
+        store_dir: The directory to store archives in. If ``None``, the
+            directory given by :py:func:`default_docker_binaries_dir` is used.
+
+    Returns:
+        The path to the archive.
+
+    Raises:
+        requests.exceptions.RequestException: The archive is not in the
+            store, and downloading it failed.
+        ValueError: The downloaded archive does not have the SHA-256 hash
+            pinned for ``docker_version``.
+    """
+    store_dir = store_dir or default_docker_binaries_dir()
+    url, sha256 = _DOCKER_BINARIES[docker_version]
+    archive_path = store_dir / url.split('/')[-1]
+    sha256_path = archive_path.parent / (archive_path.name + '.sha256')
+    if _is_valid(archive_path=archive_path, sha256=sha256):
+        return archive_path
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    response = requests.get(url, stream=True)
+    response.raise_for_status()
+
+    # The archive is written under a temporary name and then renamed, so
+    # that other processes never use a partly written archive.
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=str(store_dir))
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                file.write(chunk)
+        downloaded_sha256 = file_sha256(path=Path(temporary_path))
+        if downloaded_sha256 != sha256:
+            message = (
+                'The archive downloaded from {url} has the SHA-256 hash '
+                '{downloaded_sha256}, but {sha256} was expected.'
+            ).format(
+                url=url,
+                downloaded_sha256=downloaded_sha256,
+                sha256=sha256,
+            )
+            raise ValueError(message)
+        os.replace(temporary_path, str(archive_path))
+    except BaseException:
+        Path(temporary_path).unlink()
+        raise
+
+    _write_atomically(path=sha256_path, text=sha256 + '\n')
+    return archive_path
@@ -2,8 +2,38 @@
 Custom exceptions.
 """
 
+from typing import Any, Dict
+
 
 class DCOSTimeoutError(Exception):
     """
     Raised if DC/OS does not become ready within a given time boundary.
     """
+
+
+class NodeErrors(Exception):
+    """
+    Raised if an operation fails on one or more nodes, when the operation is
+    run on every node before errors are reported.
+
+    Attributes:
+        errors: A mapping of each node on which the operation failed to the
+            exception raised for that node.
+        results: A mapping of each node on which the operation succeeded to
+            the result of the operation on that node.
+    """
+
+    def __init__(
+        self,
+        errors: Dict[Any, BaseException],
+        results: Dict[Any, Any],
+    ) -> None:
+        message = 'The operation failed on {count} node(s):'.format(
+            count=len(errors),
+        )
+        lines = [message]
+        for node, error in errors.items():
+            lines.append('{node}: {error}'.format(node=node, error=error))
+        super().__init__('\n'.join(lines))
+        self.errors = errors
+        self.results = results
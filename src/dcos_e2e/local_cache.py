@@ -0,0 +1,65 @@
+"""
+Helpers for files which are cached on the local machine, such as Docker
+binaries and details of DC/OS installers.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from ._archive_tools import CHUNK_SIZE
+
+# Hashes of local files, keyed by a fingerprint of each file, so that a file
+# sent to many nodes is only read once.
+_LOCAL_HASHES = {}  # type: Dict[Tuple[str, int, int, int], str]
+_LOCAL_HASHES_LOCK = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the directory which files are cached in by default.
+
+    This is in the user's cache directory, or in the temporary directory if
+    the user has no home directory.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        try:
+            cache_home = str(Path.home() / '.cache')
+        except (KeyError, RuntimeError):
+            cache_home = tempfile.gettempdir()
+    return Path(cache_home) / 'dcos-e2e'
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Return the SHA-256 hash of the contents of the file at ``path``.
+    """
+    digest = hashlib.sha256()
+    with path.open('rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_file_sha256(local_path: Path) -> str:
+    """
+    Return the SHA-256 hash of the file at ``local_path``.
+
+    The hash is remembered until the size, modification time or inode of the
+    file changes.
+    """
+    stat_result = local_path.stat()
+    fingerprint = (
+        str(local_path.resolve()),
+        stat_result.st_size,
+        stat_result.st_mtime_ns,
+        stat_result.st_ino,
+    )
+    with _LOCAL_HASHES_LOCK:
+        if fingerprint not in _LOCAL_HASHES:
+            _LOCAL_HASHES[fingerprint] = file_sha256(path=local_path)
+        return _LOCAL_HASHES[fingerprint]
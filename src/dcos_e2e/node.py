@@ -3,21 +3,129 @@ Tools for managing DC/OS cluster nodes.
 """
 
 import logging
+import re
 import subprocess
 import tarfile
+import textwrap
+import threading
 import uuid
 from enum import Enum
 from ipaddress import IPv4Address
 from pathlib import Path
-from tempfile import gettempdir
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from shlex import quote
+from tempfile import TemporaryDirectory
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import yaml
 
-from ._node_transports import DockerExecTransport, NodeTransport, SSHTransport
+from ._archive_tools import (
+    extract_archive_stream,
+    is_compressible,
+    iter_chunks,
+    streamed_archive,
+    streamed_tar,
+)
+from ._directory_sync import (
+    SyncPlan,
+    add_sync_members,
+    apply_sync_script,
+    local_manifest,
+    never,
+    parse_remote_state,
+    remote_state_script,
+)
+from ._node_cache import is_cacheable, restore_script, store_script
+from ._node_transports import (
+    DockerAPITransport,
+    DockerExecTransport,
+    NodeTransport,
+    SSHTransport,
+)
+from ._subprocess_tools import CapturedOutput  # noqa: F401
+from ._subprocess_tools import DEFAULT_MAX_MEMORY_SIZE, iter_output_lines
+from .local_cache import local_file_sha256
 
 LOGGER = logging.getLogger(__name__)
 
+# The name of the top level member of archives made by ``Node.send_file``.
+# This is renamed as the archive is extracted on the node.
+_SEND_FILE_ARCNAME = 'dcos-e2e-send-file'
+
+
+def _tar_rename_expression(name: str) -> str:
+    """
+    Return a GNU ``tar`` ``--transform`` expression which renames the top
+    level member of an archive made by ``Node.send_file`` to ``name``.
+    """
+    replacement = re.sub(r'([\\&|])', r'\\\1', name)
+    return 's|^{arcname}|{replacement}|'.format(
+        arcname=_SEND_FILE_ARCNAME,
+        replacement=replacement,
+    )
+
+
+def _send_file_script(
+    local_path: Path,
+    remote_path: Path,
+    user: str,
+    sudo: bool,
+    compressed: bool,
+) -> str:
+    """
+    Return a shell script which extracts an archive made by
+    ``Node.send_file`` from its standard input to ``remote_path``.
+    If ``compressed`` is ``True``, the archive is compressed with gzip.
+
+    The parent of ``remote_path`` is created if it does not exist, and it is
+    temporarily owned by ``user`` so that ``user`` can extract the archive
+    into it.
+    Its original owner is restored whether or not the extraction succeeds.
+
+    If ``remote_path`` is an existing directory, ``local_path`` is placed
+    inside it.
+    Otherwise, ``local_path`` is placed at ``remote_path``.
+
+    The archive is extracted by ``tar`` from standard input, rather than
+    copied to the node as a file.
+    This means that ``remote_path`` may be on a ``tmpfs`` mount.
+    """
+    sudo_prefix = 'sudo ' if sudo else ''
+    return textwrap.dedent(
+        """\
+        set -e
+        parent={parent}
+        {sudo}mkdir --parents "$parent"
+        owner="$({sudo}stat -c %U "$parent")"
+        {sudo}chown {user} "$parent"
+        if [ -d {remote_path} ]; then
+            set -- -C {remote_path} --transform {into_directory}
+        else
+            set -- -C "$parent" --transform {to_path}
+        fi
+        status=0
+        tar -x {gzip}-f - "$@" || status=$?
+        {sudo}chown "$owner" "$parent"
+        exit "$status"
+        """,
+    ).format(
+        parent=quote(str(remote_path.parent)),
+        remote_path=quote(str(remote_path)),
+        user=quote(user),
+        sudo=sudo_prefix,
+        gzip='--gzip ' if compressed else '',
+        into_directory=quote(_tar_rename_expression(name=local_path.name)),
+        to_path=quote(_tar_rename_expression(name=remote_path.name)),
+    )
+
 
 class Role(Enum):
     """
@@ -36,6 +144,7 @@ class Transport(Enum):
 
     SSH = 1
     DOCKER_EXEC = 2
+    DOCKER_API = 3
 
 
 class Output(Enum):
@@ -61,6 +170,107 @@ class Output(Enum):
     NO_CAPTURE = 3
 
 
+class Stream(Enum):
+    """
+    Output streams of commands.
+    """
+
+    STDOUT = 1
+    STDERR = 2
+
+
+class LineStream:
+    """
+    The output of a command run on a node, line by line, as it is written.
+
+    Iterate over this to get a ``(stream, line)`` pair for each line, where
+    ``stream`` is a :py:class:`~dcos_e2e.node.Stream` and ``line`` is the
+    decoded line without its line ending.
+    Iteration ends when the command has exited.
+
+    This can be used as a context manager, which stops the command if it is
+    still running on exit.
+
+    Attributes:
+        args: The command run on the node.
+        returncode: The exit code of the command, or ``None`` if the command
+            has not exited.
+    """
+
+    def __init__(self, process: subprocess.Popen, args: List[str]) -> None:
+        """
+        Args:
+            process: A process with pipes to the stdout and stderr of the
+                command.
+            args: The command run on the node.
+        """
+        self._process = process
+        self.args = args
+        self.returncode = None  # type: Optional[int]
+        self._lines = iter_output_lines(process=process)
+
+    def __iter__(self) -> Iterator[Tuple[Stream, str]]:
+        for pipe, line in self._lines:
+            if pipe is self._process.stdout:
+                yield Stream.STDOUT, line
+            else:
+                yield Stream.STDERR, line
+
+        self.returncode = self._process.wait()
+        self._close_pipes()
+
+    def __enter__(self) -> 'LineStream':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _close_pipes(self) -> None:
+        for pipe in (self._process.stdout, self._process.stderr):
+            pipe.close()
+
+    def close(self) -> None:
+        """
+        Stop the command if it is still running.
+        """
+        self._lines.close()
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(1)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+        self.returncode = self._process.returncode
+        self._close_pipes()
+
+
+def _use_compression(
+    compress: Optional[bool],
+    transport: Transport,
+    local_path: Optional[Path] = None,
+) -> bool:
+    """
+    Return whether to compress an archive sent to or from a node.
+
+    Args:
+        compress: Whether to compress, or ``None`` to choose automatically.
+        transport: The transport used to send the archive.
+        local_path: The path on the host which is archived, if the archive is
+            sent to the node.
+    """
+    if compress is not None:
+        return compress
+
+    # Docker transports send archives to a local daemon, so compression
+    # would only add work.
+    if transport != Transport.SSH:
+        return False
+
+    return local_path is None or is_compressible(local_path=local_path)
+
+
 class Node:
     """
     A record of a DC/OS cluster node.
@@ -132,53 +342,56 @@ class Node:
         transport_dict = {
             Transport.SSH: SSHTransport,
             Transport.DOCKER_EXEC: DockerExecTransport,
+            Transport.DOCKER_API: DockerAPITransport,
         }
 
         transport_cls = transport_dict[transport]
         # See https://github.com/python/mypy/issues/5135.
         return transport_cls()  # type: ignore
 
-    def _install_dcos_from_node_path(
+    def close_connections(self) -> None:
+        """
+        Close any connections to this node which are held open between
+        commands.
+
+        Connections are opened again as needed, so it is safe to call this
+        at any time.
+        """
+        for transport in Transport:
+            node_transport = self._get_node_transport(transport=transport)
+            node_transport.close_connections(
+                public_ip_address=self.public_ip_address,
+            )
+
+    def _generate_dcos_config(
         self,
         remote_dcos_installer: Path,
         dcos_config: Dict[str, Any],
         ip_detect_path: Path,
-        role: Role,
         files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
         user: Optional[str],
         output: Output,
         transport: Optional[Transport],
     ) -> None:
         """
-        Install DC/OS in a platform-independent way by using
-        the advanced installation method as described at
-        https://docs.mesosphere.com/1.11/installing/oss/custom/advanced/.
-
-        The documentation describes using a "bootstrap" node, so that only
-        one node downloads and extracts the installer.
-        This method is less efficient on a multi-node cluster,
-        as it does not use a bootstrap node.
-        Instead, the installer is extracted on this node, and then DC/OS is
-        installed.
+        Generate the DC/OS installation files in ``genconf/serve`` next to an
+        installer on this node, and then remove the installer.
 
         Args:
-            remote_dcos_installer: The path on the node to an installer to
-                be installed on the node.
-            dcos_config: The contents of the DC/OS ``config.yaml``.
+            remote_dcos_installer: The path on the node to an installer.
+            dcos_config: The contents of the DC/OS ``config.yaml``, including
+                the ``bootstrap_url`` which nodes install DC/OS from.
             ip_detect_path: The path to the ``ip-detect`` script to use for
                 installing DC/OS.
-            role: The desired DC/OS role for the installation.
+            files_to_copy_to_genconf_dir: Pairs of host paths to paths on
+                the installer node. These are files to copy from the host to
+                the installer node before generating the installation files.
             user: The username to communicate as. If ``None`` then the
                 ``default_user`` is used instead.
             output: What happens with stdout and stderr.
             transport: The transport to use for communicating with nodes. If
                 ``None``, the ``Node``'s ``default_transport`` is used.
-            files_to_copy_to_genconf_dir: Pairs of host paths to paths on
-                the installer node. These are files to copy from the host to
-                the installer node before installing DC/OS.
         """
-        tempdir = Path(gettempdir())
-
         remote_genconf_dir = 'genconf'
         remote_genconf_path = remote_dcos_installer.parent / remote_genconf_dir
 
@@ -190,27 +403,20 @@ class Node:
             sudo=True,
         )
 
-        serve_dir_path = remote_genconf_path / 'serve'
-        dcos_config = {
-            **dcos_config,
-            **{
-                'bootstrap_url':
-                'file://{serve_dir_path}'.format(
-                    serve_dir_path=serve_dir_path,
-                ),
-            },
-        }
         config_yaml = yaml.dump(data=dcos_config)
-        config_file_path = tempdir / 'config.yaml'
-        Path(config_file_path).write_text(data=config_yaml)
+        # DC/OS may be installed on many nodes at once, each with a different
+        # ``bootstrap_url``, so each node gets its own local config file.
+        with TemporaryDirectory() as tempdir:
+            config_file_path = Path(tempdir) / 'config.yaml'
+            config_file_path.write_text(data=config_yaml)
 
-        self.send_file(
-            local_path=config_file_path,
-            remote_path=remote_genconf_path / 'config.yaml',
-            transport=transport,
-            user=user,
-            sudo=True,
-        )
+            self.send_file(
+                local_path=config_file_path,
+                remote_path=remote_genconf_path / 'config.yaml',
+                transport=transport,
+                user=user,
+                sudo=True,
+            )
 
         for host_path, installer_path in files_to_copy_to_genconf_dir:
             relative_installer_path = installer_path.relative_to('/genconf')
@@ -251,6 +457,65 @@ class Node:
             sudo=True,
         )
 
+    def _install_dcos_from_node_path(
+        self,
+        remote_dcos_installer: Path,
+        dcos_config: Dict[str, Any],
+        ip_detect_path: Path,
+        role: Role,
+        files_to_copy_to_genconf_dir: Iterable[Tuple[Path, Path]],
+        user: Optional[str],
+        output: Output,
+        transport: Optional[Transport],
+    ) -> None:
+        """
+        Install DC/OS in a platform-independent way by using
+        the advanced installation method as described at
+        https://docs.mesosphere.com/1.11/installing/oss/custom/advanced/.
+
+        The documentation describes using a "bootstrap" node, so that only
+        one node downloads and extracts the installer.
+        This method is less efficient on a multi-node cluster,
+        as it does not use a bootstrap node.
+        Instead, the installer is extracted on this node, and then DC/OS is
+        installed.
+
+        Args:
+            remote_dcos_installer: The path on the node to an installer to
+                be installed on the node.
+            dcos_config: The contents of the DC/OS ``config.yaml``.
+            ip_detect_path: The path to the ``ip-detect`` script to use for
+                installing DC/OS.
+            role: The desired DC/OS role for the installation.
+            user: The username to communicate as. If ``None`` then the
+                ``default_user`` is used instead.
+            output: What happens with stdout and stderr.
+            transport: The transport to use for communicating with nodes. If
+                ``None``, the ``Node``'s ``default_transport`` is used.
+            files_to_copy_to_genconf_dir: Pairs of host paths to paths on
+                the installer node. These are files to copy from the host to
+                the installer node before installing DC/OS.
+        """
+        serve_dir_path = remote_dcos_installer.parent / 'genconf' / 'serve'
+        dcos_config = {
+            **dcos_config,
+            **{
+                'bootstrap_url':
+                'file://{serve_dir_path}'.format(
+                    serve_dir_path=serve_dir_path,
+                ),
+            },
+        }
+        self._generate_dcos_config(
+            remote_dcos_installer=remote_dcos_installer,
+            dcos_config=dcos_config,
+            ip_detect_path=ip_detect_path,
+            files_to_copy_to_genconf_dir=files_to_copy_to_genconf_dir,
+            user=user,
+            output=output,
+            transport=transport,
+        )
+
         setup_args = [
             'cd',
             str(remote_dcos_installer.parent),
@@ -280,6 +545,7 @@ class Node:
         user: Optional[str] = None,
         output: Output = Output.CAPTURE,
         transport: Optional[Transport] = None,
+        cache_installer: bool = False,
     ) -> None:
         """
         Install DC/OS in a platform-independent way by using
@@ -312,6 +578,11 @@ class Node:
             files_to_copy_to_genconf_dir: Pairs of host paths to paths on
                 the installer node. These are files to copy from the host to
                 the installer node before installing DC/OS.
+            cache_installer: Whether to keep a copy of the installer in a
+                cache on this node, so that it is not sent again to install
+                DC/OS on this node later. Installers are around 1 GB, and
+                the copy uses that much more disk space on the node until it
+                is evicted. See the ``cache`` option of :py:meth:`send_file`.
         """
         workspace_dir = Path('/dcos-install-dir')
         node_installer_parent = workspace_dir / uuid.uuid4().hex
@@ -330,6 +601,7 @@ class Node:
             transport=transport,
             user=user,
             sudo=True,
+            cache=cache_installer,
         )
         self._install_dcos_from_node_path(
             remote_dcos_installer=node_dcos_installer,
@@ -430,6 +702,8 @@ class Node:
         tty: bool = False,
         transport: Optional[Transport] = None,
         sudo: bool = False,
+        lazy_output: bool = False,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
     ) -> subprocess.CompletedProcess:
         """
         Run a command on this node the given user.
@@ -455,6 +729,13 @@ class Node:
             transport: The transport to use for communicating with nodes. If
                 ``None``, the ``Node``'s ``default_transport`` is used.
             sudo: Whether to use "sudo" to run commands.
+            lazy_output: If ``True``, the stdout and stderr of the returned
+                process are :py:class:`~dcos_e2e.node.CapturedOutput` objects
+                rather than ``bytes``. This avoids holding large output in
+                memory.
+            max_memory_size: The number of bytes of each of stdout and stderr
+                to hold in memory before holding the output in a temporary
+                file.
 
         Returns:
             The representation of the finished process.
@@ -506,6 +787,8 @@ class Node:
             ssh_key_path=self._ssh_key_path,
             public_ip_address=self.public_ip_address,
             capture_output=capture_output,
+            lazy_output=lazy_output,
+            max_memory_size=max_memory_size,
         )
 
     def popen(
@@ -555,6 +838,54 @@ class Node:
             public_ip_address=self.public_ip_address,
         )
 
+    def stream(
+        self,
+        args: List[str],
+        user: Optional[str] = None,
+        env: Optional[Dict[str, Any]] = None,
+        shell: bool = False,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+    ) -> LineStream:
+        """
+        Run a command on this node and get its output line by line, as it is
+        written.
+
+        Args:
+            args: The command to run on the node.
+            user: The username to communicate as. If ``None`` then the
+                ``default_user`` is used instead.
+            env: Environment variables to be set on the node before running
+                the command. A mapping of environment variable names to
+                values.
+            shell: If False (the default), each argument is passed as a
+                literal value to the command.  If True, the command line is
+                interpreted as a shell command, with a special meaning applied
+                to some characters (e.g. $, &&, >). This means the caller must
+                quote arguments if they may contain these special characters,
+                including whitespace.
+            transport: The transport to use for communicating with nodes. If
+                ``None``, the ``Node``'s ``default_transport`` is used.
+            sudo: Whether to use "sudo" to run commands.
+
+        Returns:
+            The lines of output of the command. The exit code of the command
+            is available when all lines have been read.
+        """
+        if shell:
+            args = ['/bin/sh', '-c', ' '.join(args)]
+
+        if sudo:
+            args = ['sudo'] + args
+
+        process = self.popen(
+            args=args,
+            user=user,
+            env=env,
+            transport=transport,
+        )
+        return LineStream(process=process, args=args)
+
     def send_file(
         self,
         local_path: Path,
@@ -562,6 +893,8 @@ class Node:
         user: Optional[str] = None,
         transport: Optional[Transport] = None,
         sudo: bool = False,
+        compress: Optional[bool] = None,
+        cache: bool = False,
     ) -> None:
         """
         Copy a file to this node.
@@ -575,115 +908,277 @@ class Node:
                 ``None``, the ``Node``'s ``default_transport`` is used.
             sudo: Whether to use sudo to create the directory which holds the
                 remote file.
+            compress: Whether to compress the file with gzip while it is
+                sent. If ``None``, the file is compressed when using the SSH
+                transport, unless it is already compressed.
+            cache: Whether to keep a copy of the file in a cache on the node,
+                keyed by the SHA-256 hash of its contents. If the node already
+                has a copy with that hash, the file is copied from the cache
+                rather than sent. The cache holds at most 4 GiB, and the
+                least recently used files are removed to make space. It is in
+                ``/var/cache/dcos-e2e`` when ``sudo`` is ``True``, and in
+                ``~/.cache/dcos-e2e`` otherwise.
         """
         if user is None:
             user = self.default_user
 
         transport = transport or self.default_transport
         node_transport = self._get_node_transport(transport=transport)
-        mkdir_args = ['mkdir', '--parents', str(remote_path.parent)]
-        self.run(
-            args=mkdir_args,
-            user=user,
-            transport=transport,
-            sudo=sudo,
-        )
 
-        stat_cmd = ['stat', '-c', '"%U"', str(remote_path.parent)]
-        stat_result = self.run(
-            args=stat_cmd,
-            shell=True,
-            user=user,
+        def _run_cache_script(script: str) -> bytes:
+            result = node_transport.run(
+                args=['/bin/sh', '-c', script],
+                user=user,
+                log_output_live=False,
+                env={},
+                tty=False,
+                ssh_key_path=self._ssh_key_path,
+                public_ip_address=self.public_ip_address,
+                capture_output=True,
+            )
+            return result.stdout
+
+        cache = cache and is_cacheable(local_path=local_path)
+        if cache:
+            sha256 = local_file_sha256(local_path=local_path)
+            restore_output = _run_cache_script(
+                restore_script(
+                    local_path=local_path,
+                    remote_path=remote_path,
+                    sha256=sha256,
+                    user=user,
+                    sudo=sudo,
+                ),
+            )
+            if restore_output.strip() == b'hit':
+                return
+
+        compressed = _use_compression(
+            compress=compress,
             transport=transport,
-            sudo=sudo,
+            local_path=local_path,
         )
 
-        original_parent = stat_result.stdout.decode().strip()
-
-        chown_args = ['chown', user, str(remote_path.parent)]
-        self.run(
-            args=chown_args,
+        script = _send_file_script(
+            local_path=local_path,
+            remote_path=remote_path,
             user=user,
-            transport=transport,
             sudo=sudo,
+            compressed=compressed,
         )
 
-        tempdir = Path(gettempdir())
-        tar_name = '{unique}.tar'.format(unique=uuid.uuid4().hex)
-        local_tar_path = tempdir / tar_name
+        with streamed_archive(
+            local_path=local_path,
+            arcname=_SEND_FILE_ARCNAME,
+            compress=compressed,
+        ) as archive:
+            node_transport.run(
+                args=['/bin/sh', '-c', script],
+                user=user,
+                log_output_live=False,
+                env={},
+                tty=False,
+                ssh_key_path=self._ssh_key_path,
+                public_ip_address=self.public_ip_address,
+                capture_output=True,
+                stdin=archive,
+            )
 
-        is_dir = self.run(
-            args=[
-                'python',
-                '-c',
-                '"import os; print(os.path.isdir(\'{remote_path}\'))"'.format(
+        if cache:
+            _run_cache_script(
+                store_script(
+                    local_path=local_path,
                     remote_path=remote_path,
+                    sha256=sha256,
+                    sudo=sudo,
                 ),
-            ],
-            shell=True,
-        ).stdout.decode().strip()
-
-        with tarfile.open(str(local_tar_path), 'w', dereference=True) as tar:
-            arcname = Path(remote_path.name)
-            if is_dir == 'True':
-                arcname = arcname / local_path.name
-            tar.add(str(local_path), arcname=str(arcname), recursive=True)
-
-        # `remote_path` may be a tmpfs mount.
-        # At the time of writing, for example, `/tmp` is a tmpfs mount
-        # on the Docker backend.
-        # Copying files to tmpfs mounts fails silently.
-        # See https://github.com/moby/moby/issues/22020.
-        home_path = self.run(
-            args=['echo', '$HOME'],
-            user=user,
-            transport=transport,
-            sudo=False,
-            shell=True,
-        ).stdout.strip().decode()
-        # Therefore, we create a temporary file within our home directory.
-        # We then remove the temporary file at the end of this function.
+            )
+
+    def sync_directory(
+        self,
+        local_path: Path,
+        remote_path: Path,
+        user: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+        ignore: Callable[[Path], bool] = never,
+        delete_untracked: Optional[Callable[[Path], bool]] = None,
+    ) -> SyncPlan:
+        """
+        Make a directory on this node match a local directory, sending only
+        files which have changed since the last sync.
+
+        A manifest of the files sent is kept in the remote directory.
+        Files on the node which were sent by an earlier sync and which are no
+        longer in the local directory are deleted.
+
+        Args:
+            local_path: The directory on the host to sync.
+            remote_path: The directory on the node to sync to. This is created
+                if it does not exist.
+            user: The name of the remote user to sync as. If ``None``, the
+                ``default_user`` is used instead.
+            transport: The transport to use for communicating with nodes. If
+                ``None``, the ``Node``'s ``default_transport`` is used.
+            sudo: Whether to use "sudo" to change files on the node.
+            ignore: A function which is given the path, relative to the synced
+                directories, of each file on the host and on the node.
+                If this returns ``True``, the file is not sent, changed or
+                deleted.
+            delete_untracked: A function which is given the path, relative to
+                ``remote_path``, of each file on the node which is not in the
+                local directory and was not sent by an earlier sync.
+                If this returns ``True``, the file is deleted.
+                If this is ``None``, such files are kept.
 
-        remote_tar_path = Path(home_path) / tar_name
+        Returns:
+            The files which were sent and deleted.
+        """
+        if user is None:
+            user = self.default_user
 
-        node_transport.send_file(
-            local_path=local_tar_path,
-            remote_path=remote_tar_path,
+        transport = transport or self.default_transport
+        node_transport = self._get_node_transport(transport=transport)
+
+        local_files = local_manifest(local_path=local_path, ignore=ignore)
+        state_result = node_transport.run(
+            args=[
+                '/bin/sh',
+                '-c',
+                remote_state_script(remote_path=remote_path, sudo=sudo),
+            ],
             user=user,
+            log_output_live=False,
+            env={},
+            tty=False,
             ssh_key_path=self._ssh_key_path,
             public_ip_address=self.public_ip_address,
+            capture_output=True,
+        )
+        remote_manifest, remote_files = parse_remote_state(
+            output=state_result.stdout,
+        )
+        plan = SyncPlan(
+            local_files=local_files,
+            remote_manifest=remote_manifest,
+            remote_files=remote_files,
+            delete_untracked=delete_untracked,
+            ignore=ignore,
         )
+        if not plan.changed:
+            return plan
+
+        with streamed_tar(
+            add_members=lambda tar: add_sync_members(
+                tar=tar,
+                local_path=local_path,
+                plan=plan,
+            ),
+        ) as archive:
+            node_transport.run(
+                args=[
+                    '/bin/sh',
+                    '-c',
+                    apply_sync_script(remote_path=remote_path, sudo=sudo),
+                ],
+                user=user,
+                log_output_live=False,
+                env={},
+                tty=False,
+                ssh_key_path=self._ssh_key_path,
+                public_ip_address=self.public_ip_address,
+                capture_output=True,
+                stdin=archive,
+            )
 
-        Path(local_tar_path).unlink()
+        return plan
 
-        tar_args = [
+    def download(
+        self,
+        remote_path: Path,
+        local_path: Path,
+        transport: Optional[Transport] = None,
+        sudo: bool = False,
+        compress: Optional[bool] = None,
+    ) -> None:
+        """
+        Download a file or a directory from this node.
+
+        The file or directory is sent as a ``tar`` archive which is extracted
+        as it is received.
+
+        Args:
+            remote_path: The path on the node of the file or directory to
+                download.
+            local_path: The path on the host to download the file or
+                directory to. The parent of this path must exist.
+            transport: The transport to use for communicating with nodes. If
+                ``None``, the ``Node``'s ``default_transport`` is used.
+            sudo: Whether to use "sudo" to read the file or directory.
+            compress: Whether to compress the archive with gzip while it is
+                sent. If ``None``, the archive is compressed when using the
+                SSH transport.
+
+        Raises:
+            subprocess.CalledProcessError: The file or directory could not be
+                read on the node, for example because it does not exist.
+        """
+        transport = transport or self.default_transport
+        compressed = _use_compression(compress=compress, transport=transport)
+        args = [
             'tar',
-            '-C',
+            '--create',
+            '--file',
+            '-',
+            '--directory',
             str(remote_path.parent),
-            '-xvf',
-            str(remote_tar_path),
+            remote_path.name,
         ]
-        self.run(
-            args=tar_args,
-            user=user,
-            transport=transport,
-            sudo=False,
-        )
+        if compressed:
+            args.insert(1, '--gzip')
+        if sudo:
+            args = ['sudo'] + args
 
-        chown_args = ['chown', original_parent, str(remote_path.parent)]
-        self.run(
-            args=chown_args,
-            user=user,
-            transport=transport,
-            sudo=sudo,
+        process = self.popen(args=args, transport=transport)
+        stderr_chunks = []  # type: List[bytes]
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.extend(iter_chunks(process.stderr)),
+            daemon=True,
         )
+        stderr_reader.start()
 
-        self.run(
-            args=['rm', str(remote_tar_path)],
-            user=user,
-            transport=transport,
-            sudo=sudo,
-        )
+        extraction_error = None  # type: Optional[tarfile.TarError]
+        try:
+            extract_archive_stream(
+                chunks=iter_chunks(process.stdout),
+                local_path=local_path,
+            )
+        except tarfile.TarError as exc:
+            # The archive is empty or truncated if ``tar`` failed on the node.
+            # In that case the exit code and stderr of ``tar`` are more
+            # useful.
+            extraction_error = exc
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            stderr_reader.join()
+            process.stderr.close()
+
+        stderr = b''.join(stderr_chunks)
+        # GNU ``tar`` exits with 1 when a file changed while it was read, for
+        # example a log file which is being written to.
+        if returncode == 1:
+            LOGGER.warning(stderr.decode(errors='backslashreplace'))
+        elif returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode=returncode,
+                cmd=args,
+                output=b'',
+                stderr=stderr,
+            )
+
+        if extraction_error is not None:
+            raise extraction_error
 
     def download_file(
         self,
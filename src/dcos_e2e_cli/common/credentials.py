@@ -20,17 +20,19 @@ def add_authorized_key(cluster: Cluster, public_key_path: Path) -> None:
         *cluster.public_agents,
     }
 
-    for node in nodes:
-        node.run(
-            args=['echo', '', '>>', '/root/.ssh/authorized_keys'],
-            shell=True,
-        )
-        node.run(
-            args=[
-                'echo',
-                public_key_path.read_text(),
-                '>>',
-                '/root/.ssh/authorized_keys',
-            ],
-            shell=True,
-        )
+    authorized_keys = '/root/.ssh/authorized_keys'
+    cluster.run_on_nodes(
+        nodes=nodes,
+        args=[
+            'echo',
+            '',
+            '>>',
+            authorized_keys,
+            '&&',
+            'echo',
+            public_key_path.read_text(),
+            '>>',
+            authorized_keys,
+        ],
+        shell=True,
+    )
@@ -0,0 +1,181 @@
+"""
+Helpers for getting details of DC/OS installers, with a persistent cache.
+
+Getting details from an installer means extracting it and loading its Docker
+image, which can take minutes.
+Details are therefore cached in a file, keyed by the SHA-256 hash of each
+installer.
+So that installers are not hashed each time, the hash of each installer path
+is also cached, and it is trusted while the size, modification time and inode
+of the file at that path are unchanged.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dcos_e2e.local_cache import default_cache_dir, file_sha256
+from dcos_e2e_cli._vendor.dcos_installer_tools import (
+    DCOSVariant,
+    get_dcos_installer_details,
+)
+
+# The version of the format of the cache file.
+# Cache files with a different version are ignored.
+_CACHE_FORMAT_VERSION = 1
+
+
+class InstallerDetails:
+    """
+    Details of a DC/OS installer.
+
+    Attributes:
+        variant: The DC/OS variant which can be installed by the installer.
+        version: The version of DC/OS which can be installed by the
+            installer.
+    """
+
+    def __init__(self, variant: DCOSVariant, version: str) -> None:
+        """
+        Args:
+            variant: The DC/OS variant which can be installed by the
+                installer.
+            version: The version of DC/OS which can be installed by the
+                installer.
+        """
+        self.variant = variant
+        self.version = version
+
+
+def _fingerprint(installer: Path) -> List[int]:
+    """
+    Return values which change when ``installer`` is replaced or modified.
+    """
+    stat_result = installer.stat()
+    return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino]
+
+
+def _empty_cache() -> Dict[str, Any]:
+    """
+    Return the contents of an empty cache file.
+    """
+    return {
+        'version': _CACHE_FORMAT_VERSION,
+        'files': {},
+        'details': {},
+    }
+
+
+def _read_cache(cache_path: Path) -> Dict[str, Any]:
+    """
+    Return the contents of the cache file, or an empty cache if the file does
+    not exist or cannot be read.
+    """
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return _empty_cache()
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get('version') != _CACHE_FORMAT_VERSION
+    ):
+        return _empty_cache()
+    return cache
+
+
+def _write_cache(cache_path: Path, cache: Dict[str, Any]) -> None:
+    """
+    Replace the cache file with ``cache``.
+
+    The file is replaced atomically, so that concurrent readers never see a
+    partly written file.
+    Errors are ignored, as the cache is only an optimization.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=str(cache_path.parent),
+        )
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(file_descriptor, 'w') as file:
+            json.dump(cache, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, str(cache_path))
+    except OSError:
+        pass
+    finally:
+        # The temporary file is only left if replacing the cache file failed.
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def get_installer_details(
+    installer: Path,
+    workspace_dir: Path,
+    cache_path: Optional[Path] = None,
+) -> InstallerDetails:
+    """
+    Get details of a DC/OS installer, using cached details if the installer,
+    or an installer with the same contents, has been seen before.
+
+    Args:
+        installer: The path to a DC/OS installer. This cannot include a
+            space.
+        workspace_dir: The directory in which large temporary files will be
+            created if the installer is extracted.
+        cache_path: The path to the cache file. If ``None``, a file in the
+            directory given by
+            :py:func:`dcos_e2e.local_cache.default_cache_dir` is used.
+
+    Raises:
+        ValueError: A space is in the installer path.
+        CalledProcessError: There was an error extracting the given installer.
+    """
+    cache_path = cache_path or (
+        default_cache_dir() / 'installer-details.json'
+    )
+    cache = _read_cache(cache_path=cache_path)
+    path = str(installer.resolve())
+    fingerprint = _fingerprint(installer=installer)
+    # Each file is recorded as its fingerprint followed by its hash.
+    recorded = cache['files'].get(path)
+    if recorded is not None and recorded[:-1] == fingerprint:
+        sha256 = recorded[-1]
+    else:
+        sha256 = file_sha256(path=installer)
+
+    cached_details = cache['details'].get(sha256)
+    if cached_details is not None:
+        details = InstallerDetails(
+            variant=DCOSVariant[cached_details['variant']],
+            version=cached_details['version'],
+        )
+    else:
+        extracted_details = get_dcos_installer_details(
+            installer=installer,
+            workspace_dir=workspace_dir,
+        )
+        details = InstallerDetails(
+            variant=extracted_details.variant,
+            version=extracted_details.version,
+        )
+
+    if recorded != fingerprint + [sha256] or cached_details is None:
+        # Read the cache again, so that entries written by other processes
+        # since it was first read are kept.
+        cache = _read_cache(cache_path=cache_path)
+        cache['files'][path] = fingerprint + [sha256]
+        cache['details'][sha256] = {
+            'variant': details.variant.name,
+            'version': details.version,
+        }
+        _write_cache(cache_path=cache_path, cache=cache)
+
+    return details
@@ -301,7 +301,6 @@ def _set_logging(
     # Disable debug output from `docker` and `urllib3` libraries
     logging.getLogger('urllib3.connectionpool').setLevel(logging.WARN)
     logging.getLogger('docker').setLevel(logging.WARN)
-    logging.getLogger('sarge').setLevel(logging.WARN)
 
     # These warnings are overwhelming and not useful.
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
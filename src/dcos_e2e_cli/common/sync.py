@@ -12,6 +12,7 @@ from typing import Callable, Optional
 import click
 
 from dcos_e2e.cluster import Cluster
+from dcos_e2e.concurrency import run_concurrently
 from dcos_e2e.node import Node
 from dcos_e2e_cli._vendor.dcos_installer_tools import DCOSVariant
 from dcos_e2e_cli.common.variants import get_cluster_variant
@@ -54,18 +55,31 @@ def _tar_with_filter(
     return tarstream
 
 
+def _is_cache_file(path: Path) -> bool:
+    """
+    Return whether ``path`` is a Python or pytest cache file.
+    """
+    return '__pycache__' in path.parts or path.suffix == '.pyc'
+
+
 def _cache_filter(tar_info: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
     """
     Filter for ``tarfile.TarFile.add`` which removes Python and pytest cache
     files.
     """
-    if '__pycache__' in tar_info.name:
-        return None
-    if tar_info.name.endswith('.pyc'):
+    if _is_cache_file(path=Path(tar_info.name)):
         return None
     return tar_info
 
 
+def _is_top_level_python_file(path: Path) -> bool:
+    """
+    Return whether ``path``, relative to a synced directory, is a Python file
+    at the top level of that directory.
+    """
+    return len(path.parts) == 1 and path.suffix == '.py'
+
+
 def _send_tarstream_to_node_and_extract(
     tarstream: io.BytesIO,
     node: Node,
@@ -91,6 +105,23 @@ def _send_tarstream_to_node_and_extract(
     node.run(args=['rm', str(tar_path)], sudo=sudo)
 
 
+def _on_each_master(
+    cluster: Cluster,
+    function: Callable[[Node], None],
+) -> None:
+    """
+    Call ``function`` with each master node in ``cluster`` at once.
+
+    The first error raised by ``function`` is raised once all calls which
+    have started finish.
+    """
+    run_concurrently(
+        function=function,
+        items=cluster.masters,
+        max_workers=len(cluster.masters),
+    )
+
+
 def _sync_bootstrap_to_masters(
     cluster: Cluster,
     dcos_checkout_dir: Path,
@@ -112,19 +143,17 @@ def _sync_bootstrap_to_masters(
     node_bootstrap_dir = (
         node_python_dir / 'site-packages' / 'dcos_internal_utils'
     )
-    bootstrap_tarstream = _tar_with_filter(
-        path=local_bootstrap_dir,
-        tar_filter=_cache_filter,
-    )
 
-    for master in cluster.masters:
-        _send_tarstream_to_node_and_extract(
-            tarstream=bootstrap_tarstream,
-            node=master,
+    def _sync_bootstrap(master: Node) -> None:
+        master.sync_directory(
+            local_path=local_bootstrap_dir,
             remote_path=node_bootstrap_dir,
             sudo=sudo,
+            ignore=_is_cache_file,
         )
 
+    _on_each_master(cluster=cluster, function=_sync_bootstrap)
+
 
 def _dcos_checkout_dir_variant(dcos_checkout_dir: Path) -> DCOSVariant:
     """
@@ -215,13 +244,6 @@ def sync_code_to_masters(
         dcos_checkout_dir=dcos_checkout_dir,
     )
 
-    node_test_dir = Path('/opt/mesosphere/active/dcos-integration-test')
-
-    test_tarstream = _tar_with_filter(
-        path=local_test_dir,
-        tar_filter=_cache_filter,
-    )
-
     dcos_variant = get_cluster_variant(cluster=cluster)
     if dcos_variant is None:
         message = (
@@ -242,7 +264,12 @@ def sync_code_to_masters(
     if syncing_oss_to_ee:
         # This matches part of
         # https://github.com/mesosphere/dcos-enterprise/blob/master/packages/dcos-integration-test/ee.build
-        for master in cluster.masters:
+        test_tarstream = _tar_with_filter(
+            path=local_test_dir,
+            tar_filter=_cache_filter,
+        )
+
+        def _sync_oss_tests_to_ee(master: Node) -> None:
             master.run(args=['rm', '-rf', str(node_test_dir / 'util')])
 
             # This makes an assumption that all tests are at the top level.
@@ -288,6 +315,8 @@ def sync_code_to_masters(
                 ],
                 sudo=sudo,
             )
+
+        _on_each_master(cluster=cluster, function=_sync_oss_tests_to_ee)
     else:
         _sync_bootstrap_to_masters(
             cluster=cluster,
@@ -295,17 +324,17 @@ def sync_code_to_masters(
             sudo=sudo,
         )
 
-        for master in cluster.masters:
+        def _sync_tests(master: Node) -> None:
+            # Only files which changed since the last sync are sent.
+            #
+            # Tests which are not in the checkout are deleted.
             # This makes an assumption that all tests are at the top level.
-            master.run(
-                args=['rm', '-rf', str(node_test_dir / '*.py')],
-                # We use a wildcard character, `*`, so we need shell expansion.
-                shell=True,
-                sudo=sudo,
-            )
-            _send_tarstream_to_node_and_extract(
-                tarstream=test_tarstream,
-                node=master,
+            master.sync_directory(
+                local_path=local_test_dir,
                 remote_path=node_test_dir,
                 sudo=sudo,
+                ignore=_is_cache_file,
+                delete_untracked=_is_top_level_python_file,
             )
+
+        _on_each_master(cluster=cluster, function=_sync_tests)
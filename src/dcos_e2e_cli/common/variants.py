@@ -14,12 +14,11 @@ import click
 
 from dcos_e2e.cluster import Cluster
 from dcos_e2e.node import Output
-from dcos_e2e_cli._vendor.dcos_installer_tools import (
-    DCOSVariant,
-    get_dcos_installer_details,
-)
+from dcos_e2e_cli._vendor.dcos_installer_tools import DCOSVariant
 from dcos_e2e_cli._vendor.halo import Halo
 
+from .installer_details import get_installer_details
+
 
 def get_install_variant(
     given_variant: str,
@@ -34,6 +33,8 @@ def get_install_variant(
         given_variant: The variant string given by the user to the
             ``variant_option``. One of "auto", "enterprise" and "oss". If
             "auto" is given, use the DC/OS installer to find the variant.
+            The variant of each installer is cached, so that an installer is
+            only extracted the first time its variant is needed.
         installer_path: The path to a DC/OS installer, if available.
         workspace_dir: A directory to work in, given that this function uses
             large files.
@@ -50,7 +51,7 @@ def get_install_variant(
         spinner = Halo(enabled=sys.stdout.isatty())  # type: ignore
         spinner.start(text='Determining DC/OS variant')
         try:
-            details = get_dcos_installer_details(
+            details = get_installer_details(
                 installer=installer_path,
                 workspace_dir=workspace_dir,
             )
@@ -203,6 +203,7 @@ class ClusterInstances(ClusterRepresentation):
             masters=set(map(self.to_node, self.masters)),
             agents=set(map(self.to_node, self.agents)),
             public_agents=set(map(self.to_node, self.public_agents)),
+            wait_for_ssh=False,
         )
 
     @property
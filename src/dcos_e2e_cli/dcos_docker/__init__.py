@@ -17,6 +17,7 @@ from .commands.install_dcos import install_dcos
 from .commands.list_clusters import list_clusters
 from .commands.list_loopback_sidecars import list_loopback_sidecars
 from .commands.mac_network import destroy_mac_network, setup_mac_network
+from .commands.prefetch_docker_binaries import prefetch_docker_binaries
 from .commands.provision import provision
 from .commands.run_command import run
 from .commands.send_file import send_file
@@ -45,6 +46,7 @@ dcos_docker.add_command(inspect_cluster)
 dcos_docker.add_command(install_dcos)
 dcos_docker.add_command(list_clusters)
 dcos_docker.add_command(list_loopback_sidecars)
+dcos_docker.add_command(prefetch_docker_binaries)
 dcos_docker.add_command(provision)
 dcos_docker.add_command(run)
 dcos_docker.add_command(setup_mac_network)
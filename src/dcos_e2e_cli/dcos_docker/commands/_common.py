@@ -188,6 +188,7 @@ class ClusterContainers(ClusterRepresentation):
             masters=set(map(self.to_node, self.masters)),
             agents=set(map(self.to_node, self.agents)),
             public_agents=set(map(self.to_node, self.public_agents)),
+            wait_for_ssh=False,
         )
 
     @property
@@ -0,0 +1,25 @@
+"""
+Tools for downloading the Docker binaries which are installed on nodes.
+"""
+
+import click
+
+from dcos_e2e.docker_binaries import download_docker_binaries
+from dcos_e2e.docker_versions import DockerVersion
+from dcos_e2e_cli.common.options import verbosity_option
+
+
+@click.command('prefetch-docker-binaries')
+@verbosity_option
+def prefetch_docker_binaries() -> None:
+    """
+    Download Docker binaries for node images.
+
+    Node images are built with Docker binaries from a local store.
+    Binaries are downloaded to the store when they are first needed, so
+    running this command first allows creating clusters without network
+    access to Docker's download servers.
+    """
+    for docker_version in DockerVersion:
+        archive_path = download_docker_binaries(docker_version=docker_version)
+        click.echo(str(archive_path))
@@ -0,0 +1,126 @@
+"""
+Tests for the cache of details of DC/OS installers.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from dcos_e2e_cli._vendor.dcos_installer_tools import DCOSVariant
+from dcos_e2e_cli.common import installer_details
+from dcos_e2e_cli.common.installer_details import get_installer_details
+
+
+class _Details:
+    """
+    Details of an installer, as returned by the vendored installer tools.
+    """
+
+    def __init__(self, variant: DCOSVariant, version: str) -> None:
+        self.variant = variant
+        self.version = version
+
+
+@pytest.fixture()
+def extracted(monkeypatch: MonkeyPatch) -> List[Path]:
+    """
+    Record the installers which details are extracted from, rather than
+    extracting them.
+
+    The version given by an installer is its contents.
+    """
+    installers = []  # type: List[Path]
+
+    def _get_dcos_installer_details(installer: Path, **kwargs: Any) -> Any:
+        installers.append(installer)
+        return _Details(
+            variant=DCOSVariant.OSS,
+            version=installer.read_text(),
+        )
+
+    monkeypatch.setattr(
+        installer_details,
+        'get_dcos_installer_details',
+        _get_dcos_installer_details,
+    )
+    return installers
+
+
+class TestGetInstallerDetails:
+    """
+    Tests for ``get_installer_details``.
+    """
+
+    def test_cache_hit(self, tmp_path: Path, extracted: List[Path]) -> None:
+        """
+        Details of an installer are extracted once, and then read from the
+        cache.
+        """
+        installer = tmp_path / 'dcos_generate_config.sh'
+        installer.write_text('1.12.0')
+        cache_path = tmp_path / 'cache.json'
+        for _ in range(2):
+            details = get_installer_details(
+                installer=installer,
+                workspace_dir=tmp_path,
+                cache_path=cache_path,
+            )
+            assert details.variant == DCOSVariant.OSS
+            assert details.version == '1.12.0'
+
+        assert extracted == [installer]
+        # Only the cache file is left in its directory.
+        assert {path.name for path in tmp_path.iterdir()} == {
+            installer.name,
+            cache_path.name,
+        }
+
+    def test_installer_changed(
+        self,
+        tmp_path: Path,
+        extracted: List[Path],
+    ) -> None:
+        """
+        Details are extracted again when the installer at a path changes.
+        """
+        installer = tmp_path / 'dcos_generate_config.sh'
+        installer.write_text('1.12.0')
+        cache_path = tmp_path / 'cache.json'
+        get_installer_details(
+            installer=installer,
+            workspace_dir=tmp_path,
+            cache_path=cache_path,
+        )
+        installer.write_text('1.13.0-dev')
+        details = get_installer_details(
+            installer=installer,
+            workspace_dir=tmp_path,
+            cache_path=cache_path,
+        )
+        assert details.version == '1.13.0-dev'
+        assert extracted == [installer, installer]
+
+    def test_corrupt_cache(
+        self,
+        tmp_path: Path,
+        extracted: List[Path],
+    ) -> None:
+        """
+        A cache file which cannot be read is replaced.
+        """
+        installer = tmp_path / 'dcos_generate_config.sh'
+        installer.write_text('1.12.0')
+        cache_path = tmp_path / 'cache.json'
+        cache_path.write_text('{"version": 1, "files"')
+        details = get_installer_details(
+            installer=installer,
+            workspace_dir=tmp_path,
+            cache_path=cache_path,
+        )
+        assert details.version == '1.12.0'
+        assert extracted == [installer]
+        cache = json.loads(cache_path.read_text())
+        assert len(cache['details']) == 1
@@ -5,19 +5,23 @@ This module contains tests for Docker backend features which are not covered by
 sibling modules.
 """
 
+import os
+import socket
 import subprocess
 import uuid
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Dict, Iterator, List
 
 import docker
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 from docker.models.networks import Network
 from docker.types import Mount
 from requests_mock import Mocker, NoMockAddress
 from retry import retry
 
 from dcos_e2e.backends import Docker
+from dcos_e2e.backends._docker import DockerCluster
 from dcos_e2e.cluster import Cluster
 from dcos_e2e.docker_storage_drivers import DockerStorageDriver
 from dcos_e2e.docker_versions import DockerVersion
@@ -558,3 +562,173 @@ class TestOneMasterHostPortMap:
                 }],
             }
             assert master_port_settings == expected_master_port_settings
+
+
+class TestGenconfCache:
+    """
+    Tests for caching the files generated by DC/OS installers.
+    """
+
+    def test_cache_reused(
+        self,
+        oss_installer: Path,
+        tmp_path: Path,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        """
+        Files generated for one cluster are cached, and a cluster with the
+        same installer and configuration is installed from the cached files
+        rather than generating them again.
+        """
+        genconf_cache_dir = tmp_path / 'genconf-cache'
+        workspace_dir = tmp_path / 'workspace'
+        cluster_backend = Docker(
+            genconf_cache_dir=genconf_cache_dir,
+            workspace_dir=workspace_dir,
+        )
+        generated_configs = []  # type: List[Dict[str, Any]]
+        generate = DockerCluster._generate_genconf_serve
+
+        def _generate_genconf_serve(
+            self: DockerCluster,
+            **kwargs: Any,
+        ) -> None:
+            generated_configs.append(kwargs['dcos_config'])
+            generate(self, **kwargs)
+
+        monkeypatch.setattr(
+            DockerCluster,
+            '_generate_genconf_serve',
+            _generate_genconf_serve,
+        )
+
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=0,
+            public_agents=0,
+        ) as cluster:
+            dcos_config = cluster.base_config
+            cluster.install_dcos_from_path(
+                dcos_installer=oss_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=cluster_backend.ip_detect_path,
+                output=Output.LOG_AND_CAPTURE,
+            )
+            cluster.wait_for_dcos_oss()
+
+        # The configuration includes the IP address of the master, which is
+        # part of the cache key and may differ between clusters.
+        # The first cluster's configuration is used so that the cached files
+        # match, and so DC/OS is not expected to start on this cluster.
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=0,
+            public_agents=0,
+        ) as cluster:
+            cluster.install_dcos_from_path(
+                dcos_installer=oss_installer,
+                dcos_config=dcos_config,
+                ip_detect_path=cluster_backend.ip_detect_path,
+                output=Output.LOG_AND_CAPTURE,
+            )
+            (served_install_script, ) = workspace_dir.glob(
+                '*/*/genconf/serve/dcos_install.sh',
+            )
+            cached_install_scripts = [
+                path for path in genconf_cache_dir.glob('*/dcos_install.sh')
+                if os.path.samefile(str(path), str(served_install_script))
+            ]
+            assert cached_install_scripts
+
+        assert generated_configs == [dcos_config]
+
+    def test_cache_disabled(self, oss_installer: Path, tmp_path: Path) -> None:
+        """
+        No files are cached if the maximum cache size is ``0``.
+        """
+        genconf_cache_dir = tmp_path / 'genconf-cache'
+        cluster_backend = Docker(
+            genconf_cache_dir=genconf_cache_dir,
+            genconf_cache_max_size=0,
+        )
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=0,
+            public_agents=0,
+        ) as cluster:
+            cluster.install_dcos_from_path(
+                dcos_installer=oss_installer,
+                dcos_config=cluster.base_config,
+                ip_detect_path=cluster_backend.ip_detect_path,
+                output=Output.LOG_AND_CAPTURE,
+            )
+
+        assert not genconf_cache_dir.exists()
+
+
+class TestNodeImage:
+    """
+    Tests for the image which node containers are created from.
+    """
+
+    def test_image_reused(self) -> None:
+        """
+        Clusters with the same distribution and Docker version use the same
+        image, labeled with a hash of the inputs to building it.
+        """
+        image_ids = set()
+        for _ in range(2):
+            with Cluster(
+                cluster_backend=Docker(),
+                masters=1,
+                agents=0,
+                public_agents=0,
+            ) as cluster:
+                (master, ) = cluster.masters
+                container = _get_container_from_node(node=master)
+                assert 'dcos_e2e.build_hash' in container.image.labels
+                image_ids.add(container.image.id)
+
+        assert len(image_ids) == 1
+
+
+class TestStartContainers:
+    """
+    Tests for starting node containers.
+    """
+
+    def test_failure_removes_containers(self) -> None:
+        """
+        If any node container fails to start, every container of the cluster
+        is removed.
+        """
+        container_name_prefix = 'dcos-e2e-{random}'.format(
+            random=uuid.uuid4().hex,
+        )
+        # Binding a master port to a host port which is in use makes that
+        # master container fail to start.
+        with socket.socket() as sock:
+            sock.bind(('0.0.0.0', 0))
+            sock.listen(1)
+            _, port = sock.getsockname()
+            backend = Docker(
+                container_name_prefix=container_name_prefix,
+                one_master_host_port_map={'80/tcp': port},
+            )
+            with pytest.raises(docker.errors.APIError):
+                Cluster(
+                    cluster_backend=backend,
+                    masters=1,
+                    agents=2,
+                    public_agents=1,
+                )
+
+        client = docker.from_env(version='auto')
+        containers = client.containers.list(
+            all=True,
+            filters={'name': container_name_prefix},
+        )
+        assert containers == []
@@ -7,6 +7,8 @@ long time to run.
 
 import json
 import logging
+import uuid
+from ipaddress import IPv4Address
 from pathlib import Path
 from subprocess import CalledProcessError
 from textwrap import dedent
@@ -15,9 +17,11 @@ from typing import Iterator, List
 import pytest
 from _pytest.logging import LogCaptureFixture
 
+from dcos_e2e._existing_cluster import BOOTSTRAP_PORT
 from dcos_e2e.base_classes import ClusterBackend
 from dcos_e2e.cluster import Cluster
-from dcos_e2e.node import Output
+from dcos_e2e.exceptions import NodeErrors
+from dcos_e2e.node import Node, Output
 
 
 class TestIntegrationTests:
@@ -397,6 +401,26 @@ class TestClusterFromNodes:
 
         cluster.destroy()
 
+    def test_no_wait_for_ssh(self, tmp_path: Path) -> None:
+        """
+        When ``wait_for_ssh`` is ``False``, no commands are run on the nodes.
+        """
+        # This address is reserved for documentation and so will not be
+        # reachable.
+        node = Node(
+            public_ip_address=IPv4Address('192.0.2.1'),
+            private_ip_address=IPv4Address('192.0.2.1'),
+            default_user='root',
+            ssh_key_path=tmp_path / 'id_rsa',
+        )
+        cluster = Cluster.from_nodes(
+            masters={node},
+            agents=set(),
+            public_agents=set(),
+            wait_for_ssh=False,
+        )
+        assert cluster.masters == {node}
+
     def test_install_dcos_from_url(
         self,
         oss_installer_url: str,
@@ -453,6 +477,49 @@ class TestClusterFromNodes:
 
             cluster.wait_for_dcos_oss()
 
+    def test_install_dcos_with_bootstrap_node(
+        self,
+        oss_installer: Path,
+        cluster_backend: ClusterBackend,
+    ) -> None:
+        """
+        DC/OS can be installed on an existing cluster from files served by a
+        master which is used as a bootstrap node.
+        """
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=1,
+            public_agents=0,
+        ) as original_cluster:
+            (master, ) = original_cluster.masters
+            cluster = Cluster.from_nodes(
+                masters=original_cluster.masters,
+                agents=original_cluster.agents,
+                public_agents=original_cluster.public_agents,
+                bootstrap_node=master,
+            )
+
+            cluster.install_dcos_from_path(
+                dcos_installer=oss_installer,
+                dcos_config=original_cluster.base_config,
+                ip_detect_path=cluster_backend.ip_detect_path,
+            )
+
+            cluster.wait_for_dcos_oss()
+
+            # Nodes install DC/OS from the files served by the bootstrap
+            # node.
+            bootstrap_url = 'http://{ip_address}:{port}'.format(
+                ip_address=master.private_ip_address,
+                port=BOOTSTRAP_PORT,
+            )
+            (agent, ) = cluster.agents
+            result = agent.run(
+                args=['cat', '/etc/mesosphere/setup-flags/repository-url'],
+            )
+            assert result.stdout.decode().strip() == bootstrap_url
+
 
 class TestDestroyNode:
     """
@@ -467,3 +534,143 @@ class TestDestroyNode:
             (agent, ) = cluster.agents
             cluster.destroy_node(node=agent)
             assert not cluster.agents
+
+
+class TestRunOnNodes:
+    """
+    Tests for running a command on many nodes at once.
+    """
+
+    def test_run_on_nodes(self, cluster_backend: ClusterBackend) -> None:
+        """
+        A command is run on each given node, and the errors from each node are
+        available when not failing fast.
+        """
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=2,
+            public_agents=0,
+        ) as cluster:
+            nodes = {*cluster.masters, *cluster.agents}
+            results = cluster.run_on_nodes(
+                nodes=nodes,
+                args=['hostname', '-i'],
+            )
+            assert results.keys() == nodes
+            for node, result in results.items():
+                ip_addresses = result.stdout.decode().split()
+                assert str(node.private_ip_address) in ip_addresses
+
+            (master, ) = cluster.masters
+            args = ['test', '-e', '/failure_marker']
+            master.run(args=['touch', '/failure_marker'])
+
+            with pytest.raises(CalledProcessError):
+                cluster.run_on_nodes(nodes=nodes, args=args)
+
+            with pytest.raises(NodeErrors) as excinfo:
+                cluster.run_on_nodes(nodes=nodes, args=args, fail_fast=False)
+
+            assert excinfo.value.results.keys() == {master}
+            assert excinfo.value.errors.keys() == set(cluster.agents)
+
+
+class TestSendFile:
+    """
+    Tests for sending a file to many nodes at once.
+    """
+
+    @pytest.mark.parametrize('between_nodes', [True, False])
+    def test_send_file(
+        self,
+        cluster_backend: ClusterBackend,
+        tmp_path: Path,
+        between_nodes: bool,
+    ) -> None:
+        """
+        A file is sent to every node, whether it is sent from the host to each
+        node or between nodes.
+        """
+        content = str(uuid.uuid4())
+        local_file = tmp_path / 'example_file.txt'
+        local_file.write_text(content)
+        remote_path = Path('/etc/') / uuid.uuid4().hex / 'example_file.txt'
+
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=2,
+            public_agents=1,
+        ) as cluster:
+            nodes = {*cluster.masters, *cluster.agents, *cluster.public_agents}
+            cluster.send_file(
+                local_path=local_file,
+                remote_path=remote_path,
+                between_nodes=between_nodes,
+            )
+
+            results = cluster.run_on_nodes(
+                nodes=nodes,
+                args=['cat', str(remote_path)],
+            )
+
+        for result in results.values():
+            assert result.stdout.decode() == content
+
+
+class TestDownload:
+    """
+    Tests for downloading files and directories from many nodes at once.
+    """
+
+    def test_download(
+        self,
+        cluster_backend: ClusterBackend,
+        tmp_path: Path,
+    ) -> None:
+        """
+        Files and directories from each node are downloaded to a directory for
+        that node.
+        """
+        with Cluster(
+            cluster_backend=cluster_backend,
+            masters=1,
+            agents=1,
+            public_agents=0,
+        ) as cluster:
+            nodes = {*cluster.masters, *cluster.agents}
+            cluster.run_on_nodes(
+                nodes=nodes,
+                args=[
+                    'mkdir',
+                    '-p',
+                    '/download_test/sub',
+                    '&&',
+                    'hostname',
+                    '-i',
+                    '>',
+                    '/download_test/sub/ip',
+                ],
+                shell=True,
+            )
+
+            node_dirs = cluster.download(
+                remote_paths=[Path('/download_test'), Path('/etc/hostname')],
+                local_dir=tmp_path,
+            )
+
+            assert node_dirs.keys() == nodes
+            for node, node_dir in node_dirs.items():
+                assert node_dir == tmp_path / str(node.public_ip_address)
+                ip_file = node_dir / 'download_test' / 'sub' / 'ip'
+                assert str(node.private_ip_address) in ip_file.read_text()
+                assert (node_dir / 'etc' / 'hostname').is_file()
+
+            with pytest.raises(NodeErrors) as excinfo:
+                cluster.download(
+                    remote_paths=[Path('/does_not_exist')],
+                    local_dir=tmp_path,
+                )
+
+            assert excinfo.value.errors.keys() == nodes
@@ -0,0 +1,73 @@
+"""
+Tests for the store of Docker binaries which are installed on nodes.
+"""
+
+import tarfile
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from dcos_e2e import docker_binaries
+from dcos_e2e.docker_binaries import download_docker_binaries
+from dcos_e2e.docker_versions import DockerVersion
+
+
+class TestDownloadDockerBinaries:
+    """
+    Tests for ``download_docker_binaries``.
+    """
+
+    def test_download(self, tmp_path: Path) -> None:
+        """
+        An archive of Docker binaries is downloaded to the store.
+        """
+        archive_path = download_docker_binaries(
+            docker_version=DockerVersion.v1_13_1,
+            store_dir=tmp_path,
+        )
+        assert archive_path.parent == tmp_path
+        with tarfile.open(str(archive_path)) as tar:
+            assert 'docker/docker' in tar.getnames()
+
+    def test_corrupt_archive(self, tmp_path: Path) -> None:
+        """
+        An archive in the store which does not match the pinned hash is
+        downloaded again.
+        """
+        archive_path = download_docker_binaries(
+            docker_version=DockerVersion.v1_13_1,
+            store_dir=tmp_path,
+        )
+        content = archive_path.read_bytes()
+        archive_path.write_bytes(b'')
+        assert download_docker_binaries(
+            docker_version=DockerVersion.v1_13_1,
+            store_dir=tmp_path,
+        ) == archive_path
+        assert archive_path.read_bytes() == content
+
+    def test_hash_mismatch(
+        self,
+        tmp_path: Path,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        """
+        A downloaded archive which does not match the pinned hash is not
+        stored.
+        """
+        url = docker_binaries.docker_binaries_url(
+            docker_version=DockerVersion.v1_13_1,
+        )
+        # pylint: disable=protected-access
+        monkeypatch.setitem(
+            docker_binaries._DOCKER_BINARIES,
+            DockerVersion.v1_13_1,
+            (url, '0' * 64),
+        )
+        with pytest.raises(ValueError):
+            download_docker_binaries(
+                docker_version=DockerVersion.v1_13_1,
+                store_dir=tmp_path,
+            )
+        assert list(tmp_path.iterdir()) == []
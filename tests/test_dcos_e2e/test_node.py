@@ -4,6 +4,7 @@ Tests for managing DC/OS cluster nodes.
 See ``test_node_install.py`` for more, related tests.
 """
 
+import hashlib
 import logging
 import os
 import subprocess
@@ -22,7 +23,13 @@ from _pytest.logging import LogCaptureFixture
 
 from dcos_e2e.backends import Docker
 from dcos_e2e.cluster import Cluster
-from dcos_e2e.node import Node, Output, Transport
+from dcos_e2e.node import (
+    CapturedOutput,
+    Node,
+    Output,
+    Stream,
+    Transport,
+)
 
 # We ignore this error because it conflicts with `pytest` standard usage.
 # pylint: disable=redefined-outer-name
@@ -136,6 +143,44 @@ class TestStringRepresentation:
         assert string == str(dcos_node)
 
 
+class TestDownload:
+    """
+    Tests for ``Node.download``.
+    """
+
+    def test_directory(self, dcos_node: Node, tmp_path: Path) -> None:
+        """
+        It is possible to download a directory from a node.
+        """
+        content = str(uuid.uuid4())
+        local_directory = tmp_path / 'local'
+        (local_directory / 'sub').mkdir(parents=True)
+        (local_directory / 'sub' / 'file.txt').write_text(content)
+        remote_directory = Path('/etc') / uuid.uuid4().hex
+        dcos_node.send_file(
+            local_path=local_directory,
+            remote_path=remote_directory,
+        )
+
+        downloaded_directory = tmp_path / 'downloaded'
+        dcos_node.download(
+            remote_path=remote_directory,
+            local_path=downloaded_directory,
+        )
+        downloaded_file = downloaded_directory / 'sub' / 'file.txt'
+        assert downloaded_file.read_text() == content
+
+    def test_does_not_exist(self, dcos_node: Node, tmp_path: Path) -> None:
+        """
+        An error is raised when the remote path does not exist.
+        """
+        with pytest.raises(CalledProcessError):
+            dcos_node.download(
+                remote_path=Path('/etc') / uuid.uuid4().hex,
+                local_path=tmp_path / 'downloaded',
+            )
+
+
 class TestDownloadFile:
     """
     Tests for ``Node.download_file``.
@@ -276,6 +321,94 @@ class TestSendFile:
         result = dcos_node.run(args=args)
         assert result.stdout.decode() == content
 
+    @pytest.mark.parametrize('compress', [True, False])
+    def test_compress(
+        self,
+        dcos_node: Node,
+        tmp_path: Path,
+        compress: bool,
+    ) -> None:
+        """
+        A file can be sent with or without compression.
+        """
+        content = str(uuid.uuid4()) * 1000
+        local_file = tmp_path / 'example_file.txt'
+        local_file.write_text(content)
+        master_destination_path = Path('/etc') / uuid.uuid4().hex / 'file.txt'
+        dcos_node.send_file(
+            local_path=local_file,
+            remote_path=master_destination_path,
+            compress=compress,
+        )
+        args = ['cat', str(master_destination_path)]
+        result = dcos_node.run(args=args)
+        assert result.stdout.decode() == content
+
+    def test_cache(
+        self,
+        dcos_node: Node,
+        tmp_path: Path,
+    ) -> None:
+        """
+        With ``cache`` set, a file which is already in the cache on the node
+        is copied from the cache rather than sent again, unless the cache
+        entry has changed.
+        """
+        content = str(uuid.uuid4())
+        local_file = tmp_path / 'example_file.txt'
+        local_file.write_text(content)
+        first_destination = Path('/etc') / uuid.uuid4().hex / 'file.txt'
+        second_destination = Path('/etc') / uuid.uuid4().hex / 'file.txt'
+        dcos_node.send_file(
+            local_path=local_file,
+            remote_path=first_destination,
+            sudo=True,
+            cache=True,
+        )
+        sha256 = hashlib.sha256(content.encode()).hexdigest()
+        cache_entry = Path('/var/cache/dcos-e2e') / sha256
+        result = dcos_node.run(args=['cat', str(cache_entry)], sudo=True)
+        assert result.stdout.decode() == content
+
+        # A file which is sent, rather than copied from the cache, replaces
+        # the cache entry with a new file.
+        inode_args = ['stat', '-c', '%i', str(cache_entry)]
+        inode = dcos_node.run(args=inode_args, sudo=True).stdout
+        dcos_node.send_file(
+            local_path=local_file,
+            remote_path=second_destination,
+            sudo=True,
+            cache=True,
+        )
+        result = dcos_node.run(args=['cat', str(second_destination)])
+        assert result.stdout.decode() == content
+        assert dcos_node.run(args=inode_args, sudo=True).stdout == inode
+
+        # Change the cache entry without changing its size, to show that an
+        # entry which does not match its hash is not used.
+        dcos_node.run(
+            args=[
+                'echo',
+                '-n',
+                content.upper(),
+                '>',
+                str(cache_entry),
+            ],
+            shell=True,
+            sudo=True,
+        )
+        third_destination = Path('/etc') / uuid.uuid4().hex / 'file.txt'
+        dcos_node.send_file(
+            local_path=local_file,
+            remote_path=third_destination,
+            sudo=True,
+            cache=True,
+        )
+        result = dcos_node.run(args=['cat', str(third_destination)])
+        assert result.stdout.decode() == content
+        result = dcos_node.run(args=['cat', str(cache_entry)], sudo=True)
+        assert result.stdout.decode() == content
+
     def test_send_directory(
         self,
         dcos_node: Node,
@@ -471,6 +604,64 @@ class TestSendFile:
         assert result.stdout.decode() == random
 
 
+class TestSyncDirectory:
+    """
+    Tests for ``Node.sync_directory``.
+    """
+
+    def test_sync_changes(self, dcos_node: Node, tmp_path: Path) -> None:
+        """
+        Only new and changed files are sent, and files deleted locally are
+        deleted on the node.
+        """
+        local_directory = tmp_path / 'local'
+        (local_directory / 'sub').mkdir(parents=True)
+        (local_directory / 'unchanged.txt').write_text('unchanged')
+        (local_directory / 'changed.txt').write_text('original')
+        (local_directory / 'sub' / 'deleted.txt').write_text('deleted')
+        remote_directory = Path('/etc') / uuid.uuid4().hex
+
+        plan = dcos_node.sync_directory(
+            local_path=local_directory,
+            remote_path=remote_directory,
+        )
+        assert set(plan.to_send) == {
+            'unchanged.txt',
+            'changed.txt',
+            'sub/deleted.txt',
+        }
+
+        (local_directory / 'changed.txt').write_text('changed content')
+        (local_directory / 'sub' / 'deleted.txt').unlink()
+        (local_directory / 'new.txt').write_text('new')
+
+        plan = dcos_node.sync_directory(
+            local_path=local_directory,
+            remote_path=remote_directory,
+        )
+        assert set(plan.to_send) == {'changed.txt', 'new.txt'}
+        assert plan.to_delete == ['sub/deleted.txt']
+
+        result = dcos_node.run(
+            args=['cat', str(remote_directory / 'changed.txt')],
+        )
+        assert result.stdout.decode() == 'changed content'
+        with pytest.raises(CalledProcessError):
+            dcos_node.run(
+                args=[
+                    'test',
+                    '-e',
+                    str(remote_directory / 'sub' / 'deleted.txt'),
+                ],
+            )
+
+        plan = dcos_node.sync_directory(
+            local_path=local_directory,
+            remote_path=remote_directory,
+        )
+        assert not plan.changed
+
+
 class TestPopen:
     """
     Tests for ``Node.popen``.
@@ -605,6 +796,52 @@ class TestPopen:
         dcos_node.run(['rm', '-f', '/tmp/pipe'])
 
 
+class TestStream:
+    """
+    Tests for ``Node.stream``.
+    """
+
+    def test_lines(self, dcos_node: Node) -> None:
+        """
+        Lines of stdout and stderr are given in the order they are written,
+        and the exit code is available after the last line.
+        """
+        args = [
+            'echo',
+            'first',
+            '&&',
+            '>&2',
+            'echo',
+            'second',
+            '&&',
+            'printf',
+            'third',
+            '&&',
+            'exit',
+            '3',
+        ]
+        with dcos_node.stream(args=args, shell=True) as line_stream:
+            assert line_stream.returncode is None
+            lines = list(line_stream)
+
+        assert lines == [
+            (Stream.STDOUT, 'first'),
+            (Stream.STDERR, 'second'),
+            (Stream.STDOUT, 'third'),
+        ]
+        assert line_stream.returncode == 3
+
+    def test_close(self, dcos_node: Node) -> None:
+        """
+        Closing a stream stops the command.
+        """
+        args = ['echo', 'started', '&&', 'sleep', '60']
+        with dcos_node.stream(args=args, shell=True) as line_stream:
+            assert next(iter(line_stream)) == (Stream.STDOUT, 'started')
+
+        assert line_stream.returncode is not None
+
+
 class TestRun:
     """
     Tests for ``Node.run``.
@@ -1007,3 +1244,28 @@ class TestOutput:
             dcos_node.run(args=args, shell=True, output=output)
         expected_message = b'No such file or directory'
         assert expected_message in excinfo.value.stderr
+
+    @pytest.mark.parametrize('max_memory_size', [0, 1024 * 1024])
+    def test_lazy_output(self, dcos_node: Node, max_memory_size: int) -> None:
+        """
+        When given ``lazy_output=True``, stdout and stderr are given as
+        ``CapturedOutput`` objects, which hold output larger than
+        ``max_memory_size`` in a temporary file.
+        """
+        stdout_message = uuid.uuid4().hex
+        stderr_message = uuid.uuid4().hex
+        args = ['echo', stdout_message, '&&', '>&2', 'echo', stderr_message]
+        result = dcos_node.run(
+            args=args,
+            shell=True,
+            lazy_output=True,
+            max_memory_size=max_memory_size,
+        )
+        expected_stdout = (stdout_message + '\n').encode()
+        assert isinstance(result.stdout, CapturedOutput)
+        assert result.stdout.spilled == (max_memory_size == 0)
+        assert len(result.stdout) == len(expected_stdout)
+        assert bytes(result.stdout) == expected_stdout
+        assert result.stdout.open().read() == expected_stdout
+        assert bytes(result.stdout.memoryview()) == expected_stdout
+        assert result.stderr.getvalue().strip().decode() == stderr_message
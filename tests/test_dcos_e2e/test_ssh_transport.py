@@ -0,0 +1,147 @@
+"""
+Tests for sharing SSH master connections between commands.
+"""
+
+import subprocess
+import threading
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import Any, List
+
+from _pytest.monkeypatch import MonkeyPatch
+
+# pylint: disable=protected-access
+from dcos_e2e._node_transports import _ssh_transport
+from dcos_e2e._node_transports._ssh_transport import SSHTransport
+
+
+class TestControlPath:
+    """
+    Tests for the control sockets which master connections listen on.
+    """
+
+    def test_same_connection(self, tmp_path: Path) -> None:
+        """
+        Connections to the same node as the same user with the same key share
+        a control socket.
+        """
+        ssh_key_path = tmp_path / 'key'
+        paths = [
+            _ssh_transport._control_path(
+                user='root',
+                ssh_key_path=ssh_key_path,
+                public_ip_address=IPv4Address('172.17.0.2'),
+            ) for _ in range(2)
+        ]
+        assert paths[0] == paths[1]
+
+    def test_different_connections(self, tmp_path: Path) -> None:
+        """
+        Connections which differ in the node, the user or the key do not
+        share a control socket.
+        """
+        ssh_key_path = tmp_path / 'key'
+        other_ssh_key_path = tmp_path / 'other_key'
+        ip_address = IPv4Address('172.17.0.2')
+        other_ip_address = IPv4Address('172.17.0.3')
+        connections = [
+            ('root', ssh_key_path, ip_address),
+            ('other', ssh_key_path, ip_address),
+            ('root', other_ssh_key_path, ip_address),
+            ('root', ssh_key_path, other_ip_address),
+        ]
+        paths = {
+            _ssh_transport._control_path(
+                user=user,
+                ssh_key_path=key,
+                public_ip_address=ip,
+            )
+            for user, key, ip in connections
+        }
+        assert len(paths) == len(connections)
+
+
+class TestEnsureControlMaster:
+    """
+    Tests for starting master connections.
+    """
+
+    def test_one_master(
+        self,
+        tmp_path: Path,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        """
+        When many commands need the same master connection at once, one
+        master is started, with a connection timeout.
+        """
+        control_path = tmp_path / 'control'
+        started = []  # type: List[List[str]]
+
+        def _run(args: List[str], **kwargs: Any) -> None:
+            started.append(args)
+            control_path.touch()
+
+        monkeypatch.setattr(subprocess, 'run', _run)
+        threads = [
+            threading.Thread(
+                target=_ssh_transport._ensure_control_master,
+                kwargs={
+                    'control_path': control_path,
+                    'user': 'root',
+                    'ssh_key_path': tmp_path / 'key',
+                    'public_ip_address': IPv4Address('172.17.0.2'),
+                },
+            ) for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (master_args, ) = started
+        connect_timeout = 'ConnectTimeout={seconds}'.format(
+            seconds=_ssh_transport._CONNECT_TIMEOUT_SECONDS,
+        )
+        assert connect_timeout in master_args
+        assert 'ControlMaster=yes' in master_args
+
+
+class TestCloseConnections:
+    """
+    Tests for ``SSHTransport.close_connections``.
+    """
+
+    def test_close_node_connections(
+        self,
+        tmp_path: Path,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        """
+        Only the master connections to the given node are closed.
+        """
+        closed = []  # type: List[Path]
+        monkeypatch.setattr(
+            _ssh_transport,
+            '_close_control_master',
+            lambda control_path: closed.append(control_path),
+        )
+        ip_address = IPv4Address('172.17.0.4')
+        node_paths = {
+            _ssh_transport._control_path(
+                user=user,
+                ssh_key_path=tmp_path / 'key',
+                public_ip_address=ip_address,
+            )
+            for user in ('root', 'other')
+        }
+        other_path = _ssh_transport._control_path(
+            user='root',
+            ssh_key_path=tmp_path / 'key',
+            public_ip_address=IPv4Address('172.17.0.5'),
+        )
+
+        SSHTransport().close_connections(public_ip_address=ip_address)
+
+        assert set(closed) == node_paths
+        assert other_path not in closed